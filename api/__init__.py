@@ -11,11 +11,27 @@ from .arxiv_client import (
     search_with_retry, create_entry_xml
 )
 
+from .http_client import ArxivHttpClient, HttpResponse, get_http_client
+
+from .rate_limiter import RateLimiter, get_rate_limiter
+
+from .bulk_resolver import (
+    BulkResolver, BulkResolveResult, ChunkResult, ChunkSizeTuner,
+    resolve_paper_ids, normalize_requested_id, strip_version
+)
+
 from .paper_parser import (
-    extract_paper_details_from_xml
+    PaperRecord, parse_feed, parse_feed_page, parse_entry, is_error_entry, extract_paper_details_from_xml
 )
 
+from .update_feed import fetch_updated_papers
+
 __all__ = [
     'search_arxiv', 'save_response_to_file', 'extract_pdf_url', 'download_arxiv_pdf',
-    'search_with_retry', 'create_entry_xml', 'extract_paper_details_from_xml'
+    'search_with_retry', 'create_entry_xml', 'extract_paper_details_from_xml',
+    'PaperRecord', 'parse_feed', 'parse_feed_page', 'parse_entry', 'is_error_entry', 'fetch_updated_papers',
+    'ArxivHttpClient', 'HttpResponse', 'get_http_client',
+    'RateLimiter', 'get_rate_limiter',
+    'BulkResolver', 'BulkResolveResult', 'ChunkResult', 'ChunkSizeTuner',
+    'resolve_paper_ids', 'normalize_requested_id', 'strip_version'
 ]
\ No newline at end of file
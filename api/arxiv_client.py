@@ -6,23 +6,33 @@ This module provides functions to interact with the arXiv API:
 - Search for papers
 - Download PDFs
 - Parse API responses
+
+Every request goes through the shared rate limiter.
 """
 
+import json
 import os
 import time
+import urllib.error
 import urllib.parse
-import urllib.request
 import xml.etree.ElementTree as ET
 from typing import Dict, List, Optional, Tuple, Union, Any
 
-from arxiv_tool.config import ARXIV_API_BASE_URL, XML_NAMESPACES
+from arxiv_tool.config import (
+    ARXIV_API_BASE_URL, XML_NAMESPACES, DOWNLOAD_CHUNK_SIZE,
+    PARTIAL_DOWNLOAD_SUFFIX, PARTIAL_STATE_SUFFIX
+)
 from arxiv_tool.utils import (
     extract_paper_id, get_simplified_paper_id, sanitize_filename, 
     ensure_dir_exists, save_to_file
 )
+from .http_client import ArxivHttpClient, get_http_client
+from .rate_limiter import get_rate_limiter
 
 
-def search_arxiv(search_query: str, start: int = 0, max_results: int = 10) -> str:
+def search_arxiv(search_query: str, start: int = 0, max_results: int = 10,
+                 client: Optional[ArxivHttpClient] = None, id_list: Optional[List[str]] = None,
+                 sort_by: Optional[str] = None, sort_order: str = 'descending') -> str:
     """
     Query the arXiv API for articles matching the specified search criteria.
 
@@ -34,6 +44,11 @@ def search_arxiv(search_query: str, start: int = 0, max_results: int = 10) -> st
                           (e.g., "all:electron", "cat:physics.gen-ph").
         start (int, optional): The zero-based index of the first result to return. Defaults to 0.
         max_results (int, optional): The maximum number of results to retrieve. Defaults to 10.
+        client (ArxivHttpClient, optional): The HTTP client to use. Defaults to the shared client.
+        id_list (list, optional): arXiv IDs to fetch directly. When combined with a search_query,
+                                only the listed papers matching the query are returned.
+        sort_by (str, optional): 'relevance', 'lastUpdatedDate' or 'submittedDate'
+        sort_order (str, optional): 'ascending' or 'descending' (used with sort_by)
 
     Returns:
         str: A string containing the XML response from the arXiv API.
@@ -41,15 +56,22 @@ def search_arxiv(search_query: str, start: int = 0, max_results: int = 10) -> st
     Raises:
         urllib.error.URLError: If there is an issue with the network connection or the API endpoint.
     """
-    params = {
-        'search_query': search_query,
-        'start': start,
-        'max_results': max_results
-    }
+    params = {}
+    if search_query or not id_list:
+        params['search_query'] = search_query
+    if id_list:
+        params['id_list'] = ','.join(id_list)
+    params['start'] = start
+    params['max_results'] = max_results
+    if sort_by:
+        params['sortBy'] = sort_by
+        params['sortOrder'] = sort_order
     query_params = urllib.parse.urlencode(params)
     full_url = f"{ARXIV_API_BASE_URL}?{query_params}"
 
-    with urllib.request.urlopen(full_url) as response:
+    client = client or get_http_client()
+    get_rate_limiter().acquire('api')
+    with client.get(full_url) as response:
         result = response.read().decode('utf-8')
     
     return result
@@ -103,24 +125,75 @@ def extract_pdf_url(xml_response: str) -> Optional[str]:
     return None
 
 
-def download_arxiv_pdf(pdf_url: str, save_filename: Optional[str] = None, directory: Optional[str] = None) -> str:
+def _read_partial_state(part_path: str, pdf_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the sidecar describing a partial download, if it can be resumed.
+    
+    Returns:
+        dict: The sidecar data (url, validator, total) or None if the partial file is unusable
+    """
+    state_path = part_path + PARTIAL_STATE_SUFFIX
+    if not os.path.exists(part_path) or not os.path.exists(state_path):
+        return None
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if state.get('url') != pdf_url or not state.get('validator'):
+        return None
+    return state
+
+
+def _discard_partial(part_path: str) -> None:
+    """Remove a partial download and its sidecar."""
+    for path in (part_path, part_path + PARTIAL_STATE_SUFFIX):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _response_validator(headers) -> Optional[str]:
+    """Return the validator usable in If-Range: a strong ETag, else Last-Modified."""
+    etag = headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return headers.get('Last-Modified')
+
+
+def download_arxiv_pdf(pdf_url: str, save_filename: Optional[str] = None, directory: Optional[str] = None,
+                       client: Optional[ArxivHttpClient] = None, chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+                       resume: bool = True) -> str:
     """
     Download a PDF from the specified URL and save it locally.
 
     If no save_filename is provided, the function defaults to using the paper's identifier,
     extracted from the last segment of the PDF URL, as the filename.
 
+    The body is streamed to a temporary '.part' file in fixed-size chunks, so memory use
+    does not depend on the size of the PDF. The file is checked against the Content-Length
+    header and only then renamed to its final name, so an interrupted download never
+    leaves a truncated PDF behind.
+
+    When the server sends an ETag or Last-Modified validator, an interrupted download keeps
+    its '.part' file together with a small JSON sidecar holding the validator. The next call
+    continues from where it stopped with a Range request guarded by If-Range; if the file
+    changed on the server, or ranges are not supported, the download starts over.
+
     Parameters:
         pdf_url (str): The URL from which to download the PDF.
         save_filename (str, optional): The desired base filename (without extension) for the PDF.
                                      If None, the paper ID (last segment of the URL) is used.
         directory (str, optional): The directory where the PDF file will be saved. Defaults to the current working directory if None.
+        client (ArxivHttpClient, optional): The HTTP client to use. Defaults to the shared client.
+        chunk_size (int, optional): Number of bytes read and written at a time.
+        resume (bool, optional): Whether to resume a previous partial download. Defaults to True.
 
     Returns:
         str: The full file path to the saved PDF.
 
     Raises:
         urllib.error.URLError: If there is an issue downloading the PDF from the provided URL.
+        urllib.error.ContentTooShortError: If fewer bytes than announced were received.
     """
     if save_filename is None:
         # Default to the paper ID derived from the last segment of the URL
@@ -131,21 +204,89 @@ def download_arxiv_pdf(pdf_url: str, save_filename: Optional[str] = None, direct
         save_filename = f"{save_filename}.{file_type}"
     
     full_path = os.path.join(directory, save_filename) if directory else save_filename
+    part_path = full_path + PARTIAL_DOWNLOAD_SUFFIX
+    state_path = part_path + PARTIAL_STATE_SUFFIX
     
     # Ensure directory exists
     if directory:
         ensure_dir_exists(directory)
     
-    with urllib.request.urlopen(pdf_url) as response:
-        pdf_data = response.read()
+    state = _read_partial_state(part_path, pdf_url) if resume else None
+    if state is None:
+        _discard_partial(part_path)
+    
+    # PDFs are already compressed, so ask for the raw bytes
+    client = client or get_http_client()
+    offset = os.path.getsize(part_path) if state else 0
+    headers = {}
+    if offset:
+        headers = {'Range': f"bytes={offset}-", 'If-Range': state['validator']}
     
-    with open(full_path, 'wb') as file:
-        file.write(pdf_data)
+    limiter = get_rate_limiter()
+    try:
+        try:
+            limiter.acquire('pdf')
+            response = client.get(pdf_url, headers=headers, accept_gzip=False)
+        except urllib.error.HTTPError as e:
+            if e.code != 416 or not offset:
+                raise
+            # The partial file does not fit the current document; start over
+            _discard_partial(part_path)
+            offset = 0
+            limiter.acquire('pdf')
+            response = client.get(pdf_url, accept_gzip=False)
+        
+        with response:
+            content_length = response.headers.get('Content-Length')
+            if response.status == 206 and offset:
+                # Content-Range: bytes <start>-<end>/<total>
+                content_range = response.headers.get('Content-Range', '')
+                start, _, total = content_range.replace('bytes ', '').partition('/')
+                if not start.startswith(f"{offset}-"):
+                    os.remove(state_path)
+                    raise urllib.error.URLError(f"Unexpected Content-Range '{content_range}' from {pdf_url}")
+                expected_size = int(total) if total.isdigit() else None
+                mode = 'ab'
+            else:
+                # Full response: the server ignored the range or the document changed
+                offset = 0
+                expected_size = int(content_length) if content_length is not None else None
+                mode = 'wb'
+                validator = _response_validator(response.headers)
+                if validator and resume:
+                    with open(state_path, 'w', encoding='utf-8') as f:
+                        json.dump({'url': pdf_url, 'validator': validator, 'total': expected_size}, f)
+                elif os.path.exists(state_path):
+                    os.remove(state_path)
+            
+            received = offset
+            with open(part_path, mode) as file:
+                for chunk in response.iter_content(chunk_size):
+                    file.write(chunk)
+                    received += len(chunk)
+                file.flush()
+                os.fsync(file.fileno())
+        
+        if expected_size is not None and received != expected_size:
+            raise urllib.error.ContentTooShortError(
+                f"Downloaded {received} of {expected_size} bytes from {pdf_url}", None
+            )
+        
+        os.replace(part_path, full_path)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+    except BaseException:
+        # Keep the partial file only if a later call can resume it
+        if _read_partial_state(part_path, pdf_url) is None:
+            _discard_partial(part_path)
+        raise
     
     return full_path
 
 
-def search_with_retry(search_query: str, max_results: int = 10, retry_count: int = 3, delay: int = 3) -> Optional[str]:
+def search_with_retry(search_query: str, max_results: int = 10, retry_count: int = 3, delay: int = 3,
+                      client: Optional[ArxivHttpClient] = None, id_list: Optional[List[str]] = None,
+                      **search_options) -> Optional[str]:
     """
     Search arXiv with retry capability in case of network errors.
     
@@ -154,13 +295,17 @@ def search_with_retry(search_query: str, max_results: int = 10, retry_count: int
         max_results (int): Maximum number of results to retrieve
         retry_count (int): Number of retry attempts
         delay (int): Delay between retries in seconds
+        client (ArxivHttpClient, optional): The HTTP client to use. Defaults to the shared client.
+        id_list (list, optional): arXiv IDs to fetch directly (see search_arxiv)
+        **search_options: start, sort_by and sort_order (see search_arxiv)
         
     Returns:
         str: The XML response from arXiv or None if all retries fail
     """
     for attempt in range(retry_count):
         try:
-            return search_arxiv(search_query, max_results=max_results)
+            return search_arxiv(search_query, max_results=max_results, client=client, id_list=id_list,
+                                **search_options)
         except Exception as e:
             if attempt < retry_count - 1:
                 print(f"Error searching arXiv (attempt {attempt+1}/{retry_count}): {e}")
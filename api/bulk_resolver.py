@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Bulk ID resolution module for the arXiv Paper Manager.
+
+This module resolves many arXiv IDs with few API calls:
+- IDs are sent in chunks through the API's id_list parameter
+- Multi-entry feeds are matched back to the requested IDs
+- The chunk size adapts to the observed response times
+"""
+
+import re
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from arxiv_tool.config import (
+    ID_LIST_CHUNK_SIZE, ID_LIST_MIN_CHUNK_SIZE,
+    ID_LIST_MAX_CHUNK_SIZE, ID_LIST_TARGET_SECONDS, XML_NAMESPACES
+)
+from arxiv_tool.utils import extract_paper_id
+from .arxiv_client import search_with_retry
+from .http_client import ArxivHttpClient
+from .paper_parser import PaperRecord, parse_entry, is_error_entry
+from .rate_limiter import get_rate_limiter
+
+
+VERSION_SUFFIX = re.compile(r'v\d+$')
+
+
+def normalize_requested_id(paper_id: str) -> str:
+    """
+    Normalize an ID as typed by a user into the form used by the API.
+
+    Strips whitespace, an 'arXiv:' prefix and abs/pdf URL prefixes,
+    e.g. 'arXiv:1706.03762v5' -> '1706.03762v5'.
+
+    Parameters:
+        paper_id (str): The ID to normalize
+
+    Returns:
+        str: The normalized ID
+    """
+    paper_id = paper_id.strip()
+    if paper_id.lower().startswith('arxiv:'):
+        paper_id = paper_id[6:]
+    if '/abs/' in paper_id or '/pdf/' in paper_id:
+        paper_id = extract_paper_id(paper_id.replace('/pdf/', '/abs/'))
+    if paper_id.lower().endswith('.pdf'):
+        paper_id = paper_id[:-4]
+    return paper_id
+
+
+def strip_version(paper_id: str) -> str:
+    """Return the ID without its version suffix (e.g. '1706.03762v5' -> '1706.03762')"""
+    return VERSION_SUFFIX.sub('', paper_id)
+
+
+@dataclass
+class ChunkResult:
+    """Outcome of resolving one chunk of IDs."""
+    records: Dict[str, PaperRecord] = field(default_factory=dict)
+    not_found: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+
+
+@dataclass
+class BulkResolveResult:
+    """Outcome of resolving a whole list of IDs."""
+    records: Dict[str, PaperRecord] = field(default_factory=dict)
+    not_found: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    requests: int = 0
+
+
+class ChunkSizeTuner:
+    """
+    Adapt the id_list chunk size to the observed response times.
+
+    The size grows while responses come back well inside the target time
+    and is halved when a response is slow or a request fails.
+    """
+
+    def __init__(self, initial: int = ID_LIST_CHUNK_SIZE, minimum: int = ID_LIST_MIN_CHUNK_SIZE,
+                 maximum: int = ID_LIST_MAX_CHUNK_SIZE, target_seconds: float = ID_LIST_TARGET_SECONDS):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.size = max(minimum, min(maximum, initial))
+
+    def record(self, elapsed: float, success: bool = True) -> int:
+        """
+        Update the chunk size from the outcome of one request.
+
+        Parameters:
+            elapsed (float): Seconds the request took
+            success (bool): Whether the request succeeded
+
+        Returns:
+            int: The chunk size to use for the next request
+        """
+        if not success or elapsed > self.target_seconds:
+            self.size = max(self.minimum, self.size // 2)
+        elif elapsed < self.target_seconds / 2:
+            self.size = min(self.maximum, int(self.size * 1.5))
+        return self.size
+
+
+class BulkResolver:
+    """
+    Resolve lists of arXiv IDs to PaperRecords using id_list requests.
+    """
+
+    def __init__(self, chunk_size: int = ID_LIST_CHUNK_SIZE, auto_tune: bool = True,
+                 client: Optional[ArxivHttpClient] = None):
+        """
+        Initialize the resolver.
+
+        Requests are paced by the shared rate limiter (see api.rate_limiter).
+
+        Parameters:
+            chunk_size (int): Number of IDs per request (the starting size when auto-tuning)
+            auto_tune (bool): Whether to adapt the chunk size to response times
+            client (ArxivHttpClient, optional): The HTTP client to use
+        """
+        self.tuner = ChunkSizeTuner(initial=chunk_size) if auto_tune else None
+        self.chunk_size = chunk_size
+        self.client = client
+        self.requests = 0
+
+    def _fetch(self, ids: List[str]) -> Optional[str]:
+        """Fetch the feed for a list of IDs, feeding the response time to the tuner."""
+        limiter = get_rate_limiter()
+        waited_before = limiter.waited('api')
+        start = time.monotonic()
+        xml_response = search_with_retry('', max_results=len(ids), client=self.client, id_list=ids)
+        self.requests += 1
+
+        if self.tuner is not None:
+            # Only the response time counts, not the time spent waiting for the rate limiter
+            elapsed = time.monotonic() - start - (limiter.waited('api') - waited_before)
+            self.tuner.record(elapsed, success=xml_response is not None)
+        return xml_response
+
+    def _resolve_chunk(self, ids: List[str], result: ChunkResult) -> None:
+        xml_response = self._fetch(ids)
+        if xml_response is None:
+            result.failed.extend(ids)
+            return
+
+        try:
+            entries = ET.fromstring(xml_response).findall('atom:entry', XML_NAMESPACES)
+        except Exception as e:
+            print(f"Error parsing arXiv response: {e}")
+            result.failed.extend(ids)
+            return
+
+        # A malformed ID makes the API answer with a single error entry;
+        # split the chunk to isolate it and still resolve the other IDs
+        if any(is_error_entry(entry) for entry in entries):
+            if len(ids) == 1:
+                result.not_found.extend(ids)
+            else:
+                middle = len(ids) // 2
+                self._resolve_chunk(ids[:middle], result)
+                self._resolve_chunk(ids[middle:], result)
+            return
+
+        records = [record for record in map(parse_entry, entries) if record is not None]
+
+        by_id = {}
+        for record in records:
+            by_id[record.paper_id] = record
+            by_id.setdefault(strip_version(record.paper_id), record)
+
+        for paper_id in ids:
+            record = by_id.get(paper_id)
+            if record is None:
+                result.not_found.append(paper_id)
+            else:
+                result.records[paper_id] = record
+
+    @property
+    def next_chunk_size(self) -> int:
+        """The number of IDs the next request should carry."""
+        return self.tuner.size if self.tuner is not None else self.chunk_size
+
+    def resolve_chunk(self, ids: List[str]) -> ChunkResult:
+        """
+        Resolve one chunk of normalized IDs.
+
+        Parameters:
+            ids (list): Normalized IDs, at most next_chunk_size of them
+
+        Returns:
+            ChunkResult: Records, missing IDs and failed IDs of the chunk
+        """
+        result = ChunkResult()
+        self._resolve_chunk(list(ids), result)
+        return result
+
+    def iter_chunks(self, paper_ids: Iterable[str]) -> Iterator[ChunkResult]:
+        """
+        Resolve IDs chunk by chunk, yielding each chunk's results as soon as they arrive.
+
+        Results are keyed by the normalized requested ID. IDs without a version
+        resolve to the latest version of the paper.
+
+        Parameters:
+            paper_ids (iterable): The IDs to resolve
+
+        Yields:
+            ChunkResult: Records, missing IDs and failed IDs of one chunk
+        """
+        pending = []
+        seen = set()
+        for paper_id in paper_ids:
+            paper_id = normalize_requested_id(paper_id)
+            if paper_id and paper_id not in seen:
+                seen.add(paper_id)
+                pending.append(paper_id)
+
+        position = 0
+        while position < len(pending):
+            chunk = pending[position:position + self.next_chunk_size]
+            position += len(chunk)
+            yield self.resolve_chunk(chunk)
+
+    def resolve(self, paper_ids: Iterable[str]) -> BulkResolveResult:
+        """
+        Resolve all IDs and collect the results.
+
+        Parameters:
+            paper_ids (iterable): The IDs to resolve
+
+        Returns:
+            BulkResolveResult: Records keyed by requested ID, plus the IDs that
+                               were not found and those whose requests failed
+        """
+        total = BulkResolveResult()
+        for chunk in self.iter_chunks(paper_ids):
+            total.records.update(chunk.records)
+            total.not_found.extend(chunk.not_found)
+            total.failed.extend(chunk.failed)
+        total.requests = self.requests
+        return total
+
+
+def resolve_paper_ids(paper_ids: Iterable[str], chunk_size: int = ID_LIST_CHUNK_SIZE,
+                      auto_tune: bool = True) -> BulkResolveResult:
+    """
+    Resolve a list of arXiv IDs to PaperRecords with as few API calls as possible.
+
+    Parameters:
+        paper_ids (iterable): The IDs to resolve
+        chunk_size (int): Number of IDs per request (the starting size when auto-tuning)
+        auto_tune (bool): Whether to adapt the chunk size to response times
+
+    Returns:
+        BulkResolveResult: The resolved records and the IDs that could not be resolved
+    """
+    resolver = BulkResolver(chunk_size=chunk_size, auto_tune=auto_tune)
+    return resolver.resolve(paper_ids)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+HTTP client module for the arXiv Paper Manager.
+
+This module provides a small HTTP client shared by all network calls:
+- Per-host pools of persistent (keep-alive) connections
+- Transparent gzip decoding of compressed responses
+- Redirect handling and urllib-compatible errors
+"""
+
+import atexit
+import http.client
+import queue
+import threading
+import urllib.error
+import urllib.parse
+import zlib
+from typing import Dict, Iterator, Optional, Tuple
+
+from arxiv_tool.config import HTTP_TIMEOUT, HTTP_MAX_CONNECTIONS_PER_HOST, HTTP_USER_AGENT
+
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+# Errors raised when a pooled keep-alive connection was closed by the server
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected, http.client.BadStatusLine,
+    BrokenPipeError, ConnectionResetError, ConnectionAbortedError
+)
+
+PoolKey = Tuple[str, str, int]
+
+
+class HttpResponse:
+    """
+    A response from ArxivHttpClient.
+
+    The underlying connection goes back to its pool once the body has been
+    read completely, so responses should be used as context managers or
+    closed explicitly.
+    """
+
+    def __init__(self, client: 'ArxivHttpClient', key: PoolKey, conn: http.client.HTTPConnection,
+                 response: http.client.HTTPResponse, url: str):
+        self._client = client
+        self._key = key
+        self._conn = conn
+        self._response = response
+        self.url = url
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+
+        encoding = (self.headers.get('Content-Encoding') or '').lower()
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding == 'gzip' else None
+
+    def iter_content(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Iterate over the (decoded) response body in chunks.
+
+        Parameters:
+            chunk_size (int): Number of raw bytes to read from the socket at a time
+
+        Yields:
+            bytes: The next chunk of the body
+        """
+        try:
+            while True:
+                chunk = self._response.read(chunk_size)
+                if not chunk:
+                    break
+                if self._decompressor is not None:
+                    chunk = self._decompressor.decompress(chunk)
+                    if not chunk:
+                        continue
+                yield chunk
+            if self._decompressor is not None:
+                tail = self._decompressor.flush()
+                if tail:
+                    yield tail
+        except (OSError, http.client.HTTPException) as e:
+            self.close()
+            raise urllib.error.URLError(e)
+        self.close()
+
+    def read(self) -> bytes:
+        """Read and return the whole (decoded) response body."""
+        return b''.join(self.iter_content())
+
+    def close(self) -> None:
+        """Release the connection back to its pool, or drop it if the body was not consumed."""
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        reusable = self._response.isclosed() and not self._response.will_close
+        if not reusable:
+            self._response.close()
+        self._client._release(self._key, conn, reusable)
+
+    def __enter__(self) -> 'HttpResponse':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ArxivHttpClient:
+    """
+    HTTP client with per-host connection pooling and keep-alive.
+
+    A single instance is safe to share between threads: every request takes
+    a connection out of the pool for its exclusive use and returns it when
+    the response has been read.
+    """
+
+    def __init__(self, timeout: float = HTTP_TIMEOUT,
+                 max_connections_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+                 user_agent: str = HTTP_USER_AGENT):
+        """
+        Initialize the client.
+
+        Parameters:
+            timeout (float): Socket timeout in seconds
+            max_connections_per_host (int): Idle connections kept open per host
+            user_agent (str): User-Agent header sent with every request
+        """
+        self.timeout = timeout
+        self.max_connections_per_host = max_connections_per_host
+        self.user_agent = user_agent
+        self._pools: Dict[PoolKey, queue.LifoQueue] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, key: PoolKey) -> queue.LifoQueue:
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = queue.LifoQueue()
+            return pool
+
+    def _acquire(self, key: PoolKey, fresh: bool = False) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return a connection for the host (a new one if fresh) and whether it was reused from the pool."""
+        if not fresh:
+            try:
+                return self._pool(key).get_nowait(), True
+            except queue.Empty:
+                pass
+        scheme, host, port = key
+        conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return conn_class(host, port, timeout=self.timeout), False
+
+    def _release(self, key: PoolKey, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        pool = self._pool(key)
+        if reusable and pool.qsize() < self.max_connections_per_host:
+            pool.put(conn)
+        else:
+            conn.close()
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                accept_gzip: bool = True) -> HttpResponse:
+        """
+        Send a request, following redirects, and return the open response.
+
+        Parameters:
+            method (str): The HTTP method (e.g. "GET")
+            url (str): The absolute http(s) URL to request
+            headers (dict, optional): Extra request headers
+            accept_gzip (bool): Whether to ask for a gzip-compressed response
+
+        Returns:
+            HttpResponse: The response, positioned at the start of the body
+
+        Raises:
+            urllib.error.HTTPError: If the server answers with a 4xx/5xx status
+            urllib.error.URLError: If the connection fails
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send(method, url, headers, accept_gzip)
+            if response.status not in REDIRECT_CODES or not response.headers.get('Location'):
+                break
+            location = response.headers['Location']
+            response.read()
+            url = urllib.parse.urljoin(url, location)
+        else:
+            raise urllib.error.URLError(f"Too many redirects for {url}")
+
+        if response.status >= 400:
+            response.read()
+            raise urllib.error.HTTPError(response.url, response.status, response.reason, response.headers, None)
+
+        return response
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, accept_gzip: bool = True) -> HttpResponse:
+        """Send a GET request. See request() for details."""
+        return self.request('GET', url, headers=headers, accept_gzip=accept_gzip)
+
+    def _send(self, method: str, url: str, headers: Optional[Dict[str, str]], accept_gzip: bool) -> HttpResponse:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https') or not parts.hostname:
+            raise urllib.error.URLError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+
+        path = parts.path or '/'
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        request_headers = {
+            'User-Agent': self.user_agent,
+            'Accept-Encoding': 'gzip' if accept_gzip else 'identity',
+            'Connection': 'keep-alive'
+        }
+        if headers:
+            request_headers.update(headers)
+
+        fresh = False
+        while True:
+            conn, reused = self._acquire(key, fresh)
+            try:
+                conn.request(method, path, headers=request_headers)
+                response = conn.getresponse()
+                return HttpResponse(self, key, conn, response, url)
+            except STALE_CONNECTION_ERRORS as e:
+                conn.close()
+                # A kept-alive connection may have been closed by the server; retry once on a fresh one
+                if reused:
+                    fresh = True
+                    continue
+                raise urllib.error.URLError(e)
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise urllib.error.URLError(e)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+# Shared instance
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> ArxivHttpClient:
+    """
+    Get the process-wide shared HTTP client.
+
+    Returns:
+        ArxivHttpClient: The shared client instance
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ArxivHttpClient()
+            atexit.register(_client.close)
+    return _client
@@ -6,11 +6,75 @@ This module provides functions to parse and extract metadata from arXiv API resp
 """
 
 import xml.etree.ElementTree as ET
-from typing import Dict, Optional, Any, List, Union
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Any, List, Tuple, Union
 
 from arxiv_tool.config import XML_NAMESPACES
-from arxiv_tool.utils import extract_paper_id, get_simplified_paper_id, sanitize_filename
-from .arxiv_client import extract_pdf_url
+from arxiv_tool.utils import (
+    extract_paper_id, extract_paper_id_parts, get_simplified_paper_id, sanitize_filename
+)
+
+
+@dataclass
+class PaperRecord:
+    """
+    Typed representation of a single <entry> of an arXiv Atom feed.
+    
+    A record is built once per entry by parse_feed() and then handed to the
+    metadata writer, the database layer and the SDK output as-is, so the XML
+    never has to be re-serialized or parsed again.
+    """
+    paper_id: str
+    id_url: str
+    category: Optional[str]
+    id_number: str
+    version: str
+    safe_paper_id: str
+    title: str = "Unknown Title"
+    authors: List[str] = field(default_factory=list)
+    affiliations: List[str] = field(default_factory=list)
+    pdf_url: Optional[str] = None
+    summary: str = ""
+    published: str = ""
+    updated: str = ""
+    doi: str = ""
+    journal_ref: str = ""
+    comment: str = ""
+    primary_category: str = ""
+    categories: List[str] = field(default_factory=list)
+    links: List[Dict[str, str]] = field(default_factory=list)
+    
+    @property
+    def authors_str(self) -> str:
+        """Authors as the comma-separated string stored in the database."""
+        return ', '.join(self.authors)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the record to the paper details dictionary.
+        
+        Returns:
+            dict: Paper details in the format returned by extract_paper_details_from_xml
+        """
+        return {
+            'paper_id': self.paper_id,
+            'category': self.category,
+            'id_number': self.id_number,
+            'version': self.version,
+            'safe_paper_id': self.safe_paper_id,
+            'title': self.title,
+            'authors': self.authors_str,
+            'pdf_url': self.pdf_url,
+            'summary': self.summary,
+            'published': self.published,
+            'updated': self.updated,
+            'doi': self.doi,
+            'journal_ref': self.journal_ref,
+            'comment': self.comment,
+            'primary_category': self.primary_category,
+            'categories': list(self.categories),
+            'links': list(self.links)
+        }
 
 
 def extract_summary(entry: ET.Element, ns: Dict[str, str]) -> str:
@@ -88,10 +152,149 @@ def extract_links(entry: ET.Element, ns: Dict[str, str]) -> List[Dict[str, str]]
     return links
 
 
+def extract_pdf_url_from_links(links: List[Dict[str, str]]) -> Optional[str]:
+    """Return the href of the first PDF link, or None if there is none"""
+    for link in links:
+        if link['title'] == 'pdf' or link['type'] == 'application/pdf':
+            return link['href']
+    return None
+
+
+def is_error_entry(entry: ET.Element, ns: Dict[str, str] = XML_NAMESPACES) -> bool:
+    """
+    Check whether an entry is the pseudo-entry the API uses to report a malformed query.
+    
+    Parameters:
+        entry (Element): The entry element from an arXiv API response
+        ns (dict): XML namespace mappings
+        
+    Returns:
+        bool: True if the entry's ID is an /api/errors URL
+    """
+    return '/api/errors' in entry.findtext('atom:id', default='', namespaces=ns)
+
+
+def parse_entry(entry: ET.Element, ns: Dict[str, str] = XML_NAMESPACES) -> Optional[PaperRecord]:
+    """
+    Build a PaperRecord from a single Atom <entry> element.
+    
+    Parameters:
+        entry (Element): The entry element from an arXiv API response
+        ns (dict): XML namespace mappings
+        
+    Returns:
+        PaperRecord: The parsed record, or None if the entry has no usable ID
+    """
+    id_elem = entry.find('atom:id', ns)
+    if id_elem is None or not id_elem.text:
+        return None
+    id_url = id_elem.text.strip()
+    
+    # The API reports malformed queries as a pseudo-entry with an errors URL
+    if is_error_entry(entry, ns):
+        return None
+    
+    title_elem = entry.find('atom:title', ns)
+    title = title_elem.text.strip() if title_elem is not None and title_elem.text else "Unknown Title"
+    
+    # Authors and their (optional) affiliations, kept aligned by position
+    authors = []
+    affiliations = []
+    for author in entry.findall('atom:author', ns):
+        name_elem = author.find('atom:name', ns)
+        if name_elem is not None and name_elem.text:
+            authors.append(name_elem.text.strip())
+            affiliation_elem = author.find('arxiv:affiliation', ns)
+            affiliations.append(
+                affiliation_elem.text.strip() if affiliation_elem is not None and affiliation_elem.text else ""
+            )
+    
+    paper_id = extract_paper_id(id_url)
+    parts = extract_paper_id_parts(paper_id)
+    
+    # Only add version suffix if it's explicitly present in the original ID
+    if 'v' in paper_id:
+        simple_id = parts['id_number'] + 'v' + parts['version']
+    else:
+        simple_id = parts['id_number']
+    
+    links = extract_links(entry, ns)
+    
+    return PaperRecord(
+        paper_id=paper_id,
+        id_url=id_url,
+        category=parts['category'],
+        id_number=parts['id_number'],
+        version=parts['version'],
+        safe_paper_id=sanitize_filename(simple_id),
+        title=title,
+        authors=authors,
+        affiliations=affiliations,
+        pdf_url=extract_pdf_url_from_links(links),
+        summary=extract_summary(entry, ns),
+        published=extract_published_date(entry, ns),
+        updated=extract_updated_date(entry, ns),
+        doi=extract_doi(entry, ns),
+        journal_ref=extract_journal_ref(entry, ns),
+        comment=extract_comment(entry, ns),
+        primary_category=extract_primary_category(entry, ns),
+        categories=extract_categories(entry, ns),
+        links=links
+    )
+
+
+def parse_feed(xml_response: str) -> List[PaperRecord]:
+    """
+    Parse an arXiv API Atom feed into one PaperRecord per entry.
+    
+    This is the only place where API responses are parsed; everything
+    downstream works on the returned records.
+    
+    Parameters:
+        xml_response (str): The XML response from arXiv API
+        
+    Returns:
+        list: PaperRecord objects in feed order (entries without an ID are skipped)
+        
+    Raises:
+        xml.etree.ElementTree.ParseError: If the response is not well-formed XML
+    """
+    return parse_feed_page(xml_response)[0]
+
+
+def parse_feed_page(xml_response: str) -> Tuple[List[PaperRecord], int]:
+    """
+    Parse one page of a paged arXiv API feed.
+    
+    Parameters:
+        xml_response (str): The XML response from arXiv API
+        
+    Returns:
+        tuple: (PaperRecord objects in feed order, total number of results of the query)
+        
+    Raises:
+        xml.etree.ElementTree.ParseError: If the response is not well-formed XML
+    """
+    ns = XML_NAMESPACES
+    root = ET.fromstring(xml_response)
+    
+    records = []
+    for entry in root.findall('atom:entry', ns):
+        record = parse_entry(entry, ns)
+        if record is not None:
+            records.append(record)
+    
+    total = root.findtext('opensearch:totalResults', default='', namespaces=ns).strip()
+    return records, int(total) if total.isdigit() else len(records)
+
+
 def extract_paper_details_from_xml(xml_response: str) -> Optional[Dict[str, Any]]:
     """
     Extract key details about a paper from the arXiv XML response.
     
+    Kept for callers that still hold a raw XML string; new code should call
+    parse_feed() once and work with the PaperRecord objects directly.
+    
     Parameters:
         xml_response (str): The XML response from arXiv API
         
@@ -99,67 +302,11 @@ def extract_paper_details_from_xml(xml_response: str) -> Optional[Dict[str, Any]
         dict: A dictionary containing paper details or None if extraction fails
     """
     try:
-        ns = XML_NAMESPACES
-        root = ET.fromstring(xml_response)
-        entry = root.find('atom:entry', ns)
-        
-        if entry is None:
+        records = parse_feed(xml_response)
+        if not records:
             print("No entry found in the XML response.")
             return None
-        
-        # Extract paper ID
-        id_elem = entry.find('atom:id', ns)
-        if id_elem is None or not id_elem.text:
-            print("No paper ID found in the entry.")
-            return None
-        paper_id = id_elem.text.strip()
-        
-        # Extract title
-        title_elem = entry.find('atom:title', ns)
-        title = title_elem.text.strip() if title_elem is not None and title_elem.text else "Unknown Title"
-        
-        # Extract authors
-        authors = []
-        for author in entry.findall('atom:author', ns):
-            name_elem = author.find('atom:name', ns)
-            if name_elem is not None and name_elem.text:
-                authors.append(name_elem.text.strip())
-        
-        # Get paper_id from URL
-        paper_id = extract_paper_id(paper_id)
-        
-        # Get ID parts
-        from arxiv_tool.utils import extract_paper_id_parts
-        parts = extract_paper_id_parts(paper_id)
-        
-        # Get simplified ID and create safe directory name
-        # Only add version suffix if it's explicitly present in the original ID
-        if 'v' in paper_id:
-            simple_id = parts['id_number'] + 'v' + parts['version']
-        else:
-            simple_id = parts['id_number']
-        
-        safe_paper_id = sanitize_filename(simple_id)
-        
-        return {
-            'paper_id': paper_id,
-            'category': parts['category'],
-            'id_number': parts['id_number'],
-            'version': parts['version'],
-            'safe_paper_id': safe_paper_id,
-            'title': title,
-            'authors': ', '.join(authors),
-            'pdf_url': extract_pdf_url(xml_response),
-            'summary': extract_summary(entry, ns),
-            'published': extract_published_date(entry, ns),
-            'updated': extract_updated_date(entry, ns),
-            'doi': extract_doi(entry, ns),
-            'journal_ref': extract_journal_ref(entry, ns),
-            'comment': extract_comment(entry, ns),
-            'primary_category': extract_primary_category(entry, ns),
-            'categories': extract_categories(entry, ns),
-            'links': extract_links(entry, ns)
-        }
+        return records[0].to_dict()
     except Exception as e:
         print(f"Error extracting paper details: {e}")
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Rate limiting module for the arXiv Paper Manager.
+
+This module provides a token bucket per arXiv endpoint (the query API and
+the PDF host). Bucket state lives in a small SQLite file, so every process
+using the same working directory shares one budget: two CLI runs started at
+once together stay within the allowed rate.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from arxiv_tool.config import RATE_LIMIT_STATE_FILE, RATE_LIMITS
+
+
+# Whether this process has warned that the state file is unavailable
+_fallback_warned = False
+
+
+class RateLimiter:
+    """
+    Cross-process token buckets, one per endpoint.
+
+    Each bucket refills continuously at `rate` tokens per second up to
+    `capacity`. A request takes one token and only waits for the time
+    remaining until a token is available, so time already spent on the
+    previous request counts towards the interval.
+    """
+
+    def __init__(self, state_file: str = RATE_LIMIT_STATE_FILE,
+                 limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Initialize the rate limiter.
+
+        Parameters:
+            state_file (str): SQLite file holding the shared bucket state
+            limits (dict, optional): Endpoint name -> (tokens per second, bucket capacity).
+                                   Defaults to RATE_LIMITS from the configuration.
+        """
+        self.state_file = state_file
+        self.limits = dict(RATE_LIMITS if limits is None else limits)
+        self._local = threading.local()
+        self._fallback = {}
+        self._fallback_lock = threading.Lock()
+
+    def set_interval(self, endpoint: str, seconds: float) -> None:
+        """
+        Allow one request every `seconds` on an endpoint, without bursts.
+
+        Parameters:
+            endpoint (str): The endpoint name (e.g. 'api' or 'pdf')
+            seconds (float): Minimum interval between requests; 0 or less disables limiting
+        """
+        if seconds <= 0:
+            self.limits[endpoint] = None
+        else:
+            self.limits[endpoint] = (1.0 / seconds, 1.0)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.state_file, timeout=30, isolation_level=None)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _take(tokens: Optional[float], updated_at: Optional[float], now: float,
+              rate: float, capacity: float) -> Tuple[float, float]:
+        """Refill the bucket up to `now` and try to take a token. Returns (tokens left, seconds to wait)."""
+        if tokens is None:
+            tokens = capacity
+        else:
+            tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+        if tokens >= 1.0:
+            return tokens - 1.0, 0.0
+        return tokens, (1.0 - tokens) / rate
+
+    def _try_acquire(self, endpoint: str, rate: float, capacity: float) -> float:
+        """Take a token if one is available and return 0, else return the time to wait."""
+        global _fallback_warned
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute('SELECT tokens, updated_at FROM buckets WHERE name = ?', (endpoint,)).fetchone()
+                tokens, wait = self._take(row[0] if row else None, row[1] if row else None, now, rate, capacity)
+                conn.execute('INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)',
+                             (endpoint, tokens, now))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            return wait
+        except sqlite3.Error as e:
+            # Without the shared state file, still limit this process on its own
+            with self._fallback_lock:
+                if not _fallback_warned:
+                    _fallback_warned = True
+                    print(f"Rate limiter state unavailable ({e}); limiting this process only.")
+                tokens, updated_at = self._fallback.get(endpoint, (None, None))
+                tokens, wait = self._take(tokens, updated_at, now, rate, capacity)
+                self._fallback[endpoint] = (tokens, now)
+            return wait
+
+    def acquire(self, endpoint: str) -> float:
+        """
+        Block until a request to the endpoint is allowed.
+
+        Parameters:
+            endpoint (str): The endpoint name (e.g. 'api' or 'pdf')
+
+        Returns:
+            float: The number of seconds spent waiting
+        """
+        limit = self.limits.get(endpoint)
+        if limit is None:
+            return 0.0
+        rate, capacity = limit
+
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(endpoint, rate, capacity)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            waited += wait
+
+        totals = self._thread_waits()
+        totals[endpoint] = totals.get(endpoint, 0.0) + waited
+        return waited
+
+    def _thread_waits(self) -> Dict[str, float]:
+        totals = getattr(self._local, 'waited', None)
+        if totals is None:
+            totals = self._local.waited = {}
+        return totals
+
+    def waited(self, endpoint: str) -> float:
+        """
+        Total time the calling thread has spent waiting on an endpoint.
+
+        Callers timing a request can subtract the difference to get the
+        time the request itself took.
+
+        Parameters:
+            endpoint (str): The endpoint name
+
+        Returns:
+            float: Seconds waited so far by this thread
+        """
+        return self._thread_waits().get(endpoint, 0.0)
+
+
+# Shared instance
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the process-wide shared rate limiter.
+
+    Returns:
+        RateLimiter: The shared rate limiter instance
+    """
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+    return _limiter
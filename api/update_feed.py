@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Update feed module for the arXiv Paper Manager.
+
+This module lists the papers that received a new version within a time
+window, with a lastUpdatedDate query paged in ascending date order. When
+the window is short, this is far fewer requests than asking for every
+paper of the library by ID.
+"""
+
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from arxiv_tool.config import UPDATE_FEED_PAGE_SIZE
+from .arxiv_client import search_with_retry
+from .http_client import ArxivHttpClient
+from .paper_parser import PaperRecord, parse_feed_page
+
+
+def _query_date(moment: datetime) -> str:
+    # The API takes UTC minutes; naive datetimes are local time
+    return moment.astimezone(timezone.utc).strftime('%Y%m%d%H%M')
+
+
+def fetch_updated_papers(since: datetime, until: datetime, limit: int,
+                         page_size: int = UPDATE_FEED_PAGE_SIZE,
+                         client: Optional[ArxivHttpClient] = None) -> Optional[List[PaperRecord]]:
+    """
+    Fetch every paper whose latest version is dated within a time window.
+
+    New submissions are included, since they are dated by their first
+    version. The first page reports the size of the window; when it holds
+    more than limit papers, nothing more is fetched.
+
+    Parameters:
+        since (datetime): Start of the window
+        until (datetime): End of the window
+        limit (int): Largest number of papers worth fetching
+        page_size (int): Number of papers per request
+        client (ArxivHttpClient, optional): The HTTP client to use
+
+    Returns:
+        list: The latest version of each updated paper, oldest first, or None
+              if the window holds more than limit papers or could not be fetched
+    """
+    query = f"lastUpdatedDate:[{_query_date(since)} TO {_query_date(until)}]"
+    records = []
+    total = None
+
+    while total is None or len(records) < total:
+        xml_response = search_with_retry(query, max_results=page_size, client=client, start=len(records),
+                                         sort_by='lastUpdatedDate', sort_order='ascending')
+        if xml_response is None:
+            return None
+        try:
+            page, total = parse_feed_page(xml_response)
+        except Exception as e:
+            print(f"Error parsing arXiv response: {e}")
+            return None
+
+        if total > limit:
+            print(f"{total} papers were updated since the last check; checking the library by ID instead.")
+            return None
+        if not page:
+            # The API sometimes returns an empty page in the middle of a result set
+            print("The update feed ended early; checking the library by ID instead.")
+            return None
+        records.extend(page)
+
+    return records
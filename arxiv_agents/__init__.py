@@ -13,6 +13,8 @@ from .arxiv_research_assistant import (
     download_arxiv_papers,
     check_for_paper_updates,
     fetch_paper_metadata,
+    get_library_statistics,
+    get_paper_passages,
     search_papers
 )
 
@@ -24,5 +26,7 @@ __all__ = [
     'download_arxiv_papers',
     'check_for_paper_updates',
     'fetch_paper_metadata',
+    'get_library_statistics',
+    'get_paper_passages',
     'search_papers',
 ]
\ No newline at end of file
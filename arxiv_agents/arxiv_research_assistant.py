@@ -25,6 +25,8 @@ from agent_wrapper import (
     ArxivTool, ArxivSearchParams, ArxivBatchParams, 
     ArxivListParams, ArxivOperationResult
 )
+from arxiv_tool.database import initialize_db, get_library_stats
+from arxiv_tool.models import get_relevant_chunks
 
 
 # Define function tools for the agent - removed default values to fix schema validation
@@ -83,9 +85,11 @@ def list_arxiv_papers(search_term: Optional[str], search_field: Optional[str], l
     Parameters
     ----------
     search_term : str
-        Term to filter papers by (use null for all papers)
+        Term to filter papers by (use null for all papers). Text fields are ranked by
+        relevance and accept "quoted phrases", prefix* terms, OR and NOT
     search_field : str
-        Field to search in ('title', 'authors', 'category', 'id') (use null for all fields)
+        Field to search in ('title', 'authors', 'abstract', 'text' for the PDF text, 'all',
+        'category', 'id') (use null for all text fields)
     limit : int
         Maximum number of papers to return (recommended: 100)
         
@@ -204,6 +208,54 @@ def fetch_paper_metadata() -> Dict[str, Any]:
         "stats": result.data if result.data else {}
     }
 
+@function_tool
+def get_library_statistics() -> Dict[str, Any]:
+    """
+    Get the composition of the local paper library.
+    
+    The counts are precomputed, so this is cheap even for very large libraries.
+        
+    Returns
+    -------
+    Dict[str, Any]
+        A dictionary containing:
+        - papers, with_pdf, missing_pdf, with_metadata: Paper counts for the whole library
+        - pdf_bytes: Disk space taken by the PDFs
+        - by_category, by_year, by_month: The same counts per primary category,
+          per year and per month of first submission
+    """
+    initialize_db()
+    return get_library_stats()
+
+@function_tool
+def get_paper_passages(paper_id: str, question: str, limit: int) -> Dict[str, Any]:
+    """
+    Get the passages of a downloaded paper that are most relevant to a question.
+    
+    The paper is split into sections (abstract, introduction, method, results,
+    references, ...) and passages of a few hundred tokens; only the best
+    matching passages are returned, not the whole paper.
+    
+    Parameters
+    ----------
+    paper_id : str
+        The arXiv ID of a downloaded paper
+    question : str
+        The question to answer from the paper, or search words
+    limit : int
+        Maximum number of passages to return (recommended: 3)
+        
+    Returns
+    -------
+    Dict[str, Any]
+        A dictionary containing:
+        - success: Whether the passages could be retrieved
+        - chunks: The passages, best first, with their section, heading, page and text
+        - total_chunks: Number of passages the paper was split into
+    """
+    initialize_db()
+    return get_relevant_chunks(paper_id, question, limit)
+
 
 class ArxivResearchAssistant:
     """
@@ -247,6 +299,8 @@ class ArxivResearchAssistant:
             - download_arxiv_papers: Download specific papers by their arXiv IDs
             - check_for_paper_updates: Check for updates to papers in the database
             - fetch_paper_metadata: Fetch metadata for papers that were imported without metadata
+            - get_library_statistics: Count the downloaded papers per category, year and month
+            - get_paper_passages: Get the passages of a downloaded paper relevant to a question
             
             When responding about papers, include:
             1. Title and authors
@@ -265,7 +319,9 @@ class ArxivResearchAssistant:
                 list_arxiv_papers, 
                 download_arxiv_papers,
                 check_for_paper_updates,
-                fetch_paper_metadata
+                fetch_paper_metadata,
+                get_library_statistics,
+                get_paper_passages
             ]
         )
         
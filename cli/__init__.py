@@ -11,12 +11,15 @@ from .parser import parse_args
 from .commands import (
     search_paper, batch_download_from_file, import_pdf_files,
     fetch_metadata_for_imported_papers, check_for_paper_updates,
-    process_existing_directories
+    process_existing_directories, resume_batch_jobs, reindex_library, export_metadata_files,
+    verify_library, extract_library_text, benchmark_pdf_backends
 )
 
 __all__ = [
     'start_interactive_cli', 'parse_args', 
     'search_paper', 'batch_download_from_file', 'import_pdf_files',
     'fetch_metadata_for_imported_papers', 'check_for_paper_updates',
-    'process_existing_directories'
+    'process_existing_directories', 'resume_batch_jobs', 'reindex_library',
+    'export_metadata_files', 'verify_library', 'extract_library_text',
+    'benchmark_pdf_backends'
 ]
\ No newline at end of file
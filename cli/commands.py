@@ -9,133 +9,110 @@ This module provides functions for executing various commands:
 """
 
 import os
-import time
 import glob
 import shutil
-import sqlite3
-import xml.etree.ElementTree as ET
+import threading
+import time
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple, Union
 
-from arxiv_tool.config import METADATA_SUBDIR, PDF_SUBDIR, DEFAULT_DELAY, XML_NAMESPACES
+from arxiv_tool.config import (
+    METADATA_SUBDIR, PDF_SUBDIR, DEFAULT_DELAY, ID_LIST_CHUNK_SIZE, PIPELINE_DOWNLOAD_WORKERS,
+    METADATA_FILE_EXPORT, RECONCILE_WORKERS, UPDATE_FEED_PAGE_SIZE, UPDATE_CHECK_OVERLAP_DAYS,
+    TEXT_EXTRACTION_JOBS, TEXT_EXTRACTION_SPLIT_PAGES, PDF_EXTRACTION_TIMEOUT
+)
 from arxiv_tool.database import (
-    initialize_db, paper_exists, record_paper_download, update_paper_status,
-    list_downloaded_papers, search_local_papers
+    initialize_db, paper_exists, record_papers_bulk, update_paper_status,
+    list_downloaded_papers, search_local_papers, get_papers_without_metadata, update_paper_info,
+    enqueue_jobs, lease_jobs, update_jobs, retry_jobs, next_retry_time, reclaim_stale_jobs, reset_failed_jobs,
+    get_job_counts, index_paper_texts, rebuild_search_index, search_index_available,
+    store_paper_metadata, get_paper_metadata, iter_paper_pages,
+    reconcile_library, version_key, record_known_versions, iter_latest_local_versions,
+    list_papers_downloaded_since, get_library_state, set_library_state, get_library_stats
 )
 from arxiv_tool.api import (
-    search_arxiv, save_response_to_file, extract_pdf_url, download_arxiv_pdf, 
-    extract_paper_details_from_xml, search_with_retry, create_entry_xml
+    search_arxiv, save_response_to_file, download_arxiv_pdf, search_with_retry,
+    PaperRecord, parse_feed, BulkResolver, get_rate_limiter, normalize_requested_id, fetch_updated_papers
+)
+from arxiv_tool.models import (
+    extract_and_save_metadata, parse_metadata_files, metadata_from_record, metadata_from_files,
+    record_from_metadata
+)
+from arxiv_tool.models.pdf_backends import BACKEND_ORDER_KEY, benchmark_backends, choose_backend_order
+from arxiv_tool.models.pdf_extractor import PDF_PARSER_AVAILABLE, NO_BACKEND_MESSAGE, find_paper_pdf
+from arxiv_tool.pipeline import (
+    PaperPipeline, download_paper_pdf, save_paper_metadata, record_paper_result,
+    paper_result_fields, extract_texts
 )
-from arxiv_tool.models import extract_and_save_metadata
 from arxiv_tool.utils import (
     extract_paper_id_parts, get_simplified_paper_id, sanitize_filename,
     ensure_dir_exists, is_valid_arxiv_id, print_papers_table, extract_paper_id
 )
 
 
-def process_paper(xml_response: str) -> Dict[str, Any]:
+# Library state key of the start time of the last complete update check
+UPDATES_CHECKED_KEY = 'updates_checked_at'
+
+
+def process_paper(paper: Union[PaperRecord, str]) -> Dict[str, Any]:
     """
-    Process a single paper from its XML representation.
+    Process a single paper from its parsed record.
 
-    This handles extracting details, checking if it exists in the database,
-    and downloading metadata and PDF if needed.
+    This handles checking if it exists in the database, and downloading
+    metadata and PDF if needed.
 
     Parameters:
-        xml_response (str): The XML response containing the paper entry
+        paper (PaperRecord or str): The parsed paper record. A raw XML response
+                                   containing the paper entry is also accepted.
         
     Returns:
         dict: Result of the processing with status information
     """
-    # Save the XML response to a temporary file
-    saved_path = save_response_to_file(xml_response, "arxiv_search_result", directory=".", file_type="xml")
-    
-    # Extract paper details from the XML
-    paper_details = extract_paper_details_from_xml(xml_response)
-    if not paper_details:
-        return {
-            'success': False,
-            'error': "Failed to extract paper details from XML response."
-        }
-    
-    paper_id = paper_details['paper_id']
-    safe_paper_id = paper_details['safe_paper_id']
-    title = paper_details['title']
-    authors = paper_details['authors']
-    pdf_url = paper_details['pdf_url']
-    primary_category = paper_details.get('primary_category', '')
+    if isinstance(paper, str):
+        # Save the XML response to a temporary file
+        save_response_to_file(paper, "arxiv_search_result", directory=".", file_type="xml")
+        try:
+            records = parse_feed(paper)
+        except Exception as e:
+            print(f"Error extracting paper details: {e}")
+            records = []
+        if not records:
+            return {
+                'success': False,
+                'error': "Failed to extract paper details from XML response."
+            }
+        paper = records[0]
+    
+    paper_id = paper.paper_id
+    safe_paper_id = paper.safe_paper_id
+    title = paper.title
     
     # Check if paper has already been downloaded
     if paper_exists(paper_id):
-        return {
+        result = paper_result_fields(paper)
+        result.update({
             'success': True,
             'status': 'already_exists',
-            'message': f"Paper '{title}' ({paper_id}) has already been downloaded to {safe_paper_id}/ directory.",
-            'paper_id': paper_id,
-            'safe_paper_id': safe_paper_id,
-            'title': title
-        }
+            'message': f"Paper '{title}' ({paper_id}) has already been downloaded to {safe_paper_id}/ directory."
+        })
+        return result
     
     print(f"\nDownloading paper: {title}")
-    print(f"Primary Category: {primary_category}")
-    
-    # Create the initial database record (will be updated as we complete steps)
-    record_paper_download(
-        paper_id=paper_id,
-        title=title,
-        authors=authors,
-        directory=safe_paper_id,
-        has_metadata=False,
-        has_pdf=False,
-        category=primary_category
-    )
-    
-    result = {
-        'success': True,
-        'paper_id': paper_id,
-        'safe_paper_id': safe_paper_id,
-        'title': title,
-        'authors': authors,
-        'metadata_status': False,
-        'pdf_status': False
-    }
+    print(f"Primary Category: {paper.primary_category}")
     
-    # Extract and save metadata
-    try:
-        metadata_result = extract_and_save_metadata(xml_response)
-        if metadata_result['success']:
-            update_paper_status(paper_id, has_metadata=True)
-            result['metadata_status'] = True
-            print(f"✓ Metadata extracted successfully")
-        else:
-            print(f"✗ Error extracting metadata: {metadata_result.get('error', 'Unknown error')}")
-            update_paper_status(paper_id, has_metadata=False)
-    except Exception as e:
-        print(f"✗ Error extracting metadata: {e}")
-        update_paper_status(paper_id, has_metadata=False)
-    
-    # Download the PDF
-    if pdf_url:
-        # Create the directory if it doesn't already exist
-        if not os.path.exists(safe_paper_id):
-            os.makedirs(safe_paper_id)
-            
-        # Create pdf subdirectory
-        pdf_dir = os.path.join(safe_paper_id, PDF_SUBDIR)
-        if not os.path.exists(pdf_dir):
-            os.makedirs(pdf_dir)
-        
-        try:
-            # Download the PDF into the pdf subdirectory
-            pdf_path = download_arxiv_pdf(pdf_url, directory=pdf_dir)
-            print(f"✓ PDF downloaded to: {pdf_path}")
-            update_paper_status(paper_id, has_pdf=True)
-            result['pdf_status'] = True
-            result['pdf_path'] = pdf_path
-        except Exception as e:
-            print(f"✗ Error downloading PDF: {e}")
-            update_paper_status(paper_id, has_pdf=False)
-    else:
-        print("✗ No PDF URL found for this paper")
-        update_paper_status(paper_id, has_pdf=False)
+    result = paper_result_fields(paper)
+    result['success'] = True
+    
+    # Download the PDF (the metadata is stored with the database record)
+    if METADATA_FILE_EXPORT:
+        save_paper_metadata(paper)
+    result['metadata_status'] = True
+    result['pdf_status'], pdf_path = download_paper_pdf(paper)
+    if pdf_path:
+        result['pdf_path'] = pdf_path
+    
+    # Record the paper with its final status
+    record_paper_result(paper, result['metadata_status'], result['pdf_status'])
         
     print(f"\nPaper successfully processed: {title}")
     print(f"Files saved to: {safe_paper_id}/")
@@ -143,7 +120,8 @@ def process_paper(xml_response: str) -> Dict[str, Any]:
     return result
 
 
-def search_paper(query: str, limit: int = 5, auto_download: bool = False) -> List[Dict[str, Any]]:
+def search_paper(query: str, limit: int = 5, auto_download: bool = False,
+                 workers: int = PIPELINE_DOWNLOAD_WORKERS) -> List[Dict[str, Any]]:
     """
     Search for papers and handle downloading if requested.
     
@@ -151,6 +129,7 @@ def search_paper(query: str, limit: int = 5, auto_download: bool = False) -> Lis
         query (str): The search query string
         limit (int): Maximum number of results to return
         auto_download (bool): Whether to automatically download all results
+        workers (int): Number of concurrent PDF downloads when auto-downloading
         
     Returns:
         list: List of paper details if auto_download is True, otherwise None
@@ -168,49 +147,28 @@ def search_paper(query: str, limit: int = 5, auto_download: bool = False) -> Lis
     # Save the response for debugging
     save_response_to_file(xml_response, "arxiv_search_result", directory=".", file_type="xml")
     
-    # Parse all entries in the response
-    root = ET.fromstring(xml_response)
-    entries = root.findall('atom:entry', XML_NAMESPACES)
+    # Parse all entries in the response once
+    try:
+        records = parse_feed(xml_response)
+    except Exception as e:
+        print(f"Error parsing arXiv response: {e}")
+        return []
     
-    if not entries:
+    if not records:
         print("No papers found matching your query.")
         return []
     
-    print(f"\nFound {len(entries)} papers:\n")
+    print(f"\nFound {len(records)} papers:\n")
     
     if auto_download:
-        print("Processing all papers automatically...\n")
-        results = []
+        print(f"Processing all papers automatically ({workers} parallel downloads)...\n")
         
-        for i, entry in enumerate(entries):
-            # Create a single-entry XML
-            selected_xml = create_entry_xml(entry)
-            
-            # Extract ID for logging
-            id_elem = entry.find('atom:id', XML_NAMESPACES)
-            title_elem = entry.find('atom:title', XML_NAMESPACES)
-            
-            if id_elem is not None and title_elem is not None:
-                paper_id = extract_paper_id(id_elem.text.strip())
-                title = title_elem.text.strip()
-                print(f"Processing paper {i+1}/{len(entries)}: {paper_id}")
-                print(f"Title: {title}")
-                
-                # Process the paper
-                try:
-                    result = process_paper(selected_xml)
-                    results.append(result)
-                    if result['success']:
-                        print(f"✓ Successfully processed paper {paper_id}")
-                    else:
-                        print(f"✗ Error processing paper {paper_id}: {result.get('error', 'Unknown error')}")
-                except Exception as e:
-                    print(f"✗ Error processing paper {paper_id}: {e}")
-                
-                # Sleep to avoid overwhelming the arXiv API
-                if i < len(entries) - 1:  # No need to sleep after the last paper
-                    print(f"Waiting {DEFAULT_DELAY} seconds before next request...")
-                    time.sleep(DEFAULT_DELAY)
+        pipeline = PaperPipeline(download_workers=workers)
+        results = pipeline.run(records)
+        
+        # Report results in the order of the search results
+        order = {record.paper_id: i for i, record in enumerate(records)}
+        results.sort(key=lambda result: order.get(result['paper_id'], len(order)))
         
         return results
     else:
@@ -218,25 +176,12 @@ def search_paper(query: str, limit: int = 5, auto_download: bool = False) -> Lis
         print(f"{'#':<3} {'Paper ID':<25} {'Title':<50} {'Authors':<30}")
         print("-" * 108)
         
-        # Process each entry
-        for i, entry in enumerate(entries):
-            # Extract basic information for display
-            id_elem = entry.find('atom:id', XML_NAMESPACES)
-            title_elem = entry.find('atom:title', XML_NAMESPACES)
-            
-            if id_elem is None or title_elem is None:
-                continue
-                
-            paper_id = extract_paper_id(id_elem.text.strip())
-            title = title_elem.text.strip()
+        # Display each record
+        for i, record in enumerate(records):
+            title = record.title
+            authors = record.authors
             
             # Get first author for display
-            authors = []
-            for author in entry.findall('atom:author', XML_NAMESPACES):
-                name_elem = author.find('atom:name', XML_NAMESPACES)
-                if name_elem is not None and name_elem.text:
-                    authors.append(name_elem.text.strip())
-            
             author_str = authors[0] + " et al." if len(authors) > 1 else authors[0] if authors else "Unknown"
             
             # Truncate title and authors if too long
@@ -245,7 +190,7 @@ def search_paper(query: str, limit: int = 5, auto_download: bool = False) -> Lis
             if len(author_str) > 27:
                 author_str = author_str[:27] + "..."
             
-            print(f"{i+1:<3} {paper_id:<25} {title:<50} {author_str:<30}")
+            print(f"{i+1:<3} {record.paper_id:<25} {title:<50} {author_str:<30}")
         
         # Ask user which paper to download
         while True:
@@ -255,26 +200,150 @@ def search_paper(query: str, limit: int = 5, auto_download: bool = False) -> Lis
             
             try:
                 choice = int(choice)
-                if 1 <= choice <= len(entries):
-                    # Process the selected entry by creating a single-entry XML
-                    selected_entry = entries[choice-1]
-                    selected_xml = create_entry_xml(selected_entry)
-                    
-                    # Use the regular flow to process this paper
-                    return [process_paper(selected_xml)]
+                if 1 <= choice <= len(records):
+                    # Use the regular flow to process the selected record
+                    return [process_paper(records[choice-1])]
                 else:
-                    print(f"Please enter a number between 1 and {len(entries)}")
+                    print(f"Please enter a number between 1 and {len(records)}")
             except ValueError:
                 print("Please enter a valid number")
 
 
-def batch_download_from_file(file_path: str, delay: float = DEFAULT_DELAY) -> Dict[str, Any]:
+def run_batch_jobs(batch: Optional[str] = None, delay: float = DEFAULT_DELAY,
+                   chunk_size: int = ID_LIST_CHUNK_SIZE,
+                   workers: int = PIPELINE_DOWNLOAD_WORKERS) -> Dict[str, Any]:
+    """
+    Process pending jobs from the job queue until none are left.
+    
+    Jobs are leased a chunk at a time, highest priority first, resolved with
+    one id_list request per chunk and downloaded through the paper pipeline.
+    Failed jobs are retried after a delay that doubles with each attempt.
+    Every state change is stored, so an interrupted run can be resumed.
+    
+    Parameters:
+        batch (str, optional): Only process jobs of this batch
+        delay (float): Minimum interval between API requests in seconds
+        chunk_size (int): Initial number of IDs resolved per API request
+        workers (int): Number of concurrent PDF downloads
+        
+    Returns:
+        dict: Counts of the jobs processed in this run
+    """
+    success_count = 0
+    error_count = 0
+    not_found = []
+    
+    # Pace the API requests of this run (the limiter also covers other processes)
+    get_rate_limiter().set_interval('api', delay)
+    resolver = BulkResolver(chunk_size=chunk_size)
+    
+    # Resolved paper ID -> requested IDs of the jobs waiting for it; shared by the
+    # source and writer threads of the pipeline, like the counts, under the lock
+    waiting = {}
+    lock = threading.Lock()
+    
+    def leased_records():
+        # Runs on the pipeline's source thread: PDFs of resolved papers
+        # download while the next chunk waits on the API rate limit
+        nonlocal error_count
+        while True:
+            requested_ids = lease_jobs(resolver.next_chunk_size, batch=batch)
+            if not requested_ids:
+                # Jobs that failed are retried once their retry delay has passed
+                retry_at = next_retry_time(batch)
+                if retry_at is None:
+                    break
+                wait = max(retry_at - time.time(), 0.1)
+                print(f"Waiting {wait:.0f} seconds to retry failed jobs...")
+                time.sleep(wait)
+                continue
+            
+            chunk = resolver.resolve_chunk(requested_ids)
+            
+            for paper_id in chunk.not_found:
+                print(f"Paper {paper_id} not found on arXiv.")
+                not_found.append(paper_id)
+            with lock:
+                error_count += len(chunk.not_found)
+            if chunk.not_found:
+                update_jobs(chunk.not_found, 'failed', error='Not found on arXiv')
+            
+            if chunk.failed:
+                for paper_id in chunk.failed:
+                    print(f"Failed to get response for paper {paper_id}.")
+                retried = retry_jobs(chunk.failed, 'No response from the arXiv API')
+                with lock:
+                    error_count += retried['failed']
+            
+            records = {}
+            for requested_id, record in chunk.records.items():
+                update_jobs([requested_id], 'downloading', paper_id=record.paper_id)
+                # A paper still in flight finishes the jobs added to its list until finish() takes it
+                with lock:
+                    if record.paper_id not in waiting:
+                        waiting[record.paper_id] = []
+                        records[record.paper_id] = record
+                    waiting[record.paper_id].append(requested_id)
+            
+            yield from records.values()
+    
+    def finish(result: Dict[str, Any]) -> None:
+        # Runs on the pipeline's database writer thread
+        nonlocal success_count, error_count
+        with lock:
+            requested_ids = waiting.pop(result['paper_id'], [])
+        if result['success'] and (result.get('status') == 'already_exists' or result.get('pdf_status')):
+            update_jobs(requested_ids, 'done')
+            success_count += 1
+        else:
+            error = result.get('error') or 'PDF download failed'
+            print(f"Error processing paper {result['paper_id']}: {error}")
+            failed = retry_jobs(requested_ids, error)['failed']
+            with lock:
+                error_count += failed
+    
+    pipeline = PaperPipeline(download_workers=workers)
+    pipeline.run(leased_records(), on_result=finish)
+    
+    for stage, paper, error in pipeline.errors:
+        paper_id = paper.get('paper_id') if isinstance(paper, dict) else getattr(paper, 'paper_id', None)
+        print(f"Error processing paper {paper_id} ({stage}): {error}")
+        error_count += retry_jobs(waiting.pop(paper_id, []), f"{stage}: {error}")['failed']
+    
+    print(f"\nResolved jobs with {resolver.requests} API requests.")
+    
+    remaining = get_job_counts(batch)
+    if remaining['pending']:
+        print(f"{remaining['pending']} jobs are waiting for a retry; run 'resume' to process them.")
+    
+    return {
+        'success_count': success_count,
+        'error_count': error_count,
+        'not_found': not_found,
+        'api_requests': resolver.requests,
+        'pending': remaining['pending'],
+        'failed': remaining['failed']
+    }
+
+
+def batch_download_from_file(file_path: str, delay: float = DEFAULT_DELAY,
+                             chunk_size: int = ID_LIST_CHUNK_SIZE,
+                             workers: int = PIPELINE_DOWNLOAD_WORKERS,
+                             priority: int = 0) -> Dict[str, Any]:
     """
     Download papers listed in a file.
     
+    The IDs are added to the persistent job queue and processed from there,
+    so an interrupted batch can be continued with resume_batch_jobs().
+    Metadata for the listed papers is looked up in bulk: IDs are sent to the
+    API in id_list chunks whose size is tuned from the observed response times.
+    
     Parameters:
         file_path (str): Path to the file containing paper IDs (one per line)
-        delay (int): Delay between requests in seconds
+        delay (float): Minimum interval between API requests in seconds
+        chunk_size (int): Initial number of IDs resolved per API request
+        workers (int): Number of concurrent PDF downloads
+        priority (int): Queue priority of the IDs; higher priorities are processed first
         
     Returns:
         dict: Summary of download results
@@ -292,59 +361,67 @@ def batch_download_from_file(file_path: str, delay: float = DEFAULT_DELAY) -> Di
     
     print(f"Found {len(paper_ids)} paper IDs to process.")
     
-    # Process each paper ID
-    success_count = 0
-    error_count = 0
-    already_exists_count = 0
+    requested_ids = list(dict.fromkeys(filter(None, map(normalize_requested_id, paper_ids))))
+    batch = os.path.abspath(file_path)
     
-    for i, paper_id in enumerate(paper_ids):
-        print(f"\nProcessing paper {i+1}/{len(paper_ids)}: {paper_id}")
-        
-        # Check if paper already exists in database
-        if paper_exists(paper_id):
-            print(f"Paper {paper_id} already exists in database. Skipping.")
-            already_exists_count += 1
-            continue
-        
-        try:
-            # Get arXiv XML for the paper
-            xml_response = search_with_retry(f"id:{paper_id}", max_results=1)
-            
-            if not xml_response:
-                print(f"Failed to get response for paper {paper_id}.")
-                error_count += 1
-                continue
-            
-            # Process the paper
-            result = process_paper(xml_response)
-            
-            if result['success']:
-                success_count += 1
-            else:
-                error_count += 1
-                print(f"Error processing paper {paper_id}: {result.get('error', 'Unknown error')}")
-            
-            # Sleep to avoid overwhelming the arXiv API
-            if i < len(paper_ids) - 1:  # No need to sleep after the last paper
-                print(f"Waiting {delay} seconds before next request...")
-                time.sleep(delay)
-                
-        except Exception as e:
-            print(f"Error processing paper {paper_id}: {e}")
-            error_count += 1
-            
-            # Sleep a bit longer after an error
-            print(f"Waiting {delay*2} seconds after error...")
-            time.sleep(delay * 2)
+    # Jobs left over from an interrupted run of this batch are picked up again
+    reclaim_stale_jobs()
+    queued = enqueue_jobs(requested_ids, priority=priority, batch=batch)
+    if queued['done']:
+        print(f"{queued['done']} papers already exist in database. Skipping.")
+    
+    result = run_batch_jobs(batch=batch, delay=delay, chunk_size=chunk_size, workers=workers)
     
     # Return summary
     summary = {
         'success': True,
         'total': len(paper_ids),
-        'success_count': success_count,
-        'already_exists_count': already_exists_count,
-        'error_count': error_count
+        'already_exists_count': queued['done']
     }
+    summary.update(result)
+    
+    return summary
+
+
+def resume_batch_jobs(batch_file: Optional[str] = None, retry_failed: bool = False,
+                      delay: float = DEFAULT_DELAY, chunk_size: int = ID_LIST_CHUNK_SIZE,
+                      workers: int = PIPELINE_DOWNLOAD_WORKERS) -> Dict[str, Any]:
+    """
+    Continue batch downloads that were interrupted or left jobs to retry.
+    
+    Parameters:
+        batch_file (str, optional): Only resume the batch started from this file
+        retry_failed (bool): Whether to queue failed jobs again
+        delay (float): Minimum interval between API requests in seconds
+        chunk_size (int): Initial number of IDs resolved per API request
+        workers (int): Number of concurrent PDF downloads
+        
+    Returns:
+        dict: Summary of the resumed run
+    """
+    # Initialize the database
+    initialize_db()
+    
+    batch = os.path.abspath(batch_file) if batch_file else None
+    
+    reclaimed = reclaim_stale_jobs()
+    if reclaimed:
+        print(f"Reclaimed {reclaimed} jobs from an interrupted run.")
+    if retry_failed:
+        reset = reset_failed_jobs(batch)
+        if reset:
+            print(f"Queued {reset} failed jobs again.")
+    
+    counts = get_job_counts(batch)
+    if not counts['pending']:
+        print("No pending jobs to resume.")
+        return {'success': True, 'total': 0, 'success_count': 0, 'error_count': 0,
+                'not_found': [], 'api_requests': 0, 'pending': 0, 'failed': counts['failed']}
+    
+    print(f"Resuming {counts['pending']} pending jobs ({counts['done']} already done).")
+    
+    summary = {'success': True, 'total': counts['pending']}
+    summary.update(run_batch_jobs(batch=batch, delay=delay, chunk_size=chunk_size, workers=workers))
     
     return summary
 
@@ -372,53 +449,59 @@ def import_pdf_files(directory: str) -> Dict[str, Any]:
     print(f"Found {len(pdf_files)} PDF files in {directory}")
     print("Importing files...")
     
-    successful = 0
+    copied = 0
     failed = 0
     
-    for pdf_file in pdf_files:
-        # Extract the ID from the filename
-        paper_id = os.path.splitext(pdf_file)[0]
-        
-        # Extract parts of the ID
-        parts = extract_paper_id_parts(paper_id)
-        
-        # Create directory path
-        if 'v' in paper_id:
-            safe_paper_id = parts['id_number'] + 'v' + parts['version']
-        else:
-            safe_paper_id = parts['id_number']
-        
-        safe_paper_id = sanitize_filename(safe_paper_id)
-        
-        try:
-            # Create directories
-            if not os.path.exists(safe_paper_id):
-                os.makedirs(safe_paper_id)
+    def imported_records():
+        nonlocal copied, failed
+        for pdf_file in pdf_files:
+            # Extract the ID from the filename
+            paper_id = os.path.splitext(pdf_file)[0]
             
-            pdf_dir = os.path.join(safe_paper_id, PDF_SUBDIR)
-            if not os.path.exists(pdf_dir):
-                os.makedirs(pdf_dir)
+            # Extract parts of the ID
+            parts = extract_paper_id_parts(paper_id)
             
-            # Copy the PDF file
-            source_path = os.path.join(directory, pdf_file)
-            dest_path = os.path.join(pdf_dir, pdf_file)
-            shutil.copy2(source_path, dest_path)
+            # Create directory path
+            if 'v' in paper_id:
+                safe_paper_id = parts['id_number'] + 'v' + parts['version']
+            else:
+                safe_paper_id = parts['id_number']
             
-            # Record in database
-            record_paper_download(
-                paper_id=paper_id,
-                title=f"Imported: {paper_id}",
-                authors="",
-                directory=safe_paper_id,
-                has_metadata=False,
-                has_pdf=True
-            )
+            safe_paper_id = sanitize_filename(safe_paper_id)
+            
+            try:
+                # Create directories
+                if not os.path.exists(safe_paper_id):
+                    os.makedirs(safe_paper_id)
+                
+                pdf_dir = os.path.join(safe_paper_id, PDF_SUBDIR)
+                if not os.path.exists(pdf_dir):
+                    os.makedirs(pdf_dir)
+                
+                # Copy the PDF file
+                source_path = os.path.join(directory, pdf_file)
+                dest_path = os.path.join(pdf_dir, pdf_file)
+                shutil.copy2(source_path, dest_path)
+            except Exception as e:
+                failed += 1
+                print(f"✗ Failed to import {pdf_file}: {e}")
+                continue
             
-            successful += 1
             print(f"✓ Imported: {pdf_file}")
-        except Exception as e:
-            failed += 1
-            print(f"✗ Failed to import {pdf_file}: {e}")
+            copied += 1
+            yield {
+                'paper_id': paper_id,
+                'title': f"Imported: {paper_id}",
+                'authors': "",
+                'directory': safe_paper_id,
+                'has_metadata': False,
+                'has_pdf': True,
+                'pdf_bytes': os.path.getsize(dest_path)
+            }
+    
+    # Record the copied files in the database, a chunk per transaction
+    successful = record_papers_bulk(imported_records())
+    failed += copied - successful
     
     # Return summary
     summary = {
@@ -442,19 +525,7 @@ def fetch_metadata_for_imported_papers() -> Dict[str, Any]:
     initialize_db()
     
     # Query papers with PDFs but no metadata
-    import sqlite3
-    conn = sqlite3.connect('arxiv_papers.db')
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute('''
-            SELECT paper_id, directory FROM papers
-            WHERE has_pdf = 1 AND has_metadata = 0
-        ''')
-        
-        papers = cursor.fetchall()
-    finally:
-        conn.close()
+    papers = get_papers_without_metadata()
     
     if not papers:
         print("No papers found that need metadata retrieval.")
@@ -481,46 +552,30 @@ def fetch_metadata_for_imported_papers() -> Dict[str, Any]:
             # Save the XML response
             saved_path = save_response_to_file(xml_response, "arxiv_search_result", directory=".", file_type="xml")
             
-            # Extract paper details
-            paper_details = extract_paper_details_from_xml(xml_response)
-            if not paper_details:
+            # Parse the paper record
+            records = parse_feed(xml_response)
+            if not records:
                 print(f"  ✗ Failed to extract paper details.")
                 error_count += 1
                 continue
+            record = records[0]
             
-            # Extract metadata
-            metadata_result = extract_and_save_metadata(xml_response)
-            
-            if not metadata_result['success']:
-                print(f"  ✗ Error extracting metadata: {metadata_result.get('error', 'Unknown error')}")
+            # Store the metadata in the database
+            if not store_paper_metadata([(paper_id, metadata_from_record(record))]):
+                print(f"  ✗ Error storing metadata for {paper_id}")
                 error_count += 1
                 continue
             
-            # Update database
-            update_paper_status(paper_id, has_metadata=True)
+            if METADATA_FILE_EXPORT:
+                extract_and_save_metadata(record, paper_dir=directory)
             
             # If we have title, authors, and primary category from metadata, update those too
-            if paper_details['title'] and paper_details['authors']:
-                primary_category = paper_details.get('primary_category', '')
-                conn = sqlite3.connect('arxiv_papers.db')
-                cursor = conn.cursor()
-                try:
-                    cursor.execute('''
-                        UPDATE papers
-                        SET title = ?, authors = ?, category = ?
-                        WHERE paper_id = ?
-                    ''', (paper_details['title'], paper_details['authors'], primary_category, paper_id))
-                    conn.commit()
-                finally:
-                    conn.close()
+            if record.title and record.authors:
+                update_paper_info(paper_id, record.title, record.authors_str, record.primary_category)
+            index_paper_texts([(paper_id, record.summary, None)])
             
             print(f"  ✓ Metadata retrieved successfully for {paper_id}")
             success_count += 1
-            
-            # Add a delay to avoid overwhelming the API
-            if i < len(papers) - 1:
-                print("  Waiting 3 seconds before next request...")
-                time.sleep(3)
                 
         except Exception as e:
             print(f"  ✗ Error retrieving metadata for {paper_id}: {e}")
@@ -537,151 +592,140 @@ def fetch_metadata_for_imported_papers() -> Dict[str, Any]:
     return summary
 
 
-def check_for_paper_updates() -> Dict[str, Any]:
+def check_for_paper_updates(workers: int = PIPELINE_DOWNLOAD_WORKERS, full: bool = False) -> Dict[str, Any]:
     """
     Check for newer versions of papers and update them if available.
     
+    Each paper is checked once, against the newest version downloaded, with
+    hundreds of IDs per API request. After a complete check its start time
+    is kept as a watermark. The next check then pages through the papers
+    updated since the watermark (minus UPDATE_CHECK_OVERLAP_DAYS, since new
+    versions are announced days after their date) and only looks up by ID
+    the papers downloaded since then and those already known to be outdated.
+    Every latest version found is recorded in the version catalog.
+    
+    Parameters:
+        workers (int): Number of concurrent PDF downloads
+        full (bool): Check every paper by ID, ignoring the watermark
+    
     Returns:
         dict: Summary of update check results
     """
     # Initialize the database
     initialize_db()
     
-    import sqlite3
-    conn = sqlite3.connect('arxiv_papers.db')
-    cursor = conn.cursor()
-    
-    try:
-        # Check if the table has the updated schema
-        cursor.execute("PRAGMA table_info(papers)")
-        columns = cursor.fetchall()
-        column_names = [column[1] for column in columns]
-        
-        has_new_schema = 'category' in column_names and 'id_number' in column_names and 'version' in column_names
-        
-        if not has_new_schema:
-            print("This function requires the updated database schema.")
-            return {'success': False, 'error': 'Database schema not updated'}
-        
-        # Get all papers from the database
-        cursor.execute('''
-            SELECT paper_id, id_number, version FROM papers
-            ORDER BY downloaded_at DESC
-        ''')
-        
-        papers = cursor.fetchall()
-    finally:
-        conn.close()
+    # One entry per paper, however many of its versions were downloaded
+    papers = {
+        base_id: (paper_id, version, known_version)
+        for base_id, paper_id, version, known_version in iter_latest_local_versions()
+    }
+    total = len(papers)
     
-    if not papers:
+    if not total:
         print("No papers found in the database.")
         return {'success': True, 'papers_checked': 0}
     
-    print(f"Checking {len(papers)} papers for updates...")
+    started = datetime.now()
+    watermark = None if full else get_library_state(UPDATES_CHECKED_KEY)
+    feed = None
+    if watermark:
+        checked_at = datetime.fromisoformat(watermark)
+        since = checked_at - timedelta(days=UPDATE_CHECK_OVERLAP_DAYS)
+        print(f"Listing the papers updated since {since:%Y-%m-%d}...")
+        # The feed is worth paging through while that takes fewer requests than checking every paper by ID
+        feed = fetch_updated_papers(since, started, limit=total * UPDATE_FEED_PAGE_SIZE // ID_LIST_CHUNK_SIZE)
+    
+    if feed is None:
+        lookup_ids = list(papers)
+        print(f"Checking {total} papers for updates...")
+    else:
+        feed = [record for record in feed if version_key(record.paper_id)[0] in papers]
+        recent = {version_key(paper_id)[0] for paper_id in list_papers_downloaded_since(checked_at)}
+        lookup_ids = [
+            base_id for base_id, (_, version, known_version) in papers.items()
+            if base_id in recent or known_version > version
+        ]
+        print(f"{len(feed)} papers of the library were updated since the last check; "
+              f"checking {len(lookup_ids)} more by ID...")
     
     updated_count = 0
     error_count = 0
     skipped_count = 0
+    lookup_failures = 0
+    # The counts are updated by the source and writer threads of the pipeline
+    lock = threading.Lock()
     
-    for i, (paper_id, id_number, version) in enumerate(papers):
-        print(f"\n[{i+1}/{len(papers)}] Checking: {paper_id}")
-        
-        try:
-            # For papers without a version number in the ID, we can't check for updates
-            if not version or version == '1':
-                # For papers where we don't have a version in the ID (like '2101.00001')
-                # we need to search by the base ID number to see if newer versions exist
-                search_id = id_number
-            else:
-                # For papers with an explicit version, we strip the version to search
-                search_id = id_number
-            
-            print(f"  Searching for updates to {search_id}...")
-            
-            # Search arXiv for the paper by ID number (without version)
-            xml_response = search_with_retry(f"id_list:{search_id}", max_results=5)
-            
-            if not xml_response:
-                print(f"  ✗ Failed to get response for paper {search_id}.")
-                error_count += 1
-                continue
-            
-            # Parse the XML to find all versions
-            root = ET.fromstring(xml_response)
-            entries = root.findall('atom:entry', XML_NAMESPACES)
-            
-            if not entries:
-                print(f"  No entries found for {search_id}")
-                skipped_count += 1
-                continue
-            
-            # Find the latest version
-            latest_version = None
-            latest_entry_xml = None
-            latest_paper_id = None
-            
-            for entry in entries:
-                id_elem = entry.find('atom:id', XML_NAMESPACES)
-                if id_elem is None or not id_elem.text:
-                    continue
-                
-                entry_paper_id = extract_paper_id(id_elem.text.strip())
-                entry_parts = extract_paper_id_parts(entry_paper_id)
-                
-                # Only consider entries with the same ID number
-                if entry_parts['id_number'] != id_number:
-                    continue
-                
-                if latest_version is None or int(entry_parts['version']) > int(latest_version):
-                    latest_version = entry_parts['version']
-                    latest_paper_id = entry_paper_id
-                    
-                    # Create a new XML containing just this entry
-                    latest_entry_xml = create_entry_xml(entry)
-            
-            if latest_version is None:
-                print(f"  Could not determine latest version for {search_id}")
+    def is_newer(base_id: str, record: PaperRecord) -> bool:
+        nonlocal skipped_count
+        paper_id, version, _ = papers[base_id]
+        latest_version = version_key(record.paper_id)[1]
+        if latest_version <= version:
+            with lock:
                 skipped_count += 1
-                continue
-            
-            # Check if we already have the latest version
-            if version and int(latest_version) <= int(version):
-                print(f"  Paper is already at the latest version (v{version})")
-                skipped_count += 1
-                continue
-            
-            # We found a newer version - download it
-            print(f"  Found newer version: v{latest_version} (current: v{version})")
-            print(f"  Downloading update: {latest_paper_id}")
-            
-            # Process the paper
-            result = process_paper(latest_entry_xml)
-            
+            return False
+        print(f"  {paper_id}: found newer version v{latest_version}, downloading {record.paper_id}")
+        return True
+    
+    def updated_records():
+        # Runs on the pipeline's source thread, so updates found so far
+        # download while later papers are still being checked
+        nonlocal error_count, skipped_count, lookup_failures
+        checked = set()
+        if feed:
+            record_known_versions(feed)
+            for record in feed:
+                base_id = version_key(record.paper_id)[0]
+                checked.add(base_id)
+                if is_newer(base_id, record):
+                    yield record
+        
+        resolver = BulkResolver()
+        for chunk in resolver.iter_chunks(base_id for base_id in lookup_ids if base_id not in checked):
+            record_known_versions(chunk.records.values())
+            for base_id, record in chunk.records.items():
+                checked.add(base_id)
+                if is_newer(base_id, record):
+                    yield record
+            for base_id in chunk.not_found:
+                print(f"  No entries found for {base_id}")
+            for base_id in chunk.failed:
+                print(f"  ✗ Failed to get response for paper {base_id}.")
+            checked.update(chunk.not_found)
+            with lock:
+                skipped_count += len(chunk.not_found)
+                error_count += len(chunk.failed)
+                lookup_failures += len(chunk.failed)
+        
+        # Papers missing from the update feed have not changed since the last check
+        with lock:
+            skipped_count += total - len(checked) - lookup_failures
+    
+    def report(result: Dict[str, Any]) -> None:
+        nonlocal updated_count, error_count
+        with lock:
             if result['success']:
                 updated_count += 1
-                print(f"  ✓ Successfully updated to version {latest_version}")
             else:
                 error_count += 1
-                print(f"  ✗ Error updating to version {latest_version}: {result.get('error', 'Unknown error')}")
-            
-            # Add a delay to avoid overwhelming the API
-            if i < len(papers) - 1:
-                print("  Waiting 3 seconds before next paper...")
-                time.sleep(3)
-            
-        except Exception as e:
-            print(f"  ✗ Error checking for updates: {e}")
-            error_count += 1
-            
-            # Add a longer delay after an error
-            if i < len(papers) - 1:
-                print("  Waiting 5 seconds after error...")
-                time.sleep(5)
+        if result['success']:
+            print(f"  ✓ Successfully updated to {result['paper_id']}")
+        else:
+            print(f"  ✗ Error updating to {result['paper_id']}: {result.get('error', 'Unknown error')}")
+    
+    pipeline = PaperPipeline(download_workers=workers)
+    pipeline.run(updated_records(), on_result=report)
+    error_count += len(pipeline.errors)
+    
+    # Failed downloads stay outdated in the version catalog and are retried
+    # next time, but papers that could not be looked up were not checked
+    if not lookup_failures and not pipeline.errors:
+        set_library_state(UPDATES_CHECKED_KEY, started.isoformat(sep=' '))
     
     # Return summary
     summary = {
         'success': True,
-        'total': len(papers),
+        'total': total,
+        'incremental': feed is not None,
         'updated': updated_count,
         'skipped': skipped_count,
         'errors': error_count
@@ -723,79 +767,74 @@ def process_existing_directories() -> Dict[str, Any]:
     success_metadata = 0
     success_pdf = 0
     
-    for paper_dir in paper_dirs:
-        paper_id = os.path.basename(paper_dir)
-        
-        # Check if metadata and PDF directories exist
-        has_metadata = os.path.exists(os.path.join(paper_dir, METADATA_SUBDIR)) and len(os.listdir(os.path.join(paper_dir, METADATA_SUBDIR))) > 0
-        pdf_dir = os.path.join(paper_dir, PDF_SUBDIR)
-        has_pdf = os.path.exists(pdf_dir) and len(os.listdir(pdf_dir)) > 0
-        
-        # Try to extract title, authors, and category if metadata exists
-        title = None
-        authors = None
-        category = None
-        
-        if has_metadata:
-            # Extract title
-            title_path = os.path.join(paper_dir, METADATA_SUBDIR, 'title.txt')
-            if os.path.exists(title_path):
-                with open(title_path, 'r', encoding='utf-8') as f:
-                    title = f.read().strip()
+    def directory_records():
+        nonlocal success_metadata, success_pdf
+        for paper_dir in paper_dirs:
+            paper_id = os.path.basename(paper_dir)
             
-            # Extract authors
-            authors_path = os.path.join(paper_dir, METADATA_SUBDIR, 'authors.txt')
-            if os.path.exists(authors_path):
-                with open(authors_path, 'r', encoding='utf-8') as f:
-                    authors = f.read().strip()
+            # Check if metadata and PDF directories exist
+            has_metadata = os.path.exists(os.path.join(paper_dir, METADATA_SUBDIR)) and len(os.listdir(os.path.join(paper_dir, METADATA_SUBDIR))) > 0
+            pdf_dir = os.path.join(paper_dir, PDF_SUBDIR)
+            has_pdf = os.path.exists(pdf_dir) and len(os.listdir(pdf_dir)) > 0
+            pdf_bytes = sum(entry.stat().st_size for entry in os.scandir(pdf_dir) if entry.is_file()) if has_pdf else None
             
-            # Extract category
-            category_path = os.path.join(paper_dir, METADATA_SUBDIR, 'primary_category.txt')
-            if os.path.exists(category_path):
-                with open(category_path, 'r', encoding='utf-8') as f:
-                    category = f.read().strip()
-            # Fall back to category.txt if primary_category.txt doesn't exist
-            elif os.path.exists(os.path.join(paper_dir, METADATA_SUBDIR, 'category.txt')):
-                with open(os.path.join(paper_dir, METADATA_SUBDIR, 'category.txt'), 'r', encoding='utf-8') as f:
-                    category = f.read().strip()
-        
-        if title is None:
-            title = f"Paper: {paper_id}"
-        if authors is None:
-            authors = ""
-        
-        # Parse the paper ID
-        parts = extract_paper_id_parts(paper_id)
-        
-        # Update the category in parts if we found it in metadata
-        if category:
-            parts['category'] = category
-        
-        print(f"Processing {paper_id}:")
-        print(f"  Title: {title}")
-        print(f"  Category: {category if category else '-'}")
-        print(f"  Has metadata: {has_metadata}")
-        print(f"  Has PDF: {has_pdf}")
-        
-        # Record the paper in the database with the updated category
-        if record_paper_download(
-            paper_id=paper_id,
-            title=title,
-            authors=authors, 
-            directory=paper_id,
-            has_metadata=has_metadata,
-            has_pdf=has_pdf,
-            category=parts['category']  # Use the category we found
-        ):
-            print(f"  ✓ Added to database")
-        else:
-            print(f"  ✗ Failed to add to database")
-        
-        if has_metadata:
-            success_metadata += 1
-        if has_pdf:
-            success_pdf += 1
-        print("  ------------------")
+            # Read the metadata files, to be stored in the database
+            metadata = None
+            title = None
+            authors = None
+            category = None
+            
+            if has_metadata:
+                files = parse_metadata_files(paper_dir)
+                metadata = metadata_from_files(files)
+                title = files.get('title')
+                authors = ', '.join(metadata['authors']) or None
+                # Fall back to the category.txt value if there is no primary category
+                category = metadata['primary_category'] or next(iter(metadata['categories']), None)
+            
+            if title is None:
+                title = f"Paper: {paper_id}"
+            if authors is None:
+                authors = ""
+            
+            # Parse the paper ID
+            parts = extract_paper_id_parts(paper_id)
+            
+            # Update the category in parts if we found it in metadata
+            if category:
+                parts['category'] = category
+            
+            print(f"Processing {paper_id}:")
+            print(f"  Title: {title}")
+            print(f"  Category: {category if category else '-'}")
+            print(f"  Has metadata: {has_metadata}")
+            print(f"  Has PDF: {has_pdf}")
+            
+            if has_metadata:
+                success_metadata += 1
+            if has_pdf:
+                success_pdf += 1
+            print("  ------------------")
+            
+            # Record the paper in the database with the updated category
+            yield {
+                'paper_id': paper_id,
+                'title': title,
+                'authors': authors,
+                'directory': paper_id,
+                'has_metadata': has_metadata,
+                'has_pdf': has_pdf,
+                'pdf_bytes': pdf_bytes,
+                'category': parts['category'],  # Use the category we found
+                'metadata': metadata
+            }
+    
+    # Record the papers in the database, a chunk per transaction
+    recorded = record_papers_bulk(directory_records())
+    if recorded == len(paper_dirs):
+        print(f"✓ Added {recorded} papers to database")
+    else:
+        print(f"✗ Failed to add {len(paper_dirs) - recorded} papers to database")
     
     # Return summary
     summary = {
@@ -805,4 +844,194 @@ def process_existing_directories() -> Dict[str, Any]:
         'with_pdf': success_pdf
     }
     
-    return summary
\ No newline at end of file
+    return summary
+
+
+def reindex_library(full_text: bool = False) -> Dict[str, Any]:
+    """
+    Rebuild the full-text search index of the local library.
+    
+    Parameters:
+        full_text (bool): Whether to also extract the text of the PDFs not extracted yet
+        
+    Returns:
+        dict: Summary of the reindexing
+    """
+    # Initialize the database
+    initialize_db()
+    
+    if not search_index_available():
+        return {'success': False, 'error': 'Full-text search is not available in this SQLite build'}
+    
+    print("Rebuilding the search index..." + (" (extracting PDF text)" if full_text else ""))
+    counts = rebuild_search_index(full_text=full_text)
+    
+    summary = {'success': True}
+    summary.update(counts)
+    return summary
+
+
+def export_metadata_files(paper_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Write the metadata files of downloaded papers from the metadata stored in the database.
+    
+    Parameters:
+        paper_ids (list, optional): The papers to export (defaults to all papers)
+        
+    Returns:
+        dict: Summary of the export
+    """
+    # Initialize the database
+    initialize_db()
+    
+    wanted = set(paper_ids or [])
+    total = 0
+    exported = 0
+    missing = []
+    
+    for papers in iter_paper_pages():
+        if wanted:
+            papers = [paper for paper in papers if paper[0] in wanted]
+        total += len(papers)
+        stored = get_paper_metadata(paper[0] for paper in papers)
+        
+        for paper in papers:
+            paper_id, title, directory = paper[0], paper[4], paper[7]
+            if paper_id not in stored:
+                missing.append(paper_id)
+                continue
+            
+            result = extract_and_save_metadata(record_from_metadata(paper_id, title, stored[paper_id]), paper_dir=directory)
+            if result['success']:
+                exported += 1
+    
+    if missing:
+        print(f"No stored metadata for {len(missing)} papers (run 'fetch-metadata' or 'process' first)")
+    
+    summary = {
+        'success': True,
+        'total': total,
+        'exported': exported,
+        'missing': missing
+    }
+    
+    return summary
+
+
+def verify_library(workers: int = RECONCILE_WORKERS) -> Dict[str, Any]:
+    """
+    Check that the PDF of every downloaded paper is on disk and correct the database.
+    
+    Parameters:
+        workers (int): Number of threads checking the files
+        
+    Returns:
+        dict: Summary of the check
+    """
+    # Initialize the database
+    initialize_db()
+    
+    print("Checking the files of the library...")
+    counts = reconcile_library(workers=workers)
+    
+    summary = {'success': True}
+    summary.update(counts)
+    return summary
+
+
+def _library_pdfs(missing: List[str]):
+    """Yield the (paper_id, PDF path) of the papers with a PDF, adding those whose file is gone to missing."""
+    for papers in iter_paper_pages():
+        for paper_id, _, id_number, version, _, _, _, directory, _, has_pdf in papers:
+            if not has_pdf:
+                continue
+            pdf_path = find_paper_pdf(paper_id, directory, id_number, version)
+            if pdf_path:
+                yield paper_id, pdf_path
+            else:
+                missing.append(paper_id)
+
+
+def extract_library_text(jobs: int = TEXT_EXTRACTION_JOBS,
+                         split_pages: int = TEXT_EXTRACTION_SPLIT_PAGES) -> Dict[str, Any]:
+    """
+    Extract the text of the PDFs of all papers on a pool of processes.
+    
+    The texts are cached and added to the full-text index. PDFs whose text
+    is cached already are skipped, so an interrupted run can be resumed by
+    running the command again.
+    
+    Parameters:
+        jobs (int): Number of worker processes (0 for one per CPU)
+        split_pages (int): Pages per task; longer PDFs are split across processes
+        
+    Returns:
+        dict: Summary of the extraction
+    """
+    # Initialize the database
+    initialize_db()
+    
+    if not PDF_PARSER_AVAILABLE:
+        return {'success': False, 'error': NO_BACKEND_MESSAGE}
+    
+    total = get_library_stats()['with_pdf']
+    print(f"Extracting the text of {total} PDFs with {jobs if jobs > 0 else os.cpu_count()} processes...")
+    
+    missing = []
+    
+    # Texts are indexed in batches, as they come in
+    batch = []
+    
+    def index_text(paper_id, pdf_text):
+        if pdf_text is None or not search_index_available():
+            return
+        batch.append((paper_id, None, pdf_text.text))
+        if len(batch) >= 50:
+            index_paper_texts(batch)
+            batch.clear()
+    
+    counts = extract_texts(_library_pdfs(missing), jobs, split_pages, on_result=index_text)
+    index_paper_texts(batch)
+    
+    if missing:
+        print(f"{len(missing)} PDFs were not found (run 'verify' to correct the database)")
+    
+    summary = {'success': True, 'total': total, 'missing': len(missing)}
+    summary.update(counts)
+    return summary
+
+
+def benchmark_pdf_backends(sample: int = 20, timeout: float = PDF_EXTRACTION_TIMEOUT) -> Dict[str, Any]:
+    """
+    Measure the PDF text-extraction backends on PDFs of the library and keep the best order.
+    
+    The fastest backend that fails on none of the sample PDFs and extracts
+    text of about the best quality is used first from then on.
+    
+    Parameters:
+        sample (int): Number of PDFs of the library to measure on
+        timeout (float): Time limit per document, in seconds
+        
+    Returns:
+        dict: Summary with the results of each backend and the chosen order
+    """
+    # Initialize the database
+    initialize_db()
+    
+    if not PDF_PARSER_AVAILABLE:
+        return {'success': False, 'error': NO_BACKEND_MESSAGE}
+    
+    pdf_paths = []
+    for _, pdf_path in _library_pdfs([]):
+        pdf_paths.append(pdf_path)
+        if len(pdf_paths) >= sample:
+            break
+    if not pdf_paths:
+        return {'success': False, 'error': 'No PDFs in the library to measure on'}
+    
+    print(f"Measuring the text-extraction backends on {len(pdf_paths)} PDFs...")
+    results = benchmark_backends(pdf_paths, timeout=timeout)
+    order = choose_backend_order(results)
+    set_library_state(BACKEND_ORDER_KEY, ','.join(order))
+    
+    return {'success': True, 'documents': len(pdf_paths), 'results': results, 'order': order}
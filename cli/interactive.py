@@ -9,7 +9,10 @@ for the arXiv Paper Manager.
 import os
 from typing import Optional
 
-from arxiv_tool.database import initialize_db, list_downloaded_papers, search_local_papers
+from arxiv_tool.database import (
+    initialize_db, list_downloaded_papers, search_local_papers, search_papers_fulltext,
+    search_index_available, FULLTEXT_FIELDS
+)
 from arxiv_tool.utils import print_papers_table
 from arxiv_tool.cli.commands import (
     search_paper, batch_download_from_file, import_pdf_files,
@@ -76,20 +79,36 @@ def start_interactive_cli():
             print("2. Author")
             print("3. Category")
             print("4. Paper ID")
-            search_type = input("\nEnter choice (1-4): ")
+            print("5. Abstract")
+            print("6. Full text")
+            print("7. Anywhere")
+            search_type = input("\nEnter choice (1-7): ")
             
             field_map = {
                 '1': 'title',
                 '2': 'authors',
                 '3': 'category',
-                '4': 'id'
+                '4': 'id',
+                '5': 'abstract',
+                '6': 'text',
+                '7': 'all'
             }
             
             if search_type in field_map:
                 search_term = input(f"Enter {field_map[search_type]} to search for: ")
-                papers = search_local_papers(search_term, field_map[search_type])
-                if papers:
-                    print_papers_table(papers)
+                if field_map[search_type] in ('category', 'id') or not search_index_available():
+                    papers = search_local_papers(search_term, field_map[search_type])
+                    if papers:
+                        print_papers_table(papers)
+                else:
+                    # Rank by relevance and show where each paper matched
+                    results = search_papers_fulltext(search_term, FULLTEXT_FIELDS[field_map[search_type]])
+                    if not results:
+                        print("No matching papers found.")
+                    for result in results:
+                        paper = result['paper']
+                        print(f"\n{paper[0]}: {paper[4] or 'Unknown title'}")
+                        print(f"  {result['snippet']}")
             else:
                 print("Invalid choice.")
                 
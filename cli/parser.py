@@ -21,14 +21,27 @@ def parse_args() -> argparse.Namespace:
     search_parser.add_argument("query", help="Search query")
     search_parser.add_argument("-l", "--limit", type=int, default=5, help="Maximum number of results (default: 5)")
     search_parser.add_argument("-a", "--auto-download", action="store_true", help="Automatically download all results")
+    search_parser.add_argument("-w", "--workers", type=int, default=4, help="Number of concurrent PDF downloads (default: 4)")
     search_parser.add_argument("--sdk-metadata", action="store_true", help="Output results in Agent SDK compatible metadata format")
     
     # Batch download command
     batch_parser = subparsers.add_parser("batch", help="Batch download papers from a file")
     batch_parser.add_argument("file", help="File containing paper IDs (one per line)")
     batch_parser.add_argument("-d", "--delay", type=float, default=3, help="Delay between requests in seconds (default: 3)")
+    batch_parser.add_argument("-c", "--chunk-size", type=int, default=100, help="Initial number of IDs resolved per API request (default: 100)")
+    batch_parser.add_argument("-w", "--workers", type=int, default=4, help="Number of concurrent PDF downloads (default: 4)")
+    batch_parser.add_argument("-p", "--priority", type=int, default=0, help="Queue priority; higher priorities are downloaded first (default: 0)")
     batch_parser.add_argument("--sdk-metadata", action="store_true", help="Output results in Agent SDK compatible metadata format")
     
+    # Resume command
+    resume_parser = subparsers.add_parser("resume", help="Resume interrupted batch downloads")
+    resume_parser.add_argument("-b", "--batch", help="Only resume the batch started from this file")
+    resume_parser.add_argument("--retry-failed", action="store_true", help="Also retry jobs that failed")
+    resume_parser.add_argument("-d", "--delay", type=float, default=3, help="Delay between requests in seconds (default: 3)")
+    resume_parser.add_argument("-c", "--chunk-size", type=int, default=100, help="Initial number of IDs resolved per API request (default: 100)")
+    resume_parser.add_argument("-w", "--workers", type=int, default=4, help="Number of concurrent PDF downloads (default: 4)")
+    resume_parser.add_argument("--sdk-metadata", action="store_true", help="Output results in Agent SDK compatible metadata format")
+    
     # Import command
     import_parser = subparsers.add_parser("import", help="Import PDF files")
     import_parser.add_argument("directory", help="Directory containing PDF files")
@@ -36,18 +49,52 @@ def parse_args() -> argparse.Namespace:
     
     # List command
     list_parser = subparsers.add_parser("list", help="List downloaded papers")
+    list_parser.add_argument("--page-size", type=int, help="Show one page of this many papers (default: all papers)")
+    list_parser.add_argument("--page-token", help="Start from the page with this token, printed after the previous page")
+    list_parser.add_argument("--author", help="Only list the papers of this author (full name)")
+    list_parser.add_argument("--category", help="Only list the papers in this category or archive, cross-lists included")
     list_parser.add_argument("--sdk-metadata", action="store_true", help="Output results in Agent SDK compatible metadata format")
     
+    # Stats command
+    stats_parser = subparsers.add_parser("stats", help="Show the composition of the library")
+    stats_parser.add_argument("--top", type=int, default=20, help="Number of categories to show, 0 for all (default: 20)")
+    stats_parser.add_argument("--sdk-metadata", action="store_true", help="Output results in Agent SDK compatible metadata format")
+    
     # Fetch metadata command
     fetch_parser = subparsers.add_parser("fetch-metadata", help="Fetch metadata for imported papers")
     fetch_parser.add_argument("--sdk-metadata", action="store_true", help="Output results in Agent SDK compatible metadata format")
     
     # Check updates command
     updates_parser = subparsers.add_parser("check-updates", help="Check for paper updates")
+    updates_parser.add_argument("-w", "--workers", type=int, default=4, help="Number of concurrent PDF downloads (default: 4)")
+    updates_parser.add_argument("--full", action="store_true", help="Check every paper by ID instead of only those updated since the last check")
     updates_parser.add_argument("--sdk-metadata", action="store_true", help="Output results in Agent SDK compatible metadata format")
     
     # Process existing directories command
     process_parser = subparsers.add_parser("process", help="Process existing directories")
     process_parser.add_argument("--sdk-metadata", action="store_true", help="Output results in Agent SDK compatible metadata format")
     
+    # Verify command
+    verify_parser = subparsers.add_parser("verify", help="Check the PDF files of all papers and correct the database")
+    verify_parser.add_argument("-w", "--workers", type=int, default=1, help="Number of threads checking files, useful on network filesystems (default: 1)")
+    verify_parser.add_argument("--sdk-metadata", action="store_true", help="Output results in Agent SDK compatible metadata format")
+    
+    # Export metadata command
+    export_parser = subparsers.add_parser("export-metadata", help="Write the metadata files of papers from the database")
+    export_parser.add_argument("paper_ids", nargs="*", help="Papers to export (default: all papers)")
+    export_parser.add_argument("--sdk-metadata", action="store_true", help="Output results in Agent SDK compatible metadata format")
+    
+    # Extract text command
+    extract_parser = subparsers.add_parser("extract-text", help="Extract and cache the text of all PDFs in parallel")
+    extract_parser.add_argument("-j", "--jobs", type=int, default=0, help="Number of worker processes (default: one per CPU)")
+    extract_parser.add_argument("--split-pages", type=int, default=50, help="Pages per task; longer PDFs are split across processes (default: 50)")
+    extract_parser.add_argument("--benchmark", action="store_true", help="Measure the text-extraction backends on PDFs of the library and use the best one from then on")
+    extract_parser.add_argument("--sample", type=int, default=20, help="Number of PDFs measured by --benchmark (default: 20)")
+    extract_parser.add_argument("--sdk-metadata", action="store_true", help="Output results in Agent SDK compatible metadata format")
+    
+    # Reindex command
+    reindex_parser = subparsers.add_parser("reindex", help="Rebuild the full-text search index")
+    reindex_parser.add_argument("--full-text", action="store_true", help="Also extract the text of the PDFs not extracted yet (text already extracted is always indexed)")
+    reindex_parser.add_argument("--sdk-metadata", action="store_true", help="Output results in Agent SDK compatible metadata format")
+    
     return parser.parse_args()
\ No newline at end of file
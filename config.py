@@ -9,6 +9,12 @@ import os
 
 # Database settings
 DB_FILE = 'arxiv_papers.db'
+DB_BUSY_TIMEOUT_MS = 30000  # how long a writer waits for another one before failing
+DB_SYNCHRONOUS = 'NORMAL'  # safe with WAL: a crash can lose the last commits but not corrupt the file
+DB_CACHE_SIZE_KB = 64 * 1024  # page cache per connection
+DB_BULK_CHUNK_SIZE = 500  # papers written per transaction by bulk inserts
+LIST_PAGE_SIZE = 1000  # papers read per query when listing the library
+RECONCILE_WORKERS = 1  # threads checking PDF files; more only pay off on network filesystems
 
 # API settings
 ARXIV_API_BASE_URL = 'http://export.arxiv.org/api/query'
@@ -17,10 +23,59 @@ ARXIV_API_BASE_URL = 'http://export.arxiv.org/api/query'
 DEFAULT_DELAY = 3  # seconds
 MAX_RESULTS_DEFAULT = 5
 
+# Bulk ID resolution settings (id_list requests)
+ID_LIST_CHUNK_SIZE = 100  # IDs per request (starting size when auto-tuned)
+ID_LIST_MIN_CHUNK_SIZE = 10
+ID_LIST_MAX_CHUNK_SIZE = 500
+ID_LIST_TARGET_SECONDS = 10.0  # response time the chunk size is tuned towards
+UPDATE_FEED_PAGE_SIZE = 1000  # papers per request when listing recent updates
+# New versions show up in the API days after their date, once announced
+UPDATE_CHECK_OVERLAP_DAYS = 7
+
+# Rate limits per endpoint: (requests per second, burst capacity)
+# The query API allows one request every 3 seconds; the PDF host is less strict.
+RATE_LIMITS = {
+    'api': (1.0 / DEFAULT_DELAY, 1.0),
+    'pdf': (1.0, 4.0)
+}
+RATE_LIMIT_STATE_FILE = '.arxiv_rate_limits.db'  # shared by all processes in this directory
+
+# Download pipeline settings
+PIPELINE_DOWNLOAD_WORKERS = 4  # concurrent PDF downloads
+PIPELINE_QUEUE_SIZE = 32  # items buffered between two stages
+
+# Batch job queue settings
+JOB_MAX_ATTEMPTS = 3  # attempts before a job is marked failed
+JOB_LEASE_SECONDS = 3600  # time after which a job leased by another host may be reclaimed
+JOB_RETRY_DELAY = 15  # seconds before a failed job is retried, doubled with each attempt
+
+# HTTP client settings
+HTTP_TIMEOUT = 60  # seconds
+HTTP_MAX_CONNECTIONS_PER_HOST = 4
+HTTP_USER_AGENT = 'arxiv-tool/1.0.0'
+
+# PDF download settings
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # bytes held in memory per download
+PARTIAL_DOWNLOAD_SUFFIX = '.part'
+PARTIAL_STATE_SUFFIX = '.json'  # sidecar next to a .part file, used to resume it
+
+# PDF text extraction settings
+TEXT_CACHE_COMPRESSION_LEVEL = 6  # zlib level of the extracted text kept in the database
+TEXT_EXTRACTION_JOBS = 0  # processes extracting PDF text in 'extract-text' (0 for one per CPU)
+TEXT_EXTRACTION_SPLIT_PAGES = 50  # pages per task; longer PDFs are split across processes
+PDF_EXTRACTION_TIMEOUT = 120  # seconds a backend may spend on one document before the next one is tried
+PDF_BACKEND_QUALITY_TOLERANCE = 0.05  # text quality a faster backend may lose and still be preferred
+TEXT_CHUNK_MAX_TOKENS = 400  # size bound of the passages a paper's text is split into for retrieval
+TEXT_CHUNK_MIN_TOKENS = 100  # shorter passages are merged with their neighbour in the same section
+
 # File paths and directory structure
 PDF_SUBDIR = 'pdf'
 METADATA_SUBDIR = 'metadata'
 
+# Metadata is stored in the database; set to also write the metadata/*.txt files
+# of each downloaded paper (they can be written later with 'export-metadata')
+METADATA_FILE_EXPORT = False
+
 # Metadata files
 METADATA_FILES = {
     'id.txt': 'id',
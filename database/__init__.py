@@ -6,11 +6,51 @@ This package provides database operations for managing arXiv papers.
 """
 
 from .db_manager import (
-    initialize_db, record_paper_download, update_paper_status, paper_exists,
-    search_local_papers, list_downloaded_papers, get_paper_details, delete_paper
+    initialize_db, record_paper_download, record_papers_bulk, update_paper_status, paper_exists,
+    search_local_papers, list_downloaded_papers, get_paper_details, delete_paper,
+    get_papers_without_metadata, update_paper_info, list_papers_page, iter_paper_pages,
+    iter_downloaded_papers, count_papers, encode_page_token, decode_page_token, list_papers_downloaded_since
+)
+from .library_state import get_library_state, set_library_state
+from .library_stats import STATS_DIMENSIONS, get_library_stats
+from .library import Library, get_library, close_libraries
+from .migrations import SCHEMA_VERSION, get_schema_version, migrate_database
+from .paper_facets import (
+    get_papers_by_author, get_papers_by_category, count_papers_by_author, count_papers_by_category
+)
+from .paper_metadata import METADATA_FIELDS, store_paper_metadata, get_paper_metadata
+from .paper_versions import (
+    version_key, record_known_versions, get_known_versions, iter_latest_local_versions, find_outdated_papers
+)
+from .reconcile import papers_exist, reconcile_library
+from .search_index import (
+    SEARCH_FIELDS, FULLTEXT_FIELDS, build_fts_query, search_index_available, search_papers_fulltext,
+    index_paper_texts, rebuild_search_index
+)
+from .text_cache import PdfText, join_pages, file_sha256, get_cached_text, store_cached_text
+from .text_chunks import SECTIONS, TextChunk, split_sections, chunk_text, get_text_chunks, rank_chunks
+from .job_queue import (
+    JOB_STATES, enqueue_jobs, lease_jobs, update_jobs, retry_jobs, reclaim_stale_jobs,
+    next_retry_time, reset_failed_jobs, get_job_counts, get_failed_jobs
 )
 
 __all__ = [
-    'initialize_db', 'record_paper_download', 'update_paper_status', 'paper_exists',
-    'search_local_papers', 'list_downloaded_papers', 'get_paper_details', 'delete_paper'
+    'initialize_db', 'record_paper_download', 'record_papers_bulk', 'update_paper_status', 'paper_exists',
+    'search_local_papers', 'list_downloaded_papers', 'get_paper_details', 'delete_paper',
+    'get_papers_without_metadata', 'update_paper_info', 'list_papers_page', 'iter_paper_pages',
+    'iter_downloaded_papers', 'count_papers', 'encode_page_token', 'decode_page_token',
+    'list_papers_downloaded_since', 'get_library_state', 'set_library_state', 'STATS_DIMENSIONS', 'get_library_stats',
+    'Library', 'get_library', 'close_libraries',
+    'SCHEMA_VERSION', 'get_schema_version', 'migrate_database',
+    'get_papers_by_author', 'get_papers_by_category', 'count_papers_by_author', 'count_papers_by_category',
+    'METADATA_FIELDS', 'store_paper_metadata', 'get_paper_metadata',
+    'version_key', 'record_known_versions', 'get_known_versions', 'iter_latest_local_versions',
+    'find_outdated_papers',
+    'papers_exist', 'reconcile_library',
+    'SEARCH_FIELDS', 'FULLTEXT_FIELDS', 'build_fts_query', 'search_index_available', 'search_papers_fulltext',
+    'index_paper_texts', 'rebuild_search_index',
+    'PdfText', 'join_pages', 'file_sha256', 'get_cached_text', 'store_cached_text',
+    'SECTIONS', 'TextChunk', 'split_sections', 'chunk_text', 'get_text_chunks', 'rank_chunks',
+    'JOB_STATES', 'enqueue_jobs', 'lease_jobs', 'update_jobs', 'retry_jobs', 'reclaim_stale_jobs',
+    'next_retry_time', 'reset_failed_jobs', 'get_job_counts', 'get_failed_jobs'
 ]
\ No newline at end of file
@@ -9,16 +9,24 @@ This module provides functions for database management:
 - Paper status tracking
 """
 
-import os
+import base64
+import json
 import sqlite3
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple, Any, Union
+from typing import List, Dict, Optional, Tuple, Any, Union, Iterable, Iterator
 
-from arxiv_tool.config import DB_FILE
-from arxiv_tool.utils import extract_paper_id_parts, get_simplified_paper_id, sanitize_filename
+from arxiv_tool.config import DB_BULK_CHUNK_SIZE, LIST_PAGE_SIZE
+from arxiv_tool.utils import extract_paper_id_parts, arxiv_id_key
+from .library import Library, get_library, resolve_library
+from .migrations import migrate_database
+from .paper_facets import get_papers_by_category
+from .paper_metadata import write_paper_metadata
+from .paper_versions import write_local_versions
+from .reconcile import papers_exist
+from .search_index import FULLTEXT_FIELDS, index_paper_texts, search_papers_fulltext
 
 
-def initialize_db() -> bool:
+def initialize_db(library: Optional[Library] = None) -> bool:
     """
     Initialize the SQLite database for tracking downloaded papers.
     
@@ -26,106 +34,153 @@ def initialize_db() -> bool:
     - paper_id: The full arXiv ID (e.g., 'cond-mat/0102536v1')
     - category: The paper category (e.g., 'cond-mat')
     - id_number: The paper's number identifier (e.g., '0102536')
-    - version: The paper version (e.g., '1')
+    - id_key: The integer key of a new-style ID number (see arxiv_id_key())
+    - version: The paper version (e.g., 1)
     - title: The paper title
     - authors: The paper authors (comma-separated)
-    - downloaded_at: Timestamp of when the paper was downloaded
+    - downloaded_at: When the paper was downloaded, in epoch milliseconds
     - directory: The directory where the paper files are stored
-    - has_metadata: Whether the metadata files were successfully extracted
+    - has_metadata: Whether the paper's metadata was stored (see paper_metadata)
     - has_pdf: Whether the PDF was successfully downloaded
     
+    Along with the job queue, metadata and search tables, the schema is
+    created and upgraded by the numbered migrations of the migrations module.
+    The check runs once per library session; afterwards this returns at once.
+    
+    Parameters:
+        library (Library, optional): The library session to use (defaults to the shared one)
+    
     Returns:
         bool: True if initialization was successful
     """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
+    library = library or get_library()
+    if library.initialized:
+        # The schema was checked by this process already
+        return True
     
     try:
-        # Check if the old table structure exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='papers'")
-        table_exists = cursor.fetchone()
-        
-        if table_exists:
-            # Check if we need to migrate the table
-            cursor.execute("PRAGMA table_info(papers)")
-            columns = cursor.fetchall()
-            column_names = [column[1] for column in columns]
-            
-            if 'category' not in column_names or 'id_number' not in column_names or 'version' not in column_names:
-                print("Migrating database to include separate fields for category, ID number, and version...")
-                
-                # Create a temporary table with the new schema
-                cursor.execute('''
-                    CREATE TABLE papers_new (
-                        paper_id TEXT PRIMARY KEY,
-                        category TEXT,
-                        id_number TEXT NOT NULL,
-                        version TEXT,
-                        title TEXT,
-                        authors TEXT,
-                        downloaded_at TIMESTAMP,
-                        directory TEXT NOT NULL,
-                        has_metadata BOOLEAN DEFAULT 0,
-                        has_pdf BOOLEAN DEFAULT 0
-                    )
-                ''')
-                
-                # Copy data from old table to new table, extracting the parts of the paper_id
-                cursor.execute("SELECT * FROM papers")
-                papers = cursor.fetchall()
-                
-                for paper in papers:
-                    paper_id = paper[0]
-                    parts = extract_paper_id_parts(paper_id)
-                    
-                    cursor.execute('''
-                        INSERT INTO papers_new 
-                        (paper_id, category, id_number, version, title, authors, downloaded_at, directory, has_metadata, has_pdf)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        paper_id, 
-                        parts['category'], 
-                        parts['id_number'], 
-                        parts['version'], 
-                        paper[2],  # title
-                        paper[3],  # authors
-                        paper[4],  # downloaded_at
-                        paper[5],  # directory
-                        paper[6],  # has_metadata
-                        paper[7]   # has_pdf
-                    ))
-                
-                # Drop the old table and rename the new one
-                cursor.execute("DROP TABLE papers")
-                cursor.execute("ALTER TABLE papers_new RENAME TO papers")
-        else:
-            # Create the papers table with the new schema
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS papers (
-                    paper_id TEXT PRIMARY KEY,
-                    category TEXT,
-                    id_number TEXT NOT NULL,
-                    version TEXT,
-                    title TEXT,
-                    authors TEXT,
-                    downloaded_at TIMESTAMP,
-                    directory TEXT NOT NULL,
-                    has_metadata BOOLEAN DEFAULT 0,
-                    has_pdf BOOLEAN DEFAULT 0
-                )
-            ''')
-        
-        # Create indexes for faster lookups
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_id_number ON papers (id_number)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_category ON papers (category)')
-        
-        conn.commit()
-        return True
+        migrate_database(library)
     except sqlite3.Error as e:
         print(f"Database initialization error: {e}")
         return False
-    finally:
-        conn.close()
+    
+    library.initialized = True
+    return True
+
+
+def _epoch_ms(moment: datetime) -> int:
+    """Convert a time to the epoch milliseconds stored in the downloaded_at column."""
+    return int(moment.timestamp() * 1000)
+
+
+def _paper_row(record: Dict[str, Any], now: int) -> Tuple:
+    """Build the papers table row for a record passed to record_papers_bulk()."""
+    paper_id = record['paper_id']
+    parts = extract_paper_id_parts(paper_id)
+    
+    # If category is provided, use it instead of the one from parts
+    category = record.get('category')
+    if category is None:
+        category = parts['category']
+    
+    version = parts['version']
+    
+    return (
+        paper_id,
+        arxiv_id_key(parts['id_number']),
+        category,
+        parts['id_number'],
+        int(version) if version and version.isdigit() else None,
+        record.get('title', ""),
+        record.get('authors', ""),
+        now,
+        record.get('directory', ""),
+        bool(record.get('has_metadata', False)),
+        bool(record.get('has_pdf', False)),
+        record.get('pdf_bytes')
+    )
+
+
+def _record_abstract(record: Dict[str, Any]) -> Optional[str]:
+    return record.get('abstract') or (record.get('metadata') or {}).get('summary')
+
+
+def _chunked(records: Iterable[Dict[str, Any]], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def record_papers_bulk(
+    records: Iterable[Dict[str, Any]],
+    chunk_size: int = DB_BULK_CHUNK_SIZE,
+    library: Optional[Library] = None
+) -> int:
+    """
+    Insert or update many papers with one statement and one commit per chunk.
+    
+    Each record is a dictionary with the arguments of record_paper_download():
+    'paper_id' (required), 'title', 'authors', 'directory', 'has_metadata',
+    'has_pdf' and 'category', plus 'pdf_bytes', the size of the PDF if known.
+    Existing papers are updated in place. In the same transaction, a
+    'metadata' dictionary (see METADATA_FIELDS) is stored in the
+    paper_metadata table, the paper's version is cataloged in the
+    paper_versions table and the abstract (its 'summary', or an 'abstract'
+    entry) is added to the full-text index.
+    
+    Parameters:
+        records (iterable): The paper records; may be a generator, consumed chunk by chunk
+        chunk_size (int): Number of records written per transaction
+        library (Library, optional): The library session to use (defaults to the shared one)
+        
+    Returns:
+        int: Number of records written
+    """
+    library = resolve_library(library)
+    written = 0
+    
+    for chunk in _chunked(records, max(1, chunk_size)):
+        now = _epoch_ms(datetime.now())
+        try:
+            with library.transaction() as cursor:
+                cursor.executemany('''
+                    INSERT INTO papers
+                    (paper_id, id_key, category, id_number, version, title, authors, downloaded_at, directory,
+                     has_metadata, has_pdf, pdf_bytes)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (paper_id) DO UPDATE SET
+                        title = excluded.title,
+                        authors = excluded.authors,
+                        downloaded_at = excluded.downloaded_at,
+                        directory = excluded.directory,
+                        has_metadata = excluded.has_metadata,
+                        has_pdf = excluded.has_pdf,
+                        pdf_bytes = COALESCE(excluded.pdf_bytes, pdf_bytes),
+                        category = excluded.category
+                ''', [_paper_row(record, now) for record in chunk])
+
+                metadata = [(record['paper_id'], record['metadata']) for record in chunk if record.get('metadata')]
+                if metadata:
+                    write_paper_metadata(cursor, metadata)
+
+                write_local_versions(cursor, [
+                    (record['paper_id'], (record.get('metadata') or {}).get('updated')) for record in chunk
+                ])
+
+                abstracts = [(record['paper_id'], _record_abstract(record), None) for record in chunk]
+                abstracts = [entry for entry in abstracts if entry[1]]
+                if abstracts and library.search_index:
+                    index_paper_texts(abstracts, library=library)
+            written += len(chunk)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+    
+    return written
 
 
 def record_paper_download(
@@ -135,11 +190,14 @@ def record_paper_download(
     directory: str = "", 
     has_metadata: bool = False, 
     has_pdf: bool = False,
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    library: Optional[Library] = None
 ) -> bool:
     """
     Record a paper download in the SQLite database.
     
+    Use record_papers_bulk() to record many papers at once.
+    
     Parameters:
         paper_id (str): The full arXiv ID
         title (str): The paper title
@@ -148,62 +206,25 @@ def record_paper_download(
         has_metadata (bool): Whether metadata files were extracted
         has_pdf (bool): Whether the PDF was downloaded
         category (str, optional): The paper category (overrides parts['category'] if provided)
+        library (Library, optional): The library session to use (defaults to the shared one)
         
     Returns:
         bool: True if the record was successfully inserted or updated
     """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    
-    try:
-        # Extract paper ID parts
-        parts = extract_paper_id_parts(paper_id)
-        
-        # If category is provided, use it instead of the one from parts
-        if category is not None:
-            parts['category'] = category
-        
-        # Check if the paper already exists in the database
-        cursor.execute('SELECT paper_id FROM papers WHERE paper_id = ?', (paper_id,))
-        exists = cursor.fetchone()
-        
-        if exists:
-            # Update the existing record
-            cursor.execute('''
-                UPDATE papers 
-                SET title = ?, authors = ?, downloaded_at = ?, directory = ?,
-                    has_metadata = ?, has_pdf = ?, category = ?
-                WHERE paper_id = ?
-            ''', (title, authors, datetime.now(), directory, has_metadata, has_pdf, parts['category'], paper_id))
-        else:
-            # Insert a new record
-            cursor.execute('''
-                INSERT INTO papers 
-                (paper_id, category, id_number, version, title, authors, downloaded_at, directory, has_metadata, has_pdf)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                paper_id, 
-                parts['category'], 
-                parts['id_number'], 
-                parts['version'], 
-                title, 
-                authors, 
-                datetime.now(), 
-                directory, 
-                has_metadata, 
-                has_pdf
-            ))
-        
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-        return False
-    finally:
-        conn.close()
+    record = {
+        'paper_id': paper_id,
+        'title': title,
+        'authors': authors,
+        'directory': directory,
+        'has_metadata': has_metadata,
+        'has_pdf': has_pdf,
+        'category': category
+    }
+    return record_papers_bulk([record], library=library) == 1
 
 
-def update_paper_status(paper_id: str, has_metadata: Optional[bool] = None, has_pdf: Optional[bool] = None) -> bool:
+def update_paper_status(paper_id: str, has_metadata: Optional[bool] = None, has_pdf: Optional[bool] = None,
+                        library: Optional[Library] = None) -> bool:
     """
     Update the status of a paper's metadata and PDF in the database.
     
@@ -211,11 +232,12 @@ def update_paper_status(paper_id: str, has_metadata: Optional[bool] = None, has_
         paper_id (str): The full arXiv ID
         has_metadata (bool, optional): Set to True if metadata was successfully extracted
         has_pdf (bool, optional): Set to True if PDF was successfully downloaded
+        library (Library, optional): The library session to use (defaults to the shared one)
         
     Returns:
         bool: True if the record was successfully updated
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = resolve_library(library).connection()
     cursor = conn.cursor()
     
     try:
@@ -243,101 +265,70 @@ def update_paper_status(paper_id: str, has_metadata: Optional[bool] = None, has_
             return True
         return False
     except sqlite3.Error as e:
+        conn.rollback()
         print(f"Database error: {e}")
         return False
-    finally:
-        conn.close()
 
 
-def paper_exists(paper_id: str) -> bool:
+def paper_exists(paper_id: str, library: Optional[Library] = None) -> bool:
     """
     Check if a paper has already been downloaded by querying the database.
     
+    Use papers_exist() to check many papers at once.
+    
     Parameters:
         paper_id (str): The paper ID to check
+        library (Library, optional): The library session to use (defaults to the shared one)
         
     Returns:
         bool: True if the paper exists in the database
     """
-    # Initialize the database if it doesn't exist
-    if not os.path.exists(DB_FILE):
-        initialize_db()
-    
-    # Check if paper exists in the database
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute('''
-            SELECT directory, has_metadata, has_pdf FROM papers 
-            WHERE paper_id = ?
-        ''', (paper_id,))
-        
-        result = cursor.fetchone()
-        
-        if not result:
-            return False
-        
-        directory, has_metadata, has_pdf = result
-        
-        # Verify metadata and PDF files on disk if needed
-        if has_metadata and has_pdf:
-            # Get the simplified paper ID
-            simple_id = get_simplified_paper_id(paper_id)
-            safe_paper_id = sanitize_filename(simple_id)
-            
-            # Verify metadata directory exists and has files
-            metadata_dir = os.path.join(safe_paper_id, 'metadata')
-            metadata_exists = os.path.exists(metadata_dir) and os.listdir(metadata_dir)
-            
-            # Verify PDF file exists
-            pdf_dir = os.path.join(safe_paper_id, 'pdf')
-            pdf_exists = os.path.exists(os.path.join(pdf_dir, f"{simple_id}.pdf"))
-            
-            # Update database if filesystem state doesn't match database
-            if not metadata_exists or not pdf_exists:
-                update_paper_status(paper_id, has_metadata=metadata_exists, has_pdf=pdf_exists)
-                return metadata_exists and pdf_exists
-        
-        return has_metadata and has_pdf
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-        return False
-    finally:
-        conn.close()
+    return papers_exist([paper_id], workers=1, library=library)[paper_id]
 
 
-def search_local_papers(search_term: Optional[str] = None, search_field: Optional[str] = None, limit: int = 100) -> List[Tuple]:
+def search_local_papers(search_term: Optional[str] = None, search_field: Optional[str] = None, limit: int = 100,
+                        library: Optional[Library] = None) -> List[Tuple]:
     """
     Search for papers in the local database based on various criteria.
     
+    Text fields ('title', 'authors', 'abstract', 'text' for the PDF text, or
+    'all') are searched through the full-text index and ranked by relevance;
+    the term may use "phrases", prefix* terms, OR and NOT. Without a field,
+    a term is searched in all text fields. A 'category' matches any of a
+    paper's categories, or all categories of an archive (e.g. 'cs').
+    
     Parameters:
         search_term (str, optional): The term to search for
-        search_field (str, optional): The field to search in ('title', 'authors', 'category', 'id')
+        search_field (str, optional): The field to search in ('title', 'authors', 'abstract', 'text',
+                                     'all', 'category', 'id')
         limit (int, optional): Maximum number of results to display
+        library (Library, optional): The library session to use (defaults to the shared one)
         
     Returns:
         list: List of matching paper records
     """
-    # Initialize the database if it doesn't exist
-    if not os.path.exists(DB_FILE):
-        initialize_db()
-    
-    conn = sqlite3.connect(DB_FILE)
+    library = resolve_library(library)
+    conn = library.connection()
     cursor = conn.cursor()
     
-    try:
-        # Check if the table has the updated schema
-        cursor.execute("PRAGMA table_info(papers)")
-        columns = cursor.fetchall()
-        column_names = [column[1] for column in columns]
-        
-        has_new_schema = 'category' in column_names and 'id_number' in column_names and 'version' in column_names
-        
-        if not has_new_schema:
-            print("This function requires the updated database schema.")
+    if search_term and (search_field is None or search_field in FULLTEXT_FIELDS):
+        if library.search_index:
+            results = search_papers_fulltext(search_term, FULLTEXT_FIELDS.get(search_field), limit, library=library)
+            if not results:
+                print("No matching papers found.")
+            return [result['paper'] for result in results]
+        if search_field in ('abstract', 'text'):
+            print(f"Searching by {search_field} requires full-text search, which this SQLite build lacks.")
             return []
-        
+    
+    if search_term and search_field == 'category':
+        # Cross-listed papers are found through the paper_categories table
+        papers = get_papers_by_category(search_term, limit, library=library)
+        if not papers:
+            print("No matching papers found.")
+        return papers
+    
+    try:
         # Build the query based on the search parameters
         query = '''
             SELECT paper_id, category, id_number, version, title, authors, downloaded_at, directory, has_metadata, has_pdf
@@ -346,7 +337,12 @@ def search_local_papers(search_term: Optional[str] = None, search_field: Optiona
         '''
         params = []
         
-        if search_term and search_field:
+        id_key = arxiv_id_key(search_term) if search_field == 'id' else None
+        if id_key is not None:
+            # A whole new-style ID number is looked up on the integer key
+            query += ' AND id_key = ?'
+            params.append(id_key)
+        elif search_term:
             search_term = f"%{search_term}%"  # For partial matching with LIKE
             
             if search_field == 'title':
@@ -355,12 +351,12 @@ def search_local_papers(search_term: Optional[str] = None, search_field: Optiona
             elif search_field == 'authors':
                 query += ' AND authors LIKE ?'
                 params.append(search_term)
-            elif search_field == 'category':
-                query += ' AND category LIKE ?'
-                params.append(search_term)
             elif search_field == 'id':
                 query += ' AND (paper_id LIKE ? OR id_number LIKE ?)'
                 params.extend([search_term, search_term])
+            else:
+                query += ' AND (title LIKE ? OR authors LIKE ?)'
+                params.extend([search_term, search_term])
         
         query += ' ORDER BY downloaded_at DESC LIMIT ?'
         params.append(limit)
@@ -376,70 +372,275 @@ def search_local_papers(search_term: Optional[str] = None, search_field: Optiona
     except sqlite3.Error as e:
         print(f"Database error: {e}")
         return []
-    finally:
-        conn.close()
 
 
-def list_downloaded_papers() -> List[Tuple]:
+# Columns of a paper record, as returned by the listing and search functions
+_PAPER_COLUMNS = 'paper_id, category, id_number, version, title, authors, downloaded_at, directory, has_metadata, has_pdf'
+
+
+def encode_page_token(paper: Tuple) -> str:
+    """
+    Build the token of the page that follows a paper record.
+    
+    Parameters:
+        paper (tuple): The last paper record of a page
+        
+    Returns:
+        str: An opaque token for list_papers_page()
+    """
+    key = json.dumps([paper[6], paper[0]])
+    return base64.urlsafe_b64encode(key.encode('utf-8')).decode('ascii')
+
+
+def decode_page_token(page_token: str) -> Tuple[int, str]:
+    """
+    Get the (downloaded_at, paper_id) position encoded in a page token.
+    
+    Parameters:
+        page_token (str): A token returned by list_papers_page()
+        
+    Returns:
+        tuple: The sort key of the last paper of the previous page
+        
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        downloaded_at, paper_id = json.loads(base64.urlsafe_b64decode(page_token.encode('ascii')))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page token: {page_token}") from e
+    # Tokens of the schema with textual download times are no longer valid
+    if not isinstance(downloaded_at, int) or not isinstance(paper_id, str):
+        raise ValueError(f"Invalid page token: {page_token}")
+    return downloaded_at, paper_id
+
+
+def list_papers_page(
+    page_size: int = LIST_PAGE_SIZE,
+    page_token: Optional[str] = None,
+    library: Optional[Library] = None
+) -> Tuple[List[Tuple], Optional[str]]:
+    """
+    Get one page of downloaded papers, most recently downloaded first.
+    
+    Pages are found by seeking to the position in the token on the
+    (downloaded_at, paper_id) index, then reading each paper's row by
+    rowid, so each page costs the same however deep into the library it is.
+    
+    Parameters:
+        page_size (int): Maximum number of papers in the page
+        page_token (str, optional): Token of the page to get (defaults to the first page)
+        library (Library, optional): The library session to use (defaults to the shared one)
+        
+    Returns:
+        tuple: (paper records, token of the next page or None after the last page)
+        
+    Raises:
+        ValueError: If the page token is malformed
+    """
+    conn = resolve_library(library).connection()
+    page_size = max(1, page_size)
+    
+    if page_token:
+        cursor = conn.execute(f'''
+            SELECT {_PAPER_COLUMNS} FROM papers
+            WHERE (downloaded_at, paper_id) < (?, ?)
+            ORDER BY downloaded_at DESC, paper_id DESC
+            LIMIT ?
+        ''', decode_page_token(page_token) + (page_size,))
+    else:
+        cursor = conn.execute(f'''
+            SELECT {_PAPER_COLUMNS} FROM papers
+            ORDER BY downloaded_at DESC, paper_id DESC
+            LIMIT ?
+        ''', (page_size,))
+    
+    papers = cursor.fetchall()
+    next_token = encode_page_token(papers[-1]) if len(papers) == page_size else None
+    return papers, next_token
+
+
+def iter_paper_pages(
+    page_size: int = LIST_PAGE_SIZE,
+    page_token: Optional[str] = None,
+    library: Optional[Library] = None
+) -> Iterator[List[Tuple]]:
+    """
+    Iterate over the pages of downloaded papers, most recently downloaded first.
+    
+    Parameters:
+        page_size (int): Number of papers read per query
+        page_token (str, optional): Token of the page to start from (defaults to the first page)
+        library (Library, optional): The library session to use (defaults to the shared one)
+        
+    Yields:
+        list: Pages of paper records
+        
+    Raises:
+        ValueError: If the page token is malformed
+    """
+    while True:
+        try:
+            papers, page_token = list_papers_page(page_size, page_token, library=library)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return
+        if papers:
+            yield papers
+        if page_token is None:
+            return
+
+
+def iter_downloaded_papers(
+    page_size: int = LIST_PAGE_SIZE,
+    page_token: Optional[str] = None,
+    library: Optional[Library] = None
+) -> Iterator[Tuple]:
+    """
+    Iterate over the downloaded papers, most recently downloaded first.
+    
+    Papers are read a page at a time, so memory use does not grow with the
+    size of the library.
+    
+    Parameters:
+        page_size (int): Number of papers read per query
+        page_token (str, optional): Token of the page to start from (defaults to the first page)
+        library (Library, optional): The library session to use (defaults to the shared one)
+        
+    Yields:
+        tuple: Paper records, as returned by list_downloaded_papers()
+        
+    Raises:
+        ValueError: If the page token is malformed
+    """
+    for papers in iter_paper_pages(page_size, page_token, library=library):
+        yield from papers
+
+
+def list_papers_downloaded_since(since: datetime, library: Optional[Library] = None) -> List[str]:
+    """
+    List the papers downloaded (or recorded again) after a given time.
+    
+    Parameters:
+        since (datetime): The time after which papers are listed
+        library (Library, optional): The library session to use (defaults to the shared one)
+        
+    Returns:
+        list: The paper IDs
+    """
+    conn = resolve_library(library).connection()
+    try:
+        cursor = conn.execute('SELECT paper_id FROM papers WHERE downloaded_at > ?', (_epoch_ms(since),))
+        return [row[0] for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
+
+
+def count_papers(library: Optional[Library] = None) -> int:
+    """
+    Count the papers in the database.
+    
+    Parameters:
+        library (Library, optional): The library session to use (defaults to the shared one)
+        
+    Returns:
+        int: Number of papers
+    """
+    conn = resolve_library(library).connection()
+    try:
+        return conn.execute('SELECT COUNT(*) FROM papers').fetchone()[0]
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return 0
+
+
+def list_downloaded_papers(library: Optional[Library] = None) -> List[Tuple]:
     """
     List all papers that have been downloaded and stored in the database.
     
+    Use iter_downloaded_papers() to go through a large library.
+    
+    Parameters:
+        library (Library, optional): The library session to use (defaults to the shared one)
+    
     Returns:
         list: List of paper records
     """
-    # Initialize the database if it doesn't exist
-    if not os.path.exists(DB_FILE):
-        initialize_db()
+    papers = list(iter_downloaded_papers(library=library))
+    if not papers:
+        print("No papers have been downloaded yet.")
+    return papers
+
+
+def get_papers_without_metadata(library: Optional[Library] = None) -> List[Tuple[str, str]]:
+    """
+    Get the papers that have a PDF but no metadata (e.g. imported PDF files).
     
-    conn = sqlite3.connect(DB_FILE)
+    Parameters:
+        library (Library, optional): The library session to use (defaults to the shared one)
+        
+    Returns:
+        list: (paper_id, directory) tuples
+    """
+    conn = resolve_library(library).connection()
     cursor = conn.cursor()
     
     try:
-        # Check if the table has the updated schema
-        cursor.execute("PRAGMA table_info(papers)")
-        columns = cursor.fetchall()
-        column_names = [column[1] for column in columns]
-        
-        has_new_schema = 'category' in column_names and 'id_number' in column_names and 'version' in column_names
-        
-        if has_new_schema:
-            cursor.execute('''
-                SELECT paper_id, category, id_number, version, title, authors, downloaded_at, directory, has_metadata, has_pdf
-                FROM papers
-                ORDER BY downloaded_at DESC
-            ''')
-        else:
-            cursor.execute('''
-                SELECT paper_id, simple_id, title, authors, downloaded_at, directory, has_metadata, has_pdf
-                FROM papers
-                ORDER BY downloaded_at DESC
-            ''')
-        
-        papers = cursor.fetchall()
-        
-        if not papers:
-            print("No papers have been downloaded yet.")
-            return []
-        
-        return papers
+        cursor.execute('''
+            SELECT paper_id, directory FROM papers
+            WHERE has_pdf = 1 AND has_metadata = 0
+        ''')
+        return cursor.fetchall()
     except sqlite3.Error as e:
         print(f"Database error: {e}")
         return []
-    finally:
-        conn.close()
 
 
-def get_paper_details(paper_id: str) -> Optional[Dict[str, Any]]:
+def update_paper_info(paper_id: str, title: str, authors: str, category: Optional[str],
+                      library: Optional[Library] = None) -> bool:
+    """
+    Update the title, authors and category of a paper.
+    
+    Parameters:
+        paper_id (str): The full arXiv ID
+        title (str): The paper title
+        authors (str): The authors (comma-separated)
+        category (str, optional): The primary category
+        library (Library, optional): The library session to use (defaults to the shared one)
+        
+    Returns:
+        bool: True if the record was updated
+    """
+    conn = resolve_library(library).connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('''
+            UPDATE papers
+            SET title = ?, authors = ?, category = ?
+            WHERE paper_id = ?
+        ''', (title, authors, category, paper_id))
+        conn.commit()
+        return cursor.rowcount > 0
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"Database error: {e}")
+        return False
+
+
+def get_paper_details(paper_id: str, library: Optional[Library] = None) -> Optional[Dict[str, Any]]:
     """
     Get detailed information about a paper from the database.
     
     Parameters:
         paper_id (str): The paper ID to retrieve
+        library (Library, optional): The library session to use (defaults to the shared one)
         
     Returns:
         dict: Dictionary containing paper details or None if not found
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = resolve_library(library).connection()
     cursor = conn.cursor()
     
     try:
@@ -469,21 +670,20 @@ def get_paper_details(paper_id: str) -> Optional[Dict[str, Any]]:
     except sqlite3.Error as e:
         print(f"Database error: {e}")
         return None
-    finally:
-        conn.close()
 
 
-def delete_paper(paper_id: str) -> bool:
+def delete_paper(paper_id: str, library: Optional[Library] = None) -> bool:
     """
     Delete a paper record from the database.
     
     Parameters:
         paper_id (str): The paper ID to delete
+        library (Library, optional): The library session to use (defaults to the shared one)
         
     Returns:
         bool: True if the record was successfully deleted
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = resolve_library(library).connection()
     cursor = conn.cursor()
     
     try:
@@ -491,7 +691,6 @@ def delete_paper(paper_id: str) -> bool:
         conn.commit()
         return cursor.rowcount > 0
     except sqlite3.Error as e:
+        conn.rollback()
         print(f"Database error: {e}")
-        return False
-    finally:
-        conn.close()
\ No newline at end of file
+        return False
\ No newline at end of file
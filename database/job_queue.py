@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Job queue module for the arXiv Paper Manager.
+
+This module keeps the state of batch downloads in the `jobs` table of the
+papers database, so an interrupted run can be resumed exactly where it
+stopped:
+- Each requested ID is a job: pending -> resolving -> downloading -> done/failed
+- Workers lease jobs atomically, highest priority first
+- Attempts and the last error are kept, and failed jobs are retried
+  up to a maximum number of attempts, after a delay that doubles with
+  each attempt
+- Leases held by a process that no longer runs are reclaimed
+"""
+
+import os
+import socket
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+
+from arxiv_tool.config import JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, JOB_RETRY_DELAY
+from .library import Library, resolve_library
+
+
+JOB_STATES = ('pending', 'resolving', 'downloading', 'done', 'failed')
+
+# Maximum number of bound parameters used in one IN (...) clause
+_MAX_PARAMS = 500
+
+
+def initialize_jobs_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the jobs table and its indexes if they don't exist.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor on the papers database
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id INTEGER PRIMARY KEY,
+            requested_id TEXT NOT NULL UNIQUE,
+            batch TEXT,
+            state TEXT NOT NULL DEFAULT 'pending'
+                CHECK (state IN ('pending', 'resolving', 'downloading', 'done', 'failed')),
+            priority INTEGER NOT NULL DEFAULT 0,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            paper_id TEXT,
+            lease_owner TEXT,
+            lease_expires REAL,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    ''')
+    # Leasing scans pending jobs by priority, then in insertion order
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs (state, priority DESC, job_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_batch ON jobs (batch, state)')
+
+
+def add_job_retry_time(cursor: sqlite3.Cursor) -> None:
+    """
+    Add the available_at column to the jobs table.
+
+    A pending job is not leased before its available_at time, so a failed
+    job waits before it is retried.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor on the papers database
+    """
+    cursor.execute('ALTER TABLE jobs ADD COLUMN available_at REAL NOT NULL DEFAULT 0')
+
+
+def _connect(library: Optional[Library]) -> sqlite3.Connection:
+    # The papers database creates the jobs table along with the others
+    return resolve_library(library).connection()
+
+
+def _chunks(items: List[str], size: int = _MAX_PARAMS) -> Iterable[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def lease_owner_name() -> str:
+    """
+    Name identifying the current process as the holder of a lease.
+
+    Returns:
+        str: 'hostname:pid'
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _owner_is_alive(owner: str) -> bool:
+    """Whether the process holding a lease may still be running."""
+    host, _, pid = owner.rpartition(':')
+    if host != socket.gethostname() or not pid.isdigit():
+        # A process on another host can't be checked; rely on the lease expiry
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def enqueue_jobs(paper_ids: List[str], priority: int = 0, batch: Optional[str] = None,
+                 library: Optional[Library] = None) -> Dict[str, int]:
+    """
+    Add requested IDs to the job queue.
+
+    IDs already in the queue keep their state, but take the higher of the two
+    priorities; failed jobs are queued again with a fresh attempt count, and
+    so are done jobs whose paper has lost its PDF or metadata since.
+    IDs whose paper is already fully downloaded are marked done right away.
+
+    Parameters:
+        paper_ids (list): Normalized paper IDs to queue
+        priority (int): Priority of the jobs; higher priorities are leased first
+        batch (str, optional): Name of the batch the jobs belong to
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        dict: Number of IDs that are 'queued' (still to process) and 'done'
+    """
+    conn = _connect(library)
+    cursor = conn.cursor()
+    now = time.time()
+
+    try:
+        cursor.executemany('''
+            INSERT INTO jobs (requested_id, batch, priority, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (requested_id) DO UPDATE SET
+                priority = MAX(priority, excluded.priority),
+                batch = excluded.batch,
+                state = CASE WHEN state = 'failed' THEN 'pending' ELSE state END,
+                attempts = CASE WHEN state = 'failed' THEN 0 ELSE attempts END,
+                available_at = CASE WHEN state = 'failed' THEN 0 ELSE available_at END,
+                updated_at = excluded.updated_at
+        ''', [(paper_id, batch, priority, now, now) for paper_id in paper_ids])
+
+        # The paper of a done job may have been deleted or lost its PDF since
+        for chunk in _chunks(paper_ids):
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'''
+                UPDATE jobs SET state = 'pending', attempts = 0, available_at = 0, updated_at = ?
+                WHERE state = 'done' AND requested_id IN ({placeholders}) AND NOT EXISTS (
+                    SELECT 1 FROM papers
+                    WHERE papers.paper_id = COALESCE(jobs.paper_id, jobs.requested_id)
+                    AND has_metadata AND has_pdf
+                )
+            ''', [now] + chunk)
+
+        # Papers downloaded outside the queue (or before it existed) need no job
+        cursor.execute('''
+            UPDATE jobs SET state = 'done', paper_id = requested_id, updated_at = ?
+            WHERE state = 'pending' AND requested_id IN (
+                SELECT paper_id FROM papers WHERE has_metadata AND has_pdf
+            )
+        ''', (now,))
+
+        done = 0
+        for chunk in _chunks(paper_ids):
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f"SELECT COUNT(*) FROM jobs WHERE state = 'done' AND requested_id IN ({placeholders})",
+                           chunk)
+            done += cursor.fetchone()[0]
+
+        conn.commit()
+        return {'queued': len(paper_ids) - done, 'done': done}
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        conn.rollback()
+        return {'queued': 0, 'done': 0}
+
+
+def lease_jobs(limit: int, batch: Optional[str] = None, owner: Optional[str] = None,
+               lease_seconds: float = JOB_LEASE_SECONDS, library: Optional[Library] = None) -> List[str]:
+    """
+    Atomically take pending jobs for resolving, highest priority first.
+
+    Each leased job moves to 'resolving' and its attempt count is increased.
+    Jobs waiting for a retry (see retry_jobs()) are left until their time.
+
+    Parameters:
+        limit (int): Maximum number of jobs to lease
+        batch (str, optional): Only lease jobs of this batch
+        owner (str, optional): Lease holder name (defaults to this process)
+        lease_seconds (float): Time after which the lease may be reclaimed
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        list: The requested IDs of the leased jobs, in lease order
+    """
+    owner = owner or lease_owner_name()
+    now = time.time()
+
+    query = "SELECT job_id, requested_id FROM jobs WHERE state = 'pending' AND available_at <= ?"
+    params = [now]
+    if batch is not None:
+        query += ' AND batch = ?'
+        params.append(batch)
+    params.append(limit)
+
+    try:
+        # The write lock is taken before the SELECT, so no other process can lease the same jobs
+        with resolve_library(library).transaction() as cursor:
+            cursor.execute(query + ' ORDER BY priority DESC, job_id LIMIT ?', params)
+            rows = cursor.fetchall()
+            cursor.executemany('''
+                UPDATE jobs
+                SET state = 'resolving', attempts = attempts + 1, lease_owner = ?, lease_expires = ?, updated_at = ?
+                WHERE job_id = ?
+            ''', [(owner, now + lease_seconds, now, job_id) for job_id, _ in rows])
+        return [requested_id for _, requested_id in rows]
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
+
+
+def update_jobs(requested_ids: List[str], state: str, paper_id: Optional[str] = None,
+                error: Optional[str] = None, library: Optional[Library] = None) -> bool:
+    """
+    Move jobs to a new state.
+
+    Jobs leaving 'resolving' or 'downloading' give up their lease.
+
+    Parameters:
+        requested_ids (list): The requested IDs of the jobs
+        state (str): The new state (one of JOB_STATES)
+        paper_id (str, optional): The resolved paper ID to record
+        error (str, optional): The error to record as the last error
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        bool: True if the jobs were updated
+    """
+    if state not in JOB_STATES:
+        raise ValueError(f"Unknown job state: {state}")
+
+    leased = state in ('resolving', 'downloading')
+    conn = _connect(library)
+    cursor = conn.cursor()
+
+    try:
+        for chunk in _chunks(list(requested_ids)):
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'''
+                UPDATE jobs
+                SET state = ?, paper_id = COALESCE(?, paper_id), last_error = COALESCE(?, last_error),
+                    lease_owner = CASE WHEN ? THEN lease_owner END,
+                    lease_expires = CASE WHEN ? THEN lease_expires END,
+                    updated_at = ?
+                WHERE requested_id IN ({placeholders})
+            ''', [state, paper_id, error, leased, leased, time.time()] + chunk)
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        conn.rollback()
+        return False
+
+
+def retry_jobs(requested_ids: List[str], error: str, max_attempts: int = JOB_MAX_ATTEMPTS,
+               retry_delay: float = JOB_RETRY_DELAY, library: Optional[Library] = None) -> Dict[str, int]:
+    """
+    Record a failed attempt: jobs go back to pending until they run out of attempts.
+
+    A job put back to pending is not leased again for retry_delay *
+    2 ** attempts seconds, so a short outage does not use up its attempts.
+
+    Parameters:
+        requested_ids (list): The requested IDs of the jobs
+        error (str): The error of the attempt
+        max_attempts (int): Attempts after which a job is marked failed
+        retry_delay (float): Delay before the first retry, in seconds; doubled with each attempt
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        dict: Number of jobs put back to 'pending' and marked 'failed'
+    """
+    counts = {'pending': 0, 'failed': 0}
+    now = time.time()
+
+    try:
+        with resolve_library(library).transaction() as cursor:
+            for chunk in _chunks(list(requested_ids)):
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f'''
+                    UPDATE jobs
+                    SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                        available_at = ? + ? * (1 << MIN(attempts, 20)),
+                        last_error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                    WHERE requested_id IN ({placeholders})
+                ''', [max_attempts, now, retry_delay, error, now] + chunk)
+                cursor.execute(f'''
+                    SELECT state, COUNT(*) FROM jobs
+                    WHERE requested_id IN ({placeholders}) AND state IN ('pending', 'failed')
+                    GROUP BY state
+                ''', chunk)
+                for state, count in cursor.fetchall():
+                    counts[state] += count
+        return counts
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return {'pending': 0, 'failed': 0}
+
+
+def next_retry_time(batch: Optional[str] = None, library: Optional[Library] = None) -> Optional[float]:
+    """
+    Get the time from which the next pending job can be leased.
+
+    Parameters:
+        batch (str, optional): Only consider jobs of this batch
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        float: The earliest retry time of the pending jobs (in the past if one
+               can be leased now), or None if no job is pending
+    """
+    query = "SELECT MIN(available_at) FROM jobs WHERE state = 'pending'"
+    params = []
+    if batch is not None:
+        query += ' AND batch = ?'
+        params.append(batch)
+
+    try:
+        return _connect(library).execute(query, params).fetchone()[0]
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return None
+
+
+def reclaim_stale_jobs(library: Optional[Library] = None) -> int:
+    """
+    Return jobs leased by processes that stopped to the pending state.
+
+    A lease is stale when it expired, or when it is held by a process on
+    this host that is no longer running (e.g. a killed batch run).
+
+    Parameters:
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        int: Number of jobs reclaimed
+    """
+    conn = _connect(library)
+    cursor = conn.cursor()
+    now = time.time()
+
+    try:
+        cursor.execute('''
+            SELECT DISTINCT lease_owner FROM jobs
+            WHERE state IN ('resolving', 'downloading') AND lease_owner IS NOT NULL
+        ''')
+        dead_owners = [owner for (owner,) in cursor.fetchall() if not _owner_is_alive(owner)]
+
+        placeholders = ','.join('?' * len(dead_owners))
+        cursor.execute(f'''
+            UPDATE jobs
+            SET state = 'pending', lease_owner = NULL, lease_expires = NULL, updated_at = ?
+            WHERE state IN ('resolving', 'downloading')
+              AND (lease_owner IS NULL OR lease_expires < ? OR lease_owner IN ({placeholders}))
+        ''', [now, now] + dead_owners)
+        reclaimed = cursor.rowcount
+        conn.commit()
+        return reclaimed
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        conn.rollback()
+        return 0
+
+
+def reset_failed_jobs(batch: Optional[str] = None, library: Optional[Library] = None) -> int:
+    """
+    Queue failed jobs again with a fresh attempt count.
+
+    Parameters:
+        batch (str, optional): Only reset jobs of this batch
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        int: Number of jobs reset
+    """
+    conn = _connect(library)
+    cursor = conn.cursor()
+
+    try:
+        query = ("UPDATE jobs SET state = 'pending', attempts = 0, available_at = 0, updated_at = ? "
+                 "WHERE state = 'failed'")
+        params = [time.time()]
+        if batch is not None:
+            query += ' AND batch = ?'
+            params.append(batch)
+        cursor.execute(query, params)
+        reset = cursor.rowcount
+        conn.commit()
+        return reset
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        conn.rollback()
+        return 0
+
+
+def get_job_counts(batch: Optional[str] = None, library: Optional[Library] = None) -> Dict[str, int]:
+    """
+    Count jobs per state.
+
+    Parameters:
+        batch (str, optional): Only count jobs of this batch
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        dict: State -> number of jobs, with every state present
+    """
+    counts = {state: 0 for state in JOB_STATES}
+    conn = _connect(library)
+    cursor = conn.cursor()
+
+    try:
+        query = 'SELECT state, COUNT(*) FROM jobs'
+        params = []
+        if batch is not None:
+            query += ' WHERE batch = ?'
+            params.append(batch)
+        cursor.execute(query + ' GROUP BY state', params)
+        counts.update(dict(cursor.fetchall()))
+        return counts
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return counts
+
+
+def get_failed_jobs(batch: Optional[str] = None, limit: int = 100,
+                    library: Optional[Library] = None) -> List[Dict[str, object]]:
+    """
+    List failed jobs with their last error.
+
+    Parameters:
+        batch (str, optional): Only list jobs of this batch
+        limit (int): Maximum number of jobs to return
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        list: Dictionaries with requested_id, attempts and last_error
+    """
+    conn = _connect(library)
+    cursor = conn.cursor()
+
+    try:
+        query = "SELECT requested_id, attempts, last_error FROM jobs WHERE state = 'failed'"
+        params = []
+        if batch is not None:
+            query += ' AND batch = ?'
+            params.append(batch)
+        cursor.execute(query + ' ORDER BY updated_at DESC LIMIT ?', params + [limit])
+        return [
+            {'requested_id': requested_id, 'attempts': attempts, 'last_error': last_error}
+            for requested_id, attempts, last_error in cursor.fetchall()
+        ]
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Library session module for the arXiv Paper Manager.
+
+This module provides the Library object, which owns the connections to the
+papers database. Instead of opening a connection for every query, each
+thread keeps one long-lived connection, configured for concurrent use:
+- WAL journal mode, so readers don't block the writer (and vice versa)
+- A busy timeout, so writers wait for each other instead of failing
+- synchronous=NORMAL and a larger page cache for faster writes
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from arxiv_tool.config import DB_FILE, DB_BUSY_TIMEOUT_MS, DB_CACHE_SIZE_KB, DB_SYNCHRONOUS
+
+
+class Library:
+    """
+    A session on the papers database with one connection per thread.
+
+    All database helpers accept a Library; when none is given they use the
+    shared one returned by get_library().
+    """
+
+    def __init__(self, db_file: str = DB_FILE):
+        """
+        Initialize the library session.
+
+        Parameters:
+            db_file (str): Path to the SQLite database file
+        """
+        self.db_file = db_file
+        self.initialized = False
+        self.search_index = False
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, timeout=DB_BUSY_TIMEOUT_MS / 1000.0, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f'PRAGMA busy_timeout={int(DB_BUSY_TIMEOUT_MS)}')
+        conn.execute(f'PRAGMA synchronous={DB_SYNCHRONOUS}')
+        # A negative cache_size is a size in KiB rather than a number of pages
+        conn.execute(f'PRAGMA cache_size=-{int(DB_CACHE_SIZE_KB)}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+
+    def _close_dead_threads(self) -> None:
+        """Close connections of threads that have exited (e.g. finished pipeline workers)."""
+        alive = {thread.ident for thread in threading.enumerate()}
+        for ident in [ident for ident in self._connections if ident not in alive]:
+            self._connections.pop(ident).close()
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's connection, opening it on first use.
+
+        Returns:
+            sqlite3.Connection: The connection of the current thread
+        """
+        ident = threading.get_ident()
+        conn = self._connections.get(ident)
+        if conn is None:
+            with self._lock:
+                self._close_dead_threads()
+                conn = self._connections[ident] = self._open()
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Run statements in a write transaction on the calling thread's connection.
+
+        The transaction takes the write lock up front, is committed when the
+        block completes and rolled back if it raises.
+
+        Yields:
+            sqlite3.Cursor: A cursor for the statements of the transaction
+        """
+        conn = self.connection()
+        if conn.in_transaction:
+            # Already inside a transaction of this thread; let the outer one commit
+            yield conn.cursor()
+            return
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn.cursor()
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def close(self) -> None:
+        """Close all connections of this library."""
+        with self._lock:
+            for conn in self._connections.values():
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+
+
+# Shared libraries, one per database file
+_libraries: Dict[str, Library] = {}
+_libraries_lock = threading.Lock()
+
+
+def get_library(db_file: Optional[str] = None) -> Library:
+    """
+    Get the process-wide shared library for a database file.
+
+    Parameters:
+        db_file (str, optional): Path to the database file (defaults to DB_FILE)
+
+    Returns:
+        Library: The shared library session
+    """
+    path = os.path.abspath(db_file or DB_FILE)
+    with _libraries_lock:
+        library = _libraries.get(path)
+        if library is None:
+            library = _libraries[path] = Library(path)
+    return library
+
+
+def resolve_library(library: Optional[Library] = None) -> Library:
+    """
+    Return the given library, or the shared one, creating its tables on first use.
+
+    Parameters:
+        library (Library, optional): The library session to use
+
+    Returns:
+        Library: An initialized library session
+    """
+    library = library or get_library()
+    if not library.initialized:
+        from .db_manager import initialize_db
+        initialize_db(library)
+    return library
+
+
+def close_libraries() -> None:
+    """Close the connections of all shared libraries."""
+    with _libraries_lock:
+        for library in _libraries.values():
+            library.close()
+        _libraries.clear()
+
+
+atexit.register(close_libraries)
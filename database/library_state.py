@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Library state module for the arXiv Paper Manager.
+
+This module keeps small named values that belong to a library rather than
+to a paper, such as the time of the last update check, in the
+library_state table.
+"""
+
+import sqlite3
+from typing import Optional
+
+from .library import Library, resolve_library
+
+
+def initialize_state_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the library_state table if it doesn't exist.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor on the papers database
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS library_state (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    ''')
+
+
+def get_library_state(key: str, library: Optional[Library] = None) -> Optional[str]:
+    """
+    Get a value of the library state.
+
+    Parameters:
+        key (str): The name of the value
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        str: The value, or None if it was never set
+    """
+    try:
+        row = resolve_library(library).connection().execute(
+            'SELECT value FROM library_state WHERE key = ?', (key,)
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return None
+    return row[0] if row else None
+
+
+def set_library_state(key: str, value: Optional[str], library: Optional[Library] = None) -> bool:
+    """
+    Set a value of the library state.
+
+    Parameters:
+        key (str): The name of the value
+        value (str): The new value; None removes it
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        bool: True if the value was stored
+    """
+    try:
+        with resolve_library(library).transaction() as cursor:
+            if value is None:
+                cursor.execute('DELETE FROM library_state WHERE key = ?', (key,))
+            else:
+                cursor.execute('INSERT OR REPLACE INTO library_state (key, value) VALUES (?, ?)', (key, value))
+        return True
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return False
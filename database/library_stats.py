@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Library statistics module for the arXiv Paper Manager.
+
+The library_stats table keeps, for the whole library and for each primary
+category, year and month, the number of papers, of papers with a PDF and
+with metadata, and the bytes their PDFs take on disk. Triggers on the
+papers table keep it up to date on every insert, update and delete, so
+reading the statistics costs the same for ten papers as for half a million.
+
+The year and month are those of the arXiv ID (YYMM.NNNNN, or archive/YYMMNNN
+for old-style IDs), i.e. of the first submission.
+"""
+
+import sqlite3
+from typing import Any, Dict, Optional
+
+from .library import Library, resolve_library
+
+
+# The 'YYYY-MM' of a paper row's ID number, or '' if it has none
+_MONTH_SQL = '''CASE WHEN {row}.id_number GLOB '[0-9][0-9][0-9][0-9]*' THEN
+    (CASE WHEN substr({row}.id_number, 1, 2) >= '91' THEN '19' ELSE '20' END)
+    || substr({row}.id_number, 1, 2) || '-' || substr({row}.id_number, 3, 2)
+ELSE '' END'''
+
+# Dimension name -> SQL of its value for a paper row
+STATS_DIMENSIONS = {
+    'total': "''",
+    'category': "COALESCE({row}.category, '')",
+    'year': f"substr({_MONTH_SQL}, 1, 4)",
+    'month': _MONTH_SQL,
+}
+
+
+def _counts_sql(row: str, sign: int) -> str:
+    """Build the statement adding (sign 1) or removing (sign -1) a paper row from the counts."""
+    dimensions = ' UNION ALL '.join(
+        f"SELECT '{name}' AS dimension, {value.format(row=row)} AS value"
+        for name, value in STATS_DIMENSIONS.items()
+    )
+    # 'WHERE true' keeps the parser from reading ON CONFLICT as part of a join
+    return f'''
+        INSERT INTO library_stats (dimension, value, papers, with_pdf, with_metadata, pdf_bytes)
+        SELECT dimension, value, {sign},
+               CASE WHEN {row}.has_pdf THEN {sign} ELSE 0 END,
+               CASE WHEN {row}.has_metadata THEN {sign} ELSE 0 END,
+               CASE WHEN {row}.has_pdf THEN {sign} * COALESCE({row}.pdf_bytes, 0) ELSE 0 END
+        FROM ({dimensions}) WHERE true
+        ON CONFLICT (dimension, value) DO UPDATE SET
+            papers = papers + excluded.papers,
+            with_pdf = with_pdf + excluded.with_pdf,
+            with_metadata = with_metadata + excluded.with_metadata,
+            pdf_bytes = pdf_bytes + excluded.pdf_bytes;
+    '''
+
+
+def initialize_stats_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Add the pdf_bytes column to papers, create the library_stats table and its triggers, and count the papers.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor on the papers database
+    """
+    cursor.execute("SELECT 1 FROM pragma_table_info('papers') WHERE name = 'pdf_bytes'")
+    if cursor.fetchone() is None:
+        cursor.execute('ALTER TABLE papers ADD COLUMN pdf_bytes INTEGER')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS library_stats (
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            papers INTEGER NOT NULL DEFAULT 0,
+            with_pdf INTEGER NOT NULL DEFAULT 0,
+            with_metadata INTEGER NOT NULL DEFAULT 0,
+            pdf_bytes INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, value)
+        ) WITHOUT ROWID
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS library_stats_insert AFTER INSERT ON papers BEGIN
+            {_counts_sql('new', 1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS library_stats_delete AFTER DELETE ON papers BEGIN
+            {_counts_sql('old', -1)}
+        END
+    ''')
+    # Re-recording a paper rewrites all its columns; only a change of the counted ones matters
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS library_stats_update AFTER UPDATE ON papers
+        WHEN old.category IS NOT new.category OR old.id_number IS NOT new.id_number
+            OR old.has_pdf IS NOT new.has_pdf OR old.has_metadata IS NOT new.has_metadata
+            OR old.pdf_bytes IS NOT new.pdf_bytes
+        BEGIN
+            {_counts_sql('old', -1)}
+            {_counts_sql('new', 1)}
+        END
+    ''')
+
+    cursor.execute('DELETE FROM library_stats')
+    for name, value in STATS_DIMENSIONS.items():
+        value = value.format(row='papers')
+        cursor.execute(f'''
+            INSERT INTO library_stats (dimension, value, papers, with_pdf, with_metadata, pdf_bytes)
+            SELECT '{name}', {value}, COUNT(*),
+                   SUM(CASE WHEN has_pdf THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN has_metadata THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN has_pdf THEN COALESCE(pdf_bytes, 0) ELSE 0 END)
+            FROM papers GROUP BY 2
+        ''')
+
+
+def get_library_stats(library: Optional[Library] = None) -> Dict[str, Any]:
+    """
+    Get the composition of the library from the precomputed counts.
+
+    Parameters:
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        dict: 'papers', 'with_pdf', 'missing_pdf', 'with_metadata' and 'pdf_bytes' for the whole
+              library, and 'by_category', 'by_year' and 'by_month' mapping each value to
+              its own counts (papers without an arXiv date are left out of the last two)
+    """
+    stats = {'papers': 0, 'with_pdf': 0, 'missing_pdf': 0, 'with_metadata': 0, 'pdf_bytes': 0,
+             'by_category': {}, 'by_year': {}, 'by_month': {}}
+    try:
+        rows = resolve_library(library).connection().execute('''
+            SELECT dimension, value, papers, with_pdf, with_metadata, pdf_bytes FROM library_stats
+            WHERE papers > 0
+            ORDER BY dimension, value
+        ''').fetchall()
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return stats
+
+    for dimension, value, papers, with_pdf, with_metadata, pdf_bytes in rows:
+        counts = {'papers': papers, 'with_pdf': with_pdf, 'missing_pdf': papers - with_pdf,
+                  'with_metadata': with_metadata, 'pdf_bytes': pdf_bytes}
+        if dimension == 'total':
+            stats.update(counts)
+        elif value or dimension == 'category':
+            stats[f'by_{dimension}'][value] = counts
+    return stats
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Schema migration module for the arXiv Paper Manager.
+
+The schema of the papers database is built by numbered migrations. The
+number of the last one applied is kept in the database's user_version, so
+an up-to-date database is recognized without probing its tables, and each
+migration runs exactly once, in its own transaction.
+
+To change the schema, append a migration to MIGRATIONS; never edit one
+that has been released.
+"""
+
+import sqlite3
+from typing import Callable, List, Tuple
+
+from arxiv_tool.utils import extract_paper_id_parts, arxiv_id_key
+from .library import Library
+from .job_queue import initialize_jobs_table, add_job_retry_time
+from .library_state import initialize_state_table
+from .library_stats import initialize_stats_table
+from .paper_facets import initialize_facet_tables
+from .paper_metadata import initialize_metadata_table
+from .paper_versions import initialize_versions_table
+from .search_index import initialize_search_index
+from .text_cache import initialize_text_cache
+from .text_chunks import initialize_chunk_table
+
+
+_PAPERS_COLUMNS = '''
+    paper_id TEXT PRIMARY KEY,
+    category TEXT,
+    id_number TEXT NOT NULL,
+    version TEXT,
+    title TEXT,
+    authors TEXT,
+    downloaded_at TIMESTAMP,
+    directory TEXT NOT NULL,
+    has_metadata BOOLEAN DEFAULT 0,
+    has_pdf BOOLEAN DEFAULT 0
+'''
+
+
+def _create_papers_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the papers table.
+
+    Databases from before the category, ID number and version columns were
+    added are converted, with the parts extracted from each paper ID.
+    """
+    cursor.execute("SELECT name FROM pragma_table_info('papers')")
+    columns = {row[0] for row in cursor.fetchall()}
+    if not columns:
+        cursor.execute(f'CREATE TABLE papers ({_PAPERS_COLUMNS})')
+        return
+    if {'category', 'id_number', 'version'} <= columns:
+        return
+
+    print("Migrating database to include separate fields for category, ID number, and version...")
+    cursor.connection.create_function(
+        'paper_id_part', 2, lambda paper_id, part: extract_paper_id_parts(paper_id)[part], deterministic=True
+    )
+    cursor.execute(f'CREATE TABLE papers_new ({_PAPERS_COLUMNS})')
+    cursor.execute('''
+        INSERT INTO papers_new
+        (paper_id, category, id_number, version, title, authors, downloaded_at, directory, has_metadata, has_pdf)
+        SELECT paper_id, paper_id_part(paper_id, 'category'), paper_id_part(paper_id, 'id_number'),
+               paper_id_part(paper_id, 'version'), title, authors, downloaded_at, directory,
+               has_metadata, has_pdf
+        FROM papers
+    ''')
+    cursor.execute('DROP TABLE papers')
+    cursor.execute('ALTER TABLE papers_new RENAME TO papers')
+
+
+def _index_papers(cursor: sqlite3.Cursor) -> None:
+    """Index papers by ID number and category."""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_id_number ON papers (id_number)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_category ON papers (category)')
+
+
+def _create_search_index(cursor: sqlite3.Cursor) -> None:
+    """Create the full-text index (skipped on SQLite builds without FTS5)."""
+    initialize_search_index(cursor)
+
+
+def _index_download_time(cursor: sqlite3.Cursor) -> None:
+    """Index papers by download time, the order in which they are listed."""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_downloaded_at ON papers (downloaded_at)')
+
+
+def _index_listing_order(cursor: sqlite3.Cursor) -> None:
+    """
+    Index papers by (downloaded_at, paper_id), the keyset of paged listing.
+
+    The index is not covering: a listed paper's other columns are read
+    from the table by rowid. A page seeks to its first key on the index
+    and reads page_size entries from there, so it costs page_size table
+    lookups however deep into the library it is. Covering the ten listed
+    columns, titles and authors included, would copy most of the table
+    into the index: on 50,000 papers it grew from 1.4 MB to 10.6 MB (the
+    table is 10.8 MB) for 50-paper pages 17% faster (134 vs 161 us).
+
+    Row-value comparisons never match NULL, so papers without a download
+    time are given an empty one, which sorts last.
+    """
+    cursor.execute("UPDATE papers SET downloaded_at = '' WHERE downloaded_at IS NULL")
+    cursor.execute('DROP INDEX IF EXISTS idx_downloaded_at')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_papers_listing ON papers (downloaded_at, paper_id)')
+
+
+# Schema v2 of the papers table: integer ID keys, versions and download times
+_PAPERS_V2_COLUMNS = '''
+    paper_id TEXT PRIMARY KEY,
+    id_key INTEGER,
+    category TEXT,
+    id_number TEXT NOT NULL,
+    version INTEGER,
+    title TEXT,
+    authors TEXT,
+    downloaded_at INTEGER NOT NULL DEFAULT 0,
+    directory TEXT NOT NULL,
+    has_metadata BOOLEAN DEFAULT 0,
+    has_pdf BOOLEAN DEFAULT 0,
+    pdf_bytes INTEGER
+'''
+
+
+def _compact_papers_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Rebuild the papers table with schema v2.
+
+    New-style ID numbers get an integer id_key (see arxiv_id_key()),
+    versions become integers and download times epoch milliseconds (0 when
+    unknown). Rows keep their rowid, which the full-text index shares, and
+    the indexes and triggers of the old table are recreated on the new one.
+    """
+    cursor.execute("""
+        SELECT sql FROM sqlite_master
+        WHERE tbl_name = 'papers' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+    """)
+    dependents = [row[0] for row in cursor.fetchall()]
+
+    cursor.connection.create_function('arxiv_id_key', 1, arxiv_id_key, deterministic=True)
+    cursor.execute(f'CREATE TABLE papers_v2 ({_PAPERS_V2_COLUMNS})')
+    # The old times are local 'YYYY-MM-DD HH:MM:SS.ffffff' strings, as written by datetime.now()
+    cursor.execute('''
+        INSERT INTO papers_v2
+        (rowid, paper_id, id_key, category, id_number, version, title, authors, downloaded_at, directory,
+         has_metadata, has_pdf, pdf_bytes)
+        SELECT rowid, paper_id, arxiv_id_key(id_number), category, id_number,
+               CASE WHEN version GLOB '[0-9]*' THEN CAST(version AS INTEGER) END, title, authors,
+               COALESCE(CAST(ROUND((julianday(downloaded_at, 'utc') - 2440587.5) * 86400000) AS INTEGER), 0),
+               directory, has_metadata, has_pdf, pdf_bytes
+        FROM papers
+    ''')
+    cursor.execute('DROP TABLE papers')
+    cursor.execute('ALTER TABLE papers_v2 RENAME TO papers')
+    for sql in dependents:
+        cursor.execute(sql)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_papers_id_key ON papers (id_key)')
+
+
+# (version, migration) pairs, applied in order. The first migrations are
+# idempotent because databases created before user_version was tracked
+# may already contain their tables.
+MIGRATIONS: List[Tuple[int, Callable[[sqlite3.Cursor], None]]] = [
+    (1, _create_papers_table),
+    (2, _index_papers),
+    (3, initialize_jobs_table),
+    (4, initialize_metadata_table),
+    (5, _create_search_index),
+    (6, _index_download_time),
+    (7, _index_listing_order),
+    (8, initialize_versions_table),
+    (9, initialize_state_table),
+    (10, initialize_facet_tables),
+    (11, initialize_stats_table),
+    (12, _compact_papers_table),
+    (13, initialize_text_cache),
+    (14, initialize_chunk_table),
+    (15, add_job_retry_time),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """
+    Get the schema version of a database.
+
+    Parameters:
+        conn (sqlite3.Connection): Connection to the database
+
+    Returns:
+        int: The number of the last migration applied
+    """
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate_database(library: Library) -> int:
+    """
+    Bring the schema of a library's database up to date.
+
+    Each pending migration runs in its own write transaction together with
+    the user_version update, so an interrupted upgrade resumes where it
+    stopped, and processes upgrading concurrently apply it only once.
+
+    Parameters:
+        library (Library): The library session whose database is migrated
+
+    Returns:
+        int: Number of migrations applied
+
+    Raises:
+        sqlite3.Error: If a migration fails; it is rolled back
+    """
+    conn = library.connection()
+    applied = 0
+
+    version = get_schema_version(conn)
+    if version > SCHEMA_VERSION:
+        print(f"Warning: the database schema (version {version}) is newer than this program "
+              f"(version {SCHEMA_VERSION}).")
+    elif version < SCHEMA_VERSION:
+        for number, migration in MIGRATIONS:
+            if number <= version:
+                continue
+            with library.transaction() as cursor:
+                # Another process may have applied it while we waited for the lock
+                if get_schema_version(conn) >= number:
+                    continue
+                migration(cursor)
+                cursor.execute(f'PRAGMA user_version = {number}')
+            applied += 1
+
+    library.search_index = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='papers_fts'"
+    ).fetchone() is not None
+    return applied
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Author and category module for the arXiv Paper Manager.
+
+The papers table keeps the authors as one comma-joined string and only the
+primary category. The parsed feed entry of each paper is also stored in
+normalized tables, so that papers by an author or in a category (cross-lists
+included), and the number of papers of each, are index lookups:
+- authors: One row per distinct author name (case-insensitive)
+- paper_authors: The authors of each paper, by position, with their affiliation
+- paper_categories: Every category of each paper, flagging the primary one
+"""
+
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .library import Library, resolve_library
+
+
+# Columns of a paper record, as returned by the listing and search functions
+_PAPER_COLUMNS = ('p.paper_id, p.category, p.id_number, p.version, p.title, p.authors, p.downloaded_at, '
+                  'p.directory, p.has_metadata, p.has_pdf')
+
+
+def initialize_facet_tables(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the authors, paper_authors and paper_categories tables and fill them from the stored metadata.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor on the papers database
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS authors (
+            author_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE COLLATE NOCASE
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS paper_authors (
+            paper_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            author_id INTEGER NOT NULL REFERENCES authors (author_id),
+            affiliation TEXT,
+            PRIMARY KEY (paper_id, position)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_paper_authors_author ON paper_authors (author_id, paper_id)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS paper_categories (
+            paper_id TEXT NOT NULL,
+            category TEXT NOT NULL,
+            is_primary BOOLEAN NOT NULL DEFAULT 0,
+            PRIMARY KEY (paper_id, category)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_paper_categories_category ON paper_categories (category, paper_id)')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS paper_facets_delete AFTER DELETE ON papers BEGIN
+            DELETE FROM paper_authors WHERE paper_id = old.paper_id;
+            DELETE FROM paper_categories WHERE paper_id = old.paper_id;
+        END
+    ''')
+
+    cursor.execute('SELECT paper_id, primary_category, authors, affiliations, categories FROM paper_metadata')
+    columns = ('primary_category', 'authors', 'affiliations', 'categories')
+    write_paper_facets(cursor, [
+        (row[0], dict(zip(columns, row[1:]))) for row in cursor.fetchall()
+    ], decode_json=True)
+
+
+def write_paper_facets(cursor: sqlite3.Cursor, items: Iterable[Tuple[str, Dict[str, Any]]],
+                       decode_json: bool = False) -> None:
+    """
+    Replace the authors and categories of papers with the given cursor.
+
+    Used by write_paper_metadata() so that they are written in the same
+    transaction as the rest of the metadata.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor of the open transaction
+        items (iterable): (paper_id, metadata dictionary) pairs, with 'authors',
+                          'affiliations', 'categories' and 'primary_category'
+        decode_json (bool): Whether the list fields are still JSON strings, as stored
+    """
+    authors = []
+    categories = []
+    paper_ids = []
+    for paper_id, metadata in items:
+        paper_ids.append((paper_id,))
+        fields = {}
+        for field in ('authors', 'affiliations', 'categories'):
+            value = metadata.get(field) or []
+            fields[field] = json.loads(value) if decode_json and isinstance(value, str) else value
+
+        affiliations = list(fields['affiliations'])
+        for position, name in enumerate(fields['authors']):
+            affiliation = affiliations[position] if position < len(affiliations) else None
+            authors.append((paper_id, position, affiliation or None, name.strip()))
+
+        primary = metadata.get('primary_category')
+        paper_categories = list(dict.fromkeys(fields['categories']))
+        if primary and primary not in paper_categories:
+            paper_categories.insert(0, primary)
+        categories.extend((paper_id, category, category == primary) for category in paper_categories)
+
+    cursor.executemany('DELETE FROM paper_authors WHERE paper_id = ?', paper_ids)
+    cursor.executemany('DELETE FROM paper_categories WHERE paper_id = ?', paper_ids)
+    authors = [author for author in authors if author[3]]
+    cursor.executemany('INSERT OR IGNORE INTO authors (name) VALUES (?)', [(author[3],) for author in authors])
+    cursor.executemany('''
+        INSERT OR REPLACE INTO paper_authors (paper_id, position, affiliation, author_id)
+        SELECT ?, ?, ?, author_id FROM authors WHERE name = ?
+    ''', authors)
+    cursor.executemany('INSERT OR REPLACE INTO paper_categories (paper_id, category, is_primary) VALUES (?, ?, ?)',
+                       categories)
+
+
+def get_papers_by_author(name: str, limit: Optional[int] = None, library: Optional[Library] = None) -> List[Tuple]:
+    """
+    Get the papers of an author, matching the whole name (case-insensitive).
+
+    Parameters:
+        name (str): The author's name, as written in the feed
+        limit (int, optional): Maximum number of papers to return
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        list: Paper records, most recently downloaded first
+    """
+    try:
+        return resolve_library(library).connection().execute(f'''
+            SELECT {_PAPER_COLUMNS} FROM authors a
+            JOIN paper_authors pa ON pa.author_id = a.author_id
+            JOIN papers p ON p.paper_id = pa.paper_id
+            WHERE a.name = ?
+            ORDER BY p.downloaded_at DESC, p.paper_id DESC
+            LIMIT ?
+        ''', (name.strip(), -1 if limit is None else limit)).fetchall()
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
+
+
+def get_papers_by_category(category: str, limit: Optional[int] = None,
+                           library: Optional[Library] = None) -> List[Tuple]:
+    """
+    Get the papers listed in a category, including cross-lists.
+
+    An archive name without subject class (e.g. 'cs') matches all of its
+    categories (cs.CL, cs.LG, ...). Papers recorded without metadata are
+    matched on the category of the papers table.
+
+    Parameters:
+        category (str): The category or archive
+        limit (int, optional): Maximum number of papers to return
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        list: Paper records, most recently downloaded first
+    """
+    category = category.strip()
+    try:
+        # GLOB, unlike LIKE, is case-sensitive and can use the category indexes
+        return resolve_library(library).connection().execute(f'''
+            SELECT {_PAPER_COLUMNS} FROM papers p
+            WHERE p.paper_id IN (
+                SELECT paper_id FROM paper_categories WHERE category = :category OR category GLOB :archive
+                UNION
+                SELECT paper_id FROM papers WHERE category = :category OR category GLOB :archive
+            )
+            ORDER BY p.downloaded_at DESC, p.paper_id DESC
+            LIMIT :limit
+        ''', {'category': category, 'archive': f'{category}.*', 'limit': -1 if limit is None else limit}).fetchall()
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
+
+
+def count_papers_by_author(limit: Optional[int] = None, library: Optional[Library] = None) -> List[Tuple[str, int]]:
+    """
+    Count the papers of each author.
+
+    Parameters:
+        limit (int, optional): Number of authors to return
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        list: (name, number of papers) tuples, most prolific first
+    """
+    try:
+        return resolve_library(library).connection().execute('''
+            SELECT a.name, counts.papers FROM (
+                SELECT author_id, COUNT(*) AS papers FROM paper_authors GROUP BY author_id
+            ) counts
+            JOIN authors a ON a.author_id = counts.author_id
+            ORDER BY counts.papers DESC, a.name
+            LIMIT ?
+        ''', (-1 if limit is None else limit,)).fetchall()
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
+
+
+def count_papers_by_category(limit: Optional[int] = None, library: Optional[Library] = None) -> List[Tuple[str, int]]:
+    """
+    Count the papers listed in each category, including cross-lists.
+
+    Parameters:
+        limit (int, optional): Number of categories to return
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        list: (category, number of papers) tuples, largest first
+    """
+    try:
+        return resolve_library(library).connection().execute('''
+            SELECT category, COUNT(*) AS papers FROM paper_categories
+            GROUP BY category
+            ORDER BY papers DESC, category
+            LIMIT ?
+        ''', (-1 if limit is None else limit,)).fetchall()
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
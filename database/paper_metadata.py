@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Paper metadata module for the arXiv Paper Manager.
+
+This module stores the arXiv metadata of each paper (abstract, dates, DOI,
+journal reference, comment, categories and links) in the paper_metadata
+table, next to its row in the papers table. Listing, searching and the SDK
+output read it from there; the metadata/*.txt files of a paper directory
+are only an optional export.
+"""
+
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .library import Library, resolve_library
+from .paper_facets import write_paper_facets
+from .paper_versions import write_local_versions
+
+
+# Columns of the paper_metadata table; list-valued fields are stored as JSON
+METADATA_FIELDS = (
+    'id_url', 'summary', 'published', 'updated', 'doi', 'journal_ref', 'comment',
+    'primary_category', 'pdf_url', 'categories', 'authors', 'affiliations', 'links'
+)
+JSON_FIELDS = ('categories', 'authors', 'affiliations', 'links')
+
+# Number of paper IDs per IN (...) lookup
+_LOOKUP_CHUNK_SIZE = 500
+
+
+def initialize_metadata_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the paper_metadata table if it doesn't exist.
+
+    Papers recorded before the table existed keep their metadata in files
+    until 'process' moves it into the database.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor on the papers database
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='paper_metadata'")
+    if cursor.fetchone():
+        return
+
+    cursor.execute('''
+        CREATE TABLE paper_metadata (
+            paper_id TEXT PRIMARY KEY,
+            id_url TEXT,
+            summary TEXT,
+            published TEXT,
+            updated TEXT,
+            doi TEXT,
+            journal_ref TEXT,
+            comment TEXT,
+            primary_category TEXT,
+            pdf_url TEXT,
+            categories TEXT,
+            authors TEXT,
+            affiliations TEXT,
+            links TEXT
+        )
+    ''')
+    # Metadata goes away with its paper
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS paper_metadata_delete AFTER DELETE ON papers BEGIN
+            DELETE FROM paper_metadata WHERE paper_id = old.paper_id;
+        END
+    ''')
+
+    cursor.execute('SELECT COUNT(*) FROM papers WHERE has_metadata')
+    count = cursor.fetchone()[0]
+    if count:
+        print(f"{count} papers have metadata files only. "
+              "Run 'process' to move their metadata into the database.")
+
+
+def _metadata_row(paper_id: str, metadata: Dict[str, Any]) -> Tuple:
+    values = [paper_id]
+    for field in METADATA_FIELDS:
+        value = metadata.get(field)
+        if field in JSON_FIELDS:
+            value = json.dumps(list(value)) if value else None
+        values.append(value or None)
+    return tuple(values)
+
+
+def write_paper_metadata(cursor: sqlite3.Cursor, items: List[Tuple[str, Dict[str, Any]]]) -> None:
+    """
+    Insert or replace metadata rows with the given cursor.
+
+    Used by record_papers_bulk() so that a paper and its metadata are
+    written in the same transaction. The authors and categories tables
+    are updated along with it.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor of the open transaction
+        items (list): (paper_id, metadata dictionary) pairs
+    """
+    columns = ', '.join(('paper_id',) + METADATA_FIELDS)
+    placeholders = ', '.join('?' * (len(METADATA_FIELDS) + 1))
+    cursor.executemany(
+        f'INSERT OR REPLACE INTO paper_metadata ({columns}) VALUES ({placeholders})',
+        [_metadata_row(paper_id, metadata) for paper_id, metadata in items]
+    )
+    write_paper_facets(cursor, items)
+
+
+def store_paper_metadata(items: Iterable[Tuple[str, Dict[str, Any]]], library: Optional[Library] = None) -> int:
+    """
+    Store the metadata of papers already in the database and mark them as having metadata.
+
+    Parameters:
+        items (iterable): (paper_id, metadata dictionary) pairs
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        int: Number of papers whose metadata was stored
+    """
+    items = list(items)
+    if not items:
+        return 0
+
+    try:
+        with resolve_library(library).transaction() as cursor:
+            write_paper_metadata(cursor, items)
+            cursor.executemany('UPDATE papers SET has_metadata = 1 WHERE paper_id = ?',
+                               [(paper_id,) for paper_id, _ in items])
+            write_local_versions(cursor, [(paper_id, metadata.get('updated')) for paper_id, metadata in items])
+        return len(items)
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return 0
+
+
+def get_paper_metadata(paper_ids: Iterable[str], library: Optional[Library] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Get the stored metadata of several papers with one query per chunk of IDs.
+
+    Parameters:
+        paper_ids (iterable): The paper IDs to look up
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        dict: Metadata dictionaries keyed by paper ID; papers without stored metadata are left out
+    """
+    paper_ids = list(dict.fromkeys(paper_ids))
+    conn = resolve_library(library).connection()
+    metadata = {}
+
+    try:
+        for start in range(0, len(paper_ids), _LOOKUP_CHUNK_SIZE):
+            chunk = paper_ids[start:start + _LOOKUP_CHUNK_SIZE]
+            cursor = conn.execute(
+                f"SELECT paper_id, {', '.join(METADATA_FIELDS)} FROM paper_metadata "
+                f"WHERE paper_id IN ({', '.join('?' * len(chunk))})",
+                chunk
+            )
+            for row in cursor.fetchall():
+                values = dict(zip(METADATA_FIELDS, row[1:]))
+                for field in JSON_FIELDS:
+                    values[field] = json.loads(values[field]) if values[field] else []
+                metadata[row[0]] = values
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+
+    return metadata
+
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Version catalog module for the arXiv Paper Manager.
+
+The papers table holds one row per downloaded version. The paper_versions
+table holds every version known to exist, whether or not it was
+downloaded, keyed by the paper ID without version:
+- base_id: The paper ID without version (e.g. '1706.03762', 'cond-mat/0102536')
+- version: The version number
+- updated: When the version was submitted, if known
+- paper_id: The papers row of the version, or NULL if it is not in the library
+
+A feed entry describes the latest version of a paper, so recording it also
+records its earlier versions, without dates. Which papers have a newer
+version than the one downloaded is then a query on this table.
+"""
+
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from arxiv_tool.utils import extract_paper_id_parts
+from .library import Library, resolve_library
+
+
+# Number of IDs per IN (...) lookup
+_LOOKUP_CHUNK_SIZE = 500
+
+
+def version_key(paper_id: str) -> Tuple[str, int]:
+    """
+    Split a paper ID into its catalog key and version number.
+
+    Old-style ID numbers repeat across archives, so the archive stays part
+    of the key (e.g. 'cs_0303006v2' -> ('cs/0303006', 2)).
+
+    Parameters:
+        paper_id (str): The paper ID, with or without version
+
+    Returns:
+        tuple: (paper ID without version, version number)
+    """
+    parts = extract_paper_id_parts(paper_id)
+    base_id = parts['id_number']
+    if parts['category']:
+        base_id = f"{parts['category']}/{base_id}"
+    try:
+        version = int(parts['version'])
+    except (TypeError, ValueError):
+        version = 1
+    return base_id, version
+
+
+def initialize_versions_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the paper_versions table and catalog the papers already in the library.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor on the papers database
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS paper_versions (
+            base_id TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            updated TEXT,
+            paper_id TEXT,
+            PRIMARY KEY (base_id, version)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_paper_versions_paper ON paper_versions (paper_id)')
+    # A deleted paper stays known, but is no longer in the library
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS paper_versions_delete AFTER DELETE ON papers BEGIN
+            UPDATE paper_versions SET paper_id = NULL WHERE paper_id = old.paper_id;
+        END
+    ''')
+
+    cursor.execute('''
+        SELECT p.paper_id, m.updated FROM papers p
+        LEFT JOIN paper_metadata m ON m.paper_id = p.paper_id
+    ''')
+    write_local_versions(cursor, cursor.fetchall())
+
+
+def _upsert_versions(cursor: sqlite3.Cursor, rows: List[Tuple[str, int, Optional[str], Optional[str]]]) -> None:
+    cursor.executemany('''
+        INSERT INTO paper_versions (base_id, version, updated, paper_id) VALUES (?, ?, ?, ?)
+        ON CONFLICT (base_id, version) DO UPDATE SET
+            updated = COALESCE(excluded.updated, updated),
+            paper_id = COALESCE(excluded.paper_id, paper_id)
+    ''', rows)
+
+
+def _earlier_versions(base_id: str, version: int) -> Iterator[Tuple[str, int]]:
+    return ((base_id, earlier) for earlier in range(1, version))
+
+
+def write_local_versions(cursor: sqlite3.Cursor, items: Iterable[Tuple[str, Optional[str]]]) -> None:
+    """
+    Catalog papers of the library with the given cursor.
+
+    Used by record_papers_bulk() so that a paper and its catalog entry are
+    written in the same transaction.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor of the open transaction
+        items (iterable): (paper_id, updated) pairs; updated may be None
+    """
+    rows = []
+    earlier = []
+    for paper_id, updated in items:
+        base_id, version = version_key(paper_id)
+        rows.append((base_id, version, updated or None, paper_id))
+        earlier.extend(_earlier_versions(base_id, version))
+
+    _upsert_versions(cursor, rows)
+    cursor.executemany('INSERT OR IGNORE INTO paper_versions (base_id, version) VALUES (?, ?)', earlier)
+
+
+def record_known_versions(records: Iterable[Any], library: Optional[Library] = None) -> int:
+    """
+    Catalog the latest versions reported by the arXiv API.
+
+    Parameters:
+        records (iterable): Parsed feed entries (PaperRecord), each the latest version of its paper
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        int: Number of records cataloged
+    """
+    rows = []
+    earlier = []
+    for record in records:
+        base_id, version = version_key(record.paper_id)
+        rows.append((base_id, version, record.updated or None, None))
+        earlier.extend(_earlier_versions(base_id, version))
+    if not rows:
+        return 0
+
+    try:
+        with resolve_library(library).transaction() as cursor:
+            _upsert_versions(cursor, rows)
+            cursor.executemany('INSERT OR IGNORE INTO paper_versions (base_id, version) VALUES (?, ?)', earlier)
+        return len(rows)
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return 0
+
+
+def get_known_versions(base_ids: Iterable[str], library: Optional[Library] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Get every known version of several papers.
+
+    Parameters:
+        base_ids (iterable): Paper IDs without version
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        dict: Version dictionaries ('version', 'updated', 'paper_id'), oldest first,
+              keyed by paper ID without version; unknown papers are left out
+    """
+    base_ids = list(dict.fromkeys(base_ids))
+    conn = resolve_library(library).connection()
+    versions = {}
+
+    try:
+        for start in range(0, len(base_ids), _LOOKUP_CHUNK_SIZE):
+            chunk = base_ids[start:start + _LOOKUP_CHUNK_SIZE]
+            cursor = conn.execute(
+                f"SELECT base_id, version, updated, paper_id FROM paper_versions "
+                f"WHERE base_id IN ({', '.join('?' * len(chunk))}) ORDER BY base_id, version",
+                chunk
+            )
+            for base_id, version, updated, paper_id in cursor:
+                versions.setdefault(base_id, []).append(
+                    {'version': version, 'updated': updated, 'paper_id': paper_id}
+                )
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+
+    return versions
+
+
+def iter_latest_local_versions(library: Optional[Library] = None) -> Iterator[Tuple[str, str, int, int]]:
+    """
+    Iterate over the papers of the library, once per paper whatever the number of versions downloaded.
+
+    Parameters:
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Yields:
+        tuple: (base_id, paper_id of the latest local version, its version, latest known version)
+    """
+    conn = resolve_library(library).connection()
+    try:
+        # The bare paper_id column takes its value from the row holding MAX(version)
+        yield from conn.execute('''
+            SELECT base_id, paper_id, MAX(version) AS local_version,
+                   (SELECT MAX(version) FROM paper_versions k WHERE k.base_id = v.base_id)
+            FROM paper_versions v
+            WHERE paper_id IS NOT NULL
+            GROUP BY base_id
+            ORDER BY base_id
+        ''')
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+
+
+def find_outdated_papers(library: Optional[Library] = None) -> List[Tuple[str, str, int, int]]:
+    """
+    Find the papers of the library of which a newer version is known.
+
+    Parameters:
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        list: (base_id, paper_id of the latest local version, its version, latest known version) tuples
+    """
+    return [paper for paper in iter_latest_local_versions(library) if paper[3] > paper[2]]
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Library reconciliation module for the arXiv Paper Manager.
+
+This module checks many papers against the database and the files on disk
+at once:
+- The database rows are looked up with one IN (...) query per chunk of IDs
+- The PDF directories of the downloaded papers are scanned with os.scandir,
+  on a thread pool for large batches
+- Papers whose PDF has gone missing are corrected in one transaction, and
+  the sizes of PDFs recorded before sizes were kept are filled in
+"""
+
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from arxiv_tool.config import LIST_PAGE_SIZE, PDF_SUBDIR, RECONCILE_WORKERS
+from arxiv_tool.utils import get_simplified_paper_id, sanitize_filename
+from .library import Library, resolve_library
+
+
+# Number of paper IDs per IN (...) lookup
+_LOOKUP_CHUNK_SIZE = 500
+
+# Below this many papers the scan is not worth a thread pool
+_PARALLEL_SCAN_THRESHOLD = 32
+
+
+def _pdf_size(paper_id: str) -> Optional[int]:
+    """Get the size of the PDF of a downloaded paper in its pdf subdirectory, or None if it is missing."""
+    simple_id = get_simplified_paper_id(paper_id)
+    pdf_dir = os.path.join(sanitize_filename(simple_id), PDF_SUBDIR)
+    pdf_name = f"{simple_id}.pdf"
+    try:
+        with os.scandir(pdf_dir) as entries:
+            for entry in entries:
+                if entry.name == pdf_name and entry.is_file():
+                    return entry.stat().st_size
+    except OSError:
+        pass
+    return None
+
+
+def _scan_pdfs(paper_ids: List[str], workers: int) -> Dict[str, Optional[int]]:
+    if workers > 1 and len(paper_ids) >= _PARALLEL_SCAN_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(paper_ids, executor.map(_pdf_size, paper_ids)))
+    return {paper_id: _pdf_size(paper_id) for paper_id in paper_ids}
+
+
+def _lookup_papers(conn: sqlite3.Connection, paper_ids: List[str]) -> List[Tuple[str, bool, bool, Optional[int]]]:
+    rows = []
+    for start in range(0, len(paper_ids), _LOOKUP_CHUNK_SIZE):
+        chunk = paper_ids[start:start + _LOOKUP_CHUNK_SIZE]
+        cursor = conn.execute(
+            f"SELECT paper_id, has_metadata, has_pdf, pdf_bytes FROM papers "
+            f"WHERE paper_id IN ({', '.join('?' * len(chunk))})",
+            chunk
+        )
+        rows.extend(cursor.fetchall())
+    return rows
+
+
+def papers_exist(paper_ids: Iterable[str], verify_files: bool = True, workers: int = RECONCILE_WORKERS,
+                 library: Optional[Library] = None) -> Dict[str, bool]:
+    """
+    Check which papers have already been downloaded.
+
+    A paper counts as downloaded when it is recorded with its metadata and
+    PDF. With verify_files, the PDFs are also looked for on disk, papers
+    whose PDF is missing are marked as such in the database, and the sizes
+    of the PDFs found are stored where they were not known.
+
+    Parameters:
+        paper_ids (iterable): The paper IDs to check
+        verify_files (bool): Whether to check the PDF files on disk
+        workers (int): Number of threads scanning the PDF directories of large batches
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        dict: Whether each paper ID has been downloaded
+    """
+    paper_ids = list(dict.fromkeys(paper_ids))
+    library = resolve_library(library)
+    exists = dict.fromkeys(paper_ids, False)
+
+    try:
+        rows = _lookup_papers(library.connection(), paper_ids)
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return exists
+
+    downloaded = {paper_id: pdf_bytes for paper_id, has_metadata, has_pdf, pdf_bytes in rows
+                  if has_metadata and has_pdf}
+    if not verify_files:
+        exists.update(dict.fromkeys(downloaded, True))
+        return exists
+
+    sizes = _scan_pdfs(list(downloaded), workers)
+    exists.update((paper_id, size is not None) for paper_id, size in sizes.items())
+
+    # Record the PDFs that have gone missing and the sizes not known yet, all in one transaction
+    missing = [(paper_id,) for paper_id, size in sizes.items() if size is None]
+    unsized = [(size, paper_id) for paper_id, size in sizes.items()
+               if size is not None and downloaded[paper_id] is None]
+    if missing or unsized:
+        try:
+            with library.transaction() as cursor:
+                cursor.executemany('UPDATE papers SET has_pdf = 0 WHERE paper_id = ?', missing)
+                cursor.executemany('UPDATE papers SET pdf_bytes = ? WHERE paper_id = ?', unsized)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+
+    return exists
+
+
+def reconcile_library(workers: int = RECONCILE_WORKERS, page_size: int = LIST_PAGE_SIZE,
+                      library: Optional[Library] = None) -> Dict[str, int]:
+    """
+    Check the PDF of every downloaded paper and correct the database.
+
+    Parameters:
+        workers (int): Number of threads scanning the PDF directories
+        page_size (int): Number of papers checked per batch
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        dict: Number of papers 'checked', found 'complete' and 'missing_pdf'
+    """
+    from .db_manager import iter_paper_pages
+
+    counts = {'checked': 0, 'complete': 0, 'missing_pdf': 0}
+    for papers in iter_paper_pages(page_size, library=library):
+        # Only papers recorded as complete are verified on disk
+        expected = [paper[0] for paper in papers if paper[8] and paper[9]]
+        exists = papers_exist(expected, workers=workers, library=library)
+
+        counts['checked'] += len(papers)
+        counts['complete'] += sum(exists.values())
+        counts['missing_pdf'] += len(expected) - sum(exists.values())
+    return counts
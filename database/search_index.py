@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Full-text search module for the arXiv Paper Manager.
+
+This module maintains an FTS5 index over the local library:
+- Titles and authors are kept in sync with the papers table by triggers
+- Abstracts and extracted PDF text are added when they become available
+- Queries are ranked with BM25 and return highlighted snippets
+
+Query syntax: words must all match (prefixes with a trailing '*'),
+"quoted text" matches a phrase, and OR / NOT combine terms.
+"""
+
+import os
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from arxiv_tool.config import METADATA_SUBDIR
+from .library import Library, resolve_library
+from .text_cache import get_cached_text
+
+
+# Searchable columns of the index and their BM25 weights (paper_id is not indexed)
+SEARCH_FIELDS = ('title', 'authors', 'abstract', 'full_text')
+_BM25_WEIGHTS = '0, 10.0, 5.0, 2.0, 1.0'
+
+# Text fields of search_local_papers() and the index columns they search (None for all)
+FULLTEXT_FIELDS = {
+    'title': ['title'],
+    'authors': ['authors'],
+    'abstract': ['abstract'],
+    'text': ['full_text'],
+    'all': None
+}
+
+_QUERY_TOKEN = re.compile(r'"[^"]*"\*?|\S+')
+_OPERATORS = {'AND', 'OR', 'NOT'}
+
+
+def initialize_search_index(cursor: sqlite3.Cursor) -> bool:
+    """
+    Create the full-text index and its triggers if they don't exist.
+
+    A new index is filled with the titles and authors of the papers already
+    in the database; rebuild_search_index() adds their abstracts.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor on the papers database
+
+    Returns:
+        bool: True if full-text search is available
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='papers_fts'")
+    if cursor.fetchone():
+        return True
+
+    try:
+        # The index rows share the rowid of their papers row
+        cursor.execute('''
+            CREATE VIRTUAL TABLE papers_fts USING fts5(
+                paper_id UNINDEXED, title, authors, abstract, full_text,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        # SQLite builds without FTS5 fall back to LIKE queries
+        print(f"Full-text search not available ({e}); local search will use slower LIKE queries.")
+        return False
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers BEGIN
+            INSERT INTO papers_fts (rowid, paper_id, title, authors, abstract, full_text)
+            VALUES (new.rowid, new.paper_id, new.title, new.authors, '', '');
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS papers_fts_update AFTER UPDATE OF title, authors ON papers BEGIN
+            UPDATE papers_fts SET title = new.title, authors = new.authors WHERE rowid = new.rowid;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers BEGIN
+            DELETE FROM papers_fts WHERE rowid = old.rowid;
+        END
+    ''')
+
+    cursor.execute('''
+        INSERT INTO papers_fts (rowid, paper_id, title, authors, abstract, full_text)
+        SELECT rowid, paper_id, title, authors, '', '' FROM papers
+    ''')
+    if cursor.rowcount > 0:
+        print(f"Indexed {cursor.rowcount} papers for full-text search. "
+              "Run 'reindex' to add the abstracts of existing papers.")
+    return True
+
+
+def build_fts_query(search_term: str, fields: Optional[Iterable[str]] = None) -> str:
+    """
+    Turn a user search string into an FTS5 query.
+
+    Words are quoted so punctuation (e.g. in '1706.03762' or 'self-attention')
+    can't break the query syntax; a trailing '*' is kept as a prefix search,
+    quoted phrases and the operators AND, OR and NOT are passed through.
+
+    Parameters:
+        search_term (str): The user's search string
+        fields (iterable, optional): Columns to restrict the search to (defaults to all)
+
+    Returns:
+        str: The FTS5 MATCH expression
+    """
+    parts = []
+    for token in _QUERY_TOKEN.findall(search_term):
+        if token.startswith('"'):
+            parts.append(token)
+        elif token in _OPERATORS:
+            parts.append(token)
+        else:
+            prefix = token.endswith('*')
+            word = token.rstrip('*').replace('"', '""')
+            if word:
+                parts.append(f'"{word}"' + ('*' if prefix else ''))
+
+    # An operator can't start or end the expression
+    while parts and parts[0] in _OPERATORS:
+        parts.pop(0)
+    while parts and parts[-1] in _OPERATORS:
+        parts.pop()
+
+    query = ' '.join(parts)
+    if query and fields:
+        fields = [field for field in fields if field in SEARCH_FIELDS]
+        query = '{' + ' '.join(fields) + '} : (' + query + ')'
+    return query
+
+
+def search_index_available(library: Optional[Library] = None) -> bool:
+    """
+    Check whether the full-text index exists in the database.
+
+    Parameters:
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        bool: True if full-text queries can be run
+    """
+    return resolve_library(library).search_index
+
+
+def search_papers_fulltext(search_term: str, fields: Optional[Iterable[str]] = None, limit: int = 20,
+                           library: Optional[Library] = None) -> List[Dict[str, Any]]:
+    """
+    Search the local library by relevance.
+
+    Parameters:
+        search_term (str): Words, "phrases" and prefix* terms to search for
+        fields (iterable, optional): Columns to search ('title', 'authors', 'abstract', 'full_text');
+                                   all of them by default
+        limit (int): Maximum number of results
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        list: Dictionaries with the paper row ('paper' tuple, as returned by
+              list_downloaded_papers), 'rank' (lower is better) and 'snippet'
+    """
+    query = build_fts_query(search_term, fields)
+    if not query:
+        return []
+
+    conn = resolve_library(library).connection()
+    try:
+        cursor = conn.execute(f'''
+            SELECT p.paper_id, p.category, p.id_number, p.version, p.title, p.authors,
+                   p.downloaded_at, p.directory, p.has_metadata, p.has_pdf,
+                   bm25(papers_fts, {_BM25_WEIGHTS}) AS rank,
+                   snippet(papers_fts, -1, '[', ']', '...', 12)
+            FROM papers_fts
+            JOIN papers p ON p.rowid = papers_fts.rowid
+            WHERE papers_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ''', (query, limit))
+        return [
+            {'paper': tuple(row[:10]), 'rank': row[10], 'snippet': row[11]}
+            for row in cursor.fetchall()
+        ]
+    except sqlite3.Error as e:
+        print(f"Search error: {e}")
+        return []
+
+
+def index_paper_texts(texts: Iterable[Tuple[str, Optional[str], Optional[str]]],
+                      library: Optional[Library] = None) -> int:
+    """
+    Add abstracts and extracted PDF text to the index.
+
+    Parameters:
+        texts (iterable): (paper_id, abstract, full_text) tuples; None leaves a column unchanged
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        int: Number of papers updated
+    """
+    library = resolve_library(library)
+    rows = [(abstract, full_text, paper_id) for paper_id, abstract, full_text in texts
+            if abstract is not None or full_text is not None]
+    if not rows:
+        return 0
+
+    try:
+        with library.transaction() as cursor:
+            cursor.executemany('''
+                UPDATE papers_fts
+                SET abstract = COALESCE(?, abstract), full_text = COALESCE(?, full_text)
+                WHERE rowid = (SELECT rowid FROM papers WHERE paper_id = ?)
+            ''', rows)
+            return cursor.rowcount
+    except sqlite3.Error as e:
+        print(f"Search index error: {e}")
+        return 0
+
+
+def rebuild_search_index(full_text: bool = False, library: Optional[Library] = None) -> Dict[str, int]:
+    """
+    Rebuild the full-text index from the papers table and the paper files.
+
+    Abstracts come from the stored metadata, or the metadata/summary.txt file
+    for papers whose metadata is not in the database yet. The text of PDFs
+    that was already extracted is taken from the text cache; with full_text,
+    the text of the other PDFs is extracted as well (requires a PDF text backend).
+
+    Parameters:
+        full_text (bool): Whether to extract the PDF text that is not cached yet
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        dict: Number of 'papers', 'abstracts' and 'full_texts' indexed
+    """
+    library = resolve_library(library)
+    counts = {'papers': 0, 'abstracts': 0, 'full_texts': 0}
+
+    with library.transaction() as cursor:
+        cursor.execute('DELETE FROM papers_fts')
+        cursor.execute('''
+            INSERT INTO papers_fts (rowid, paper_id, title, authors, abstract, full_text)
+            SELECT p.rowid, p.paper_id, p.title, p.authors, COALESCE(m.summary, ''), ''
+            FROM papers p LEFT JOIN paper_metadata m ON m.paper_id = p.paper_id
+        ''')
+        counts['papers'] = cursor.rowcount
+        cursor.execute('''
+            SELECT p.paper_id, p.directory, p.has_pdf, m.paper_id IS NOT NULL, m.summary IS NOT NULL
+            FROM papers p LEFT JOIN paper_metadata m ON m.paper_id = p.paper_id
+        ''')
+        papers = cursor.fetchall()
+
+    from arxiv_tool.models.pdf_extractor import (
+        PDF_PARSER_AVAILABLE, NO_BACKEND_MESSAGE, get_pdf_text, find_paper_pdf
+    )
+    if full_text:
+        if not PDF_PARSER_AVAILABLE:
+            print(NO_BACKEND_MESSAGE)
+            full_text = False
+
+    batch = []
+    for paper_id, directory, has_pdf, has_stored_metadata, has_summary in papers:
+        abstract = None
+        summary_path = os.path.join(directory or '', METADATA_SUBDIR, 'summary.txt')
+        if has_summary:
+            counts['abstracts'] += 1
+        elif not has_stored_metadata and os.path.exists(summary_path):
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                abstract = f.read().strip()
+            counts['abstracts'] += 1
+
+        text = None
+        pdf_path = find_paper_pdf(paper_id, directory) if has_pdf or full_text else None
+        if pdf_path:
+            # Extracted texts are cached, so a rebuild does not parse the PDFs again
+            if full_text:
+                pdf_text = get_pdf_text(pdf_path, library=library)[0]
+            else:
+                pdf_text = get_cached_text(pdf_path, library=library)
+            text = pdf_text.text if pdf_text else None
+            if text:
+                counts['full_texts'] += 1
+
+        batch.append((paper_id, abstract, text))
+        if len(batch) >= 500:
+            index_paper_texts(batch, library=library)
+            batch = []
+    index_paper_texts(batch, library=library)
+
+    return counts
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Extracted-text cache module for the arXiv Paper Manager.
+
+Text extracted from a PDF is stored once, zlib-compressed, in the pdf_texts
+table, keyed by the SHA-256 of the PDF file, together with the offset at
+which each page starts. The pdf_files table remembers the size,
+modification time and hash of each PDF path, so a repeat lookup costs one
+stat() and no hashing; a file whose size or modification time changed is
+hashed again, and its stale text is dropped.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from arxiv_tool.config import TEXT_CACHE_COMPRESSION_LEVEL
+from .library import Library, resolve_library
+
+
+# Bytes read at a time when hashing a PDF
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class PdfText:
+    """
+    The text of a PDF and the offset at which each of its pages starts.
+
+    A text that was extracted only in part (complete False) holds the pages
+    from first_page on; it is never cached.
+    """
+    sha256: str
+    text: str
+    page_offsets: List[int]
+    first_page: int = 1
+    complete: bool = True
+
+    @property
+    def pages(self) -> int:
+        """Number of pages in the text (of the PDF, if the text is complete)."""
+        return len(self.page_offsets)
+
+    def page_range(self, first: int = 1, last: Optional[int] = None) -> str:
+        """
+        Get the text of a range of pages.
+
+        Parameters:
+            first (int): First page, counted from 1
+            last (int, optional): Last page, included (defaults to the last page of the PDF)
+
+        Returns:
+            str: The text of the pages ('' if the range is empty)
+        """
+        # Positions of the pages in page_offsets
+        last = self.pages if last is None else min(last - self.first_page + 1, self.pages)
+        first = max(first - self.first_page + 1, 1)
+        if first > last:
+            return ""
+        end = self.page_offsets[last] if last < self.pages else len(self.text)
+        return self.text[self.page_offsets[first - 1]:end]
+
+
+def join_pages(pages: List[str]) -> Tuple[str, List[int]]:
+    """
+    Join the texts of the pages of a PDF.
+
+    Parameters:
+        pages (list): The text of each page
+
+    Returns:
+        tuple: (text, offset of each page in the text); empty pages take no space
+    """
+    parts = []
+    offsets = []
+    length = 0
+    for page in pages:
+        offsets.append(length)
+        if page:
+            parts.append(page + "\n\n")
+            length += len(page) + 2
+    return "".join(parts), offsets
+
+
+def initialize_text_cache(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the pdf_texts and pdf_files tables if they don't exist.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor on the papers database
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pdf_texts (
+            sha256 TEXT PRIMARY KEY,
+            pages INTEGER NOT NULL,
+            chars INTEGER NOT NULL,
+            page_offsets TEXT NOT NULL,
+            text BLOB NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pdf_files (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            sha256 TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_pdf_files_sha256 ON pdf_files (sha256)')
+
+
+def file_sha256(path: str) -> str:
+    """
+    Compute the SHA-256 of a file.
+
+    Parameters:
+        path (str): Path to the file
+
+    Returns:
+        str: The hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _drop_unreferenced_texts(cursor: sqlite3.Cursor, sha256: str) -> None:
+    cursor.execute('''
+        DELETE FROM pdf_texts WHERE sha256 = ?
+        AND NOT EXISTS (SELECT 1 FROM pdf_files WHERE pdf_files.sha256 = pdf_texts.sha256)
+    ''', (sha256,))
+
+
+def _pdf_file_hash(path: str, library: Library) -> str:
+    """Get the hash of a PDF, from pdf_files if the file is unchanged, recording it otherwise."""
+    stat = os.stat(path)
+    row = library.connection().execute(
+        'SELECT size, mtime_ns, sha256 FROM pdf_files WHERE path = ?', (path,)
+    ).fetchone()
+    if row and (row[0], row[1]) == (stat.st_size, stat.st_mtime_ns):
+        return row[2]
+
+    sha256 = file_sha256(path)
+    with library.transaction() as cursor:
+        cursor.execute('''
+            INSERT INTO pdf_files (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)
+            ON CONFLICT (path) DO UPDATE SET
+                size = excluded.size, mtime_ns = excluded.mtime_ns, sha256 = excluded.sha256
+        ''', (path, stat.st_size, stat.st_mtime_ns, sha256))
+        # The text of the file's previous content is stale
+        if row and row[2] != sha256:
+            _drop_unreferenced_texts(cursor, row[2])
+    return sha256
+
+
+def _load_text(sha256: str, library: Library) -> Optional[PdfText]:
+    row = library.connection().execute(
+        'SELECT page_offsets, text FROM pdf_texts WHERE sha256 = ?', (sha256,)
+    ).fetchone()
+    if row is None:
+        return None
+    return PdfText(sha256, zlib.decompress(row[1]).decode('utf-8'), json.loads(row[0]))
+
+
+def get_cached_text(pdf_path: str, library: Optional[Library] = None) -> Optional[PdfText]:
+    """
+    Get the cached text of a PDF.
+
+    Parameters:
+        pdf_path (str): Path to the PDF file
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        PdfText: The text, or None if the current content of the file was never extracted
+    """
+    library = resolve_library(library)
+    try:
+        return _load_text(_pdf_file_hash(pdf_path, library), library)
+    except OSError as e:
+        print(f"Error reading PDF {pdf_path}: {e}")
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+    return None
+
+
+def store_cached_text(pdf_path: str, pages: List[str], library: Optional[Library] = None) -> PdfText:
+    """
+    Cache the text extracted from a PDF.
+
+    Parameters:
+        pdf_path (str): Path to the PDF file the text was extracted from
+        pages (list): The text of each page
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        PdfText: The text; returned even if it could not be cached
+    """
+    library = resolve_library(library)
+    text, offsets = join_pages(pages)
+    pdf_text = PdfText('', text, offsets)
+    try:
+        pdf_text.sha256 = _pdf_file_hash(pdf_path, library)
+        compressed = zlib.compress(text.encode('utf-8'), TEXT_CACHE_COMPRESSION_LEVEL)
+        with library.transaction() as cursor:
+            cursor.execute('''
+                INSERT OR REPLACE INTO pdf_texts (sha256, pages, chars, page_offsets, text)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (pdf_text.sha256, len(offsets), len(text), json.dumps(offsets), compressed))
+    except OSError as e:
+        print(f"Error reading PDF {pdf_path}: {e}")
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+    return pdf_text
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Section-aware chunk store for the arXiv Paper Manager.
+
+The cached text of a PDF is split once into sections (abstract,
+introduction, method, results, references, ...) by recognizing their
+headings, and each section into chunks of a bounded number of tokens, cut
+at paragraph or sentence ends where possible. The text_chunks table keeps
+the section and character offsets of each chunk, keyed like the text
+itself by the SHA-256 of the PDF, so chunks are sliced out of the cached
+text rather than stored twice.
+
+rank_chunks() ranks the chunks of one paper against a question with BM25,
+so a caller can hand a few relevant passages to a model instead of the
+whole paper.
+"""
+
+import math
+import re
+import sqlite3
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+from arxiv_tool.config import TEXT_CHUNK_MAX_TOKENS, TEXT_CHUNK_MIN_TOKENS
+from .library import Library, resolve_library
+from .text_cache import PdfText
+
+
+# Rough size of a model token in characters of English text
+_CHARS_PER_TOKEN = 4
+
+# Canonical sections and words of the headings that start them, checked in order
+SECTIONS = (
+    ('abstract', ('abstract',)),
+    ('introduction', ('introduction', 'overview', 'motivation')),
+    ('related_work', ('related work', 'background', 'preliminar', 'prior work', 'literature')),
+    ('method', ('method', 'approach', 'model', 'architecture', 'algorithm', 'framework', 'formulation',
+                'design')),
+    ('results', ('experiment', 'result', 'evaluation', 'empirical', 'benchmark', 'ablation', 'analysis')),
+    ('discussion', ('discussion', 'limitation')),
+    ('conclusion', ('conclusion', 'future work', 'summary')),
+    ('acknowledgements', ('acknowledg',)),
+    ('references', ('reference', 'bibliography')),
+    ('appendix', ('appendix', 'supplementa')),
+)
+
+# "3 Model Architecture", "3.2. Multi-Head Attention", "IV. RESULTS", "B Proofs"
+_NUMBERED_HEADING = re.compile(
+    r"(?P<number>\d{1,2}(?:\.\d{1,2}){0,3}\.?|[IVX]{1,5}\.|[A-H]\.?)\s+"
+    r"(?P<title>[A-Z][A-Za-z0-9 ,:;&'()/\-]{1,80})"
+)
+# Headings that are usually not numbered, alone on their line or followed by the text ("Abstract. We ...")
+_NAMED_HEADING = re.compile(
+    r"(?P<title>abstract|introduction|related work|background|conclusions?|discussion|references|bibliography|"
+    r"acknowledge?ments?|appendix(?: [A-Z])?)(?:\s*[:.]?\s*$|\s*[:.\-–—]\s+\S)",
+    re.IGNORECASE
+)
+_ROMAN = {'I': 1, 'II': 2, 'III': 3, 'IV': 4, 'V': 5, 'VI': 6, 'VII': 7, 'VIII': 8, 'IX': 9, 'X': 10}
+
+# Places a chunk is cut at, from the most to the least preferred
+_BREAKS = (
+    re.compile(r'\n[ \t]*\n'),
+    re.compile(r'[.!?]["\')\]]?\s+(?=[A-Z(\["])'),
+    re.compile(r'\n'),
+    re.compile(r'\s'),
+)
+
+_TERM = re.compile(r'[a-z0-9]+')
+_STOP_WORDS = frozenset(
+    'a an and are as at be by can do does did for from how in into is it its of on or paper that the their '
+    'this these to was were what when where which who why with'.split()
+)
+
+# BM25 parameters
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+@dataclass
+class TextChunk:
+    """A passage of a PDF text: its section, heading, offsets in the text and first page."""
+    section: str
+    heading: str
+    start: int
+    end: int
+    page: int
+
+    @property
+    def tokens(self) -> int:
+        """Estimated number of model tokens of the passage."""
+        return (self.end - self.start + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def initialize_chunk_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the text_chunks table if it doesn't exist.
+
+    The chunks of a text are deleted with it.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor on the papers database
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS text_chunks (
+            sha256 TEXT NOT NULL,
+            chunk INTEGER NOT NULL,
+            section TEXT NOT NULL,
+            heading TEXT NOT NULL,
+            start_char INTEGER NOT NULL,
+            end_char INTEGER NOT NULL,
+            page INTEGER NOT NULL,
+            PRIMARY KEY (sha256, chunk)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS text_chunks_delete AFTER DELETE ON pdf_texts BEGIN
+            DELETE FROM text_chunks WHERE sha256 = old.sha256;
+        END
+    ''')
+
+
+def section_of(heading: str) -> Optional[str]:
+    """
+    Get the canonical section a heading starts.
+
+    Parameters:
+        heading (str): The heading, without its number
+
+    Returns:
+        str: The section name, or None if the heading names none of SECTIONS
+    """
+    heading = heading.lower()
+    for section, words in SECTIONS:
+        if any(word in heading for word in words):
+            return section
+    return None
+
+
+def _heading_number(number: str) -> Tuple[int, bool]:
+    """Get the top-level number of a heading number and whether it numbers a subsection."""
+    number = number.rstrip('.')
+    if number.isalpha():
+        # Roman numerals, or 0 for appendix letters
+        return _ROMAN.get(number, 0), False
+    parts = number.split('.')
+    return int(parts[0]), len(parts) > 1
+
+
+def split_sections(text: str) -> List[Tuple[str, str, int, int]]:
+    """
+    Split a paper's text into sections by recognizing their headings.
+
+    A numbered heading is only accepted if it continues the numbering
+    (3.x after section 3, or section 4), which rules out most lines of
+    text that merely start with a number. Subsections belong to
+    the section of their parent; a top-level heading that names none of
+    SECTIONS starts a 'body' section. The text before the first heading is
+    the 'front' section (title and authors).
+
+    Parameters:
+        text (str): The text of the paper
+
+    Returns:
+        list: (section, heading, start, end) of each section, as offsets in the text
+    """
+    sections = []
+    current = ['front', '', 0]
+    top_number = 0
+    in_appendix = False
+    offset = 0
+
+    for line in text.splitlines(keepends=True):
+        start = offset
+        offset += len(line)
+        stripped = line.strip()
+        if not stripped or len(stripped) > 90:
+            continue
+
+        heading = section = None
+        named = _NAMED_HEADING.match(stripped)
+        numbered = _NUMBERED_HEADING.fullmatch(stripped)
+        if named:
+            heading = named.group('title')
+            section = section_of(heading)
+        elif numbered and len(numbered.group('title').split()) <= 10 and not stripped.endswith(('.', ',')):
+            top, subsection = _heading_number(numbered.group('number'))
+            if not top:
+                # Lettered headings only number appendices
+                accepted = in_appendix
+            elif in_appendix:
+                accepted = False
+            elif subsection:
+                accepted = top == top_number
+            else:
+                # Allow for one heading that was not recognized
+                accepted = top in (top_number + 1, top_number + 2)
+            if accepted:
+                heading = stripped
+                section = section_of(numbered.group('title'))
+                if subsection:
+                    section = section or current[0]
+                else:
+                    top_number = top or top_number
+                    section = section or ('appendix' if in_appendix else 'body')
+
+        if heading is None:
+            continue
+        if start > current[2]:
+            sections.append((current[0], current[1], current[2], start))
+        current = [section, heading, start]
+        in_appendix = in_appendix or section in ('references', 'appendix')
+
+    if offset > current[2]:
+        sections.append((current[0], current[1], current[2], offset))
+    return sections
+
+
+def _trimmed(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Move the offsets of a passage past the whitespace around it."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def chunk_text(pdf_text: PdfText, max_tokens: int = TEXT_CHUNK_MAX_TOKENS,
+               min_tokens: int = TEXT_CHUNK_MIN_TOKENS) -> List[TextChunk]:
+    """
+    Split the text of a PDF into section-aware chunks.
+
+    Sections longer than max_tokens are cut at the last paragraph end
+    before the bound (or sentence end, line end or space), never leaving a
+    piece shorter than min_tokens; a short section is merged into the next
+    one if both belong to the same canonical section.
+
+    Parameters:
+        pdf_text (PdfText): The text of the PDF
+        max_tokens (int): Upper bound on the estimated tokens of a chunk
+        min_tokens (int): Size below which a chunk is merged with its neighbour
+
+    Returns:
+        list: The chunks, in the order of the text
+    """
+    text = pdf_text.text
+    max_chars = max_tokens * _CHARS_PER_TOKEN
+    min_chars = min(min_tokens * _CHARS_PER_TOKEN, max_chars // 2)
+
+    # Merge the short sections, e.g. a section heading directly followed by its first subsection
+    spans = []
+    for section, heading, start, end in split_sections(text):
+        if spans and spans[-1][0] == section and spans[-1][3] - spans[-1][2] < min_chars:
+            spans[-1][3] = end
+        else:
+            spans.append([section, heading, start, end])
+
+    chunks = []
+    for section, heading, start, end in spans:
+        start, end = _trimmed(text, start, end)
+        while start < end:
+            cut = end
+            if end - start > max_chars:
+                low, high = start + min_chars, min(start + max_chars, end - min_chars)
+                cut = high
+                for pattern in _BREAKS:
+                    breaks = [match.end() for match in pattern.finditer(text, low, high)]
+                    if breaks:
+                        cut = breaks[-1]
+                        break
+            chunk_start, chunk_end = _trimmed(text, start, cut)
+            if chunk_start < chunk_end:
+                page = bisect_right(pdf_text.page_offsets, chunk_start) - 1 + pdf_text.first_page
+                chunks.append(TextChunk(section, heading, chunk_start, chunk_end, max(page, pdf_text.first_page)))
+            start = cut
+    return chunks
+
+
+def _store_chunks(sha256: str, chunks: List[TextChunk], library: Library) -> None:
+    with library.transaction() as cursor:
+        cursor.execute('DELETE FROM text_chunks WHERE sha256 = ?', (sha256,))
+        cursor.executemany('''
+            INSERT INTO text_chunks (sha256, chunk, section, heading, start_char, end_char, page)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [(sha256, number, chunk.section, chunk.heading, chunk.start, chunk.end, chunk.page)
+              for number, chunk in enumerate(chunks)])
+
+
+def get_text_chunks(pdf_text: PdfText, library: Optional[Library] = None) -> List[TextChunk]:
+    """
+    Get the chunks of a PDF text, splitting it the first time.
+
+    The chunks of a cached text are stored; those of a partial text are
+    computed on each call.
+
+    Parameters:
+        pdf_text (PdfText): The text of the PDF, as returned by get_cached_text()
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        list: The chunks, in the order of the text
+    """
+    if not pdf_text.complete or not pdf_text.sha256:
+        return chunk_text(pdf_text)
+
+    library = resolve_library(library)
+    try:
+        rows = library.connection().execute('''
+            SELECT section, heading, start_char, end_char, page FROM text_chunks
+            WHERE sha256 = ? ORDER BY chunk
+        ''', (pdf_text.sha256,)).fetchall()
+        # Chunks of another extraction of the file may not fit this text
+        if rows and rows[-1][3] <= len(pdf_text.text):
+            return [TextChunk(*row) for row in rows]
+
+        chunks = chunk_text(pdf_text)
+        _store_chunks(pdf_text.sha256, chunks, library)
+        return chunks
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return chunk_text(pdf_text)
+
+
+def _terms(text: str) -> List[str]:
+    """Lower-case words of a text, with a plural 's' removed."""
+    return [term[:-1] if len(term) > 3 and term.endswith('s') and not term.endswith('ss') else term
+            for term in _TERM.findall(text.lower())]
+
+
+def rank_chunks(text: str, chunks: List[TextChunk], question: str, limit: int = 3,
+                sections: Optional[Iterable[str]] = None) -> List[Tuple[TextChunk, float]]:
+    """
+    Rank the chunks of a paper by relevance to a question with BM25.
+
+    Term statistics are those of the paper's own chunks, so words common
+    throughout the paper weigh little.
+
+    Parameters:
+        text (str): The text the chunks were cut from
+        chunks (list): The chunks of the text
+        question (str): The question or search words
+        limit (int): Maximum number of chunks to return
+        sections (iterable, optional): Sections to search (defaults to all)
+
+    Returns:
+        list: (chunk, score) pairs of the chunks matching a word of the question, best first
+    """
+    query = [term for term in dict.fromkeys(_terms(question)) if term not in _STOP_WORDS]
+    if sections is not None:
+        sections = set(sections)
+        chunks = [chunk for chunk in chunks if chunk.section in sections]
+    if not query or not chunks:
+        return []
+
+    frequencies = [Counter(_terms(text[chunk.start:chunk.end])) for chunk in chunks]
+    lengths = [sum(counts.values()) for counts in frequencies]
+    average_length = sum(lengths) / len(lengths) or 1.0
+    weights = {}
+    for term in query:
+        containing = sum(1 for counts in frequencies if term in counts)
+        weights[term] = math.log((len(chunks) - containing + 0.5) / (containing + 0.5) + 1)
+
+    scored = []
+    for chunk, counts, length in zip(chunks, frequencies, lengths):
+        score = 0.0
+        for term in query:
+            count = counts.get(term, 0)
+            if count:
+                norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * length / average_length)
+                score += weights[term] * count * (_BM25_K1 + 1) / (count + norm)
+        if score > 0:
+            scored.append((chunk, round(score, 3)))
+    scored.sort(key=lambda pair: -pair[1])
+    return scored[:limit]
@@ -8,14 +8,20 @@ but can be run as a module: python -m main
 
 import sys
 import json
+import textwrap
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from arxiv_tool.cli import (
     parse_args, start_interactive_cli, search_paper, batch_download_from_file,
     import_pdf_files, fetch_metadata_for_imported_papers, check_for_paper_updates,
-    process_existing_directories
+    process_existing_directories, resume_batch_jobs, reindex_library,
+    export_metadata_files, verify_library, extract_library_text, benchmark_pdf_backends
 )
-from arxiv_tool.database import initialize_db, list_downloaded_papers
-from arxiv_tool.utils import print_papers_table
+from arxiv_tool.database import (
+    initialize_db, list_downloaded_papers, list_papers_page, iter_paper_pages, count_papers, get_paper_metadata,
+    get_papers_by_author, get_papers_by_category, get_library_stats
+)
+from arxiv_tool.utils import print_papers_table, print_library_stats, format_timestamp
 
 # Check for SDK metadata support
 try:
@@ -25,6 +31,54 @@ except ImportError:
     AGENT_SDK_AVAILABLE = False
 
 
+def sdk_paper_dict(paper: Tuple, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the SDK output of a paper record and its stored metadata."""
+    paper_id, category, id_number, version, title, authors, downloaded_at, directory, has_metadata, has_pdf = paper
+    return {
+        "paper_id": paper_id,
+        "title": title,
+        "authors": authors,
+        "category": category,
+        "id_number": id_number,
+        "version": version,
+        "downloaded_at": format_timestamp(downloaded_at),
+        "directory": directory,
+        "has_metadata": bool(has_metadata),
+        "has_pdf": bool(has_pdf),
+        "summary": metadata.get("summary"),
+        "published": metadata.get("published"),
+        "updated": metadata.get("updated"),
+        "doi": metadata.get("doi"),
+        "journal_ref": metadata.get("journal_ref"),
+        "categories": metadata.get("categories"),
+        "pdf_url": metadata.get("pdf_url")
+    }
+
+
+def print_papers_json(pages: Iterable[List[Tuple]], total: int, next_token: Optional[str] = None) -> None:
+    """
+    Print pages of papers as one JSON document, writing each paper as it is read.
+    
+    Parameters:
+        pages (iterable): Pages of paper records
+        total (int): Number of papers in the library
+        next_token (str, optional): Token of the page after the printed ones
+    """
+    print('{')
+    print(f'  "total": {total},')
+    print('  "papers": [', end='')
+    separator = '\n'
+    for papers in pages:
+        stored_metadata = get_paper_metadata(paper[0] for paper in papers)
+        for paper in papers:
+            item = json.dumps(sdk_paper_dict(paper, stored_metadata.get(paper[0], {})), indent=2)
+            print(separator + textwrap.indent(item, '    '), end='')
+            separator = ',\n'
+    print('\n  ],')
+    print(f'  "next_page_token": {json.dumps(next_token)}')
+    print('}')
+
+
 def main():
     """Main function to handle command line arguments or start the interactive CLI."""
     args = parse_args()
@@ -36,7 +90,7 @@ def main():
     sdk_output = getattr(args, 'sdk_metadata', False) and AGENT_SDK_AVAILABLE
     
     if args.command == "search":
-        results = search_paper(args.query, args.limit, args.auto_download)
+        results = search_paper(args.query, args.limit, args.auto_download, args.workers)
         
         if sdk_output:
             # Output in Agent SDK compatible format
@@ -53,7 +107,7 @@ def main():
                 print_papers_table(papers)
     
     elif args.command == "batch":
-        result = batch_download_from_file(args.file, args.delay)
+        result = batch_download_from_file(args.file, args.delay, args.chunk_size, args.workers, args.priority)
         
         if sdk_output:
             # Output in Agent SDK compatible format
@@ -68,6 +122,7 @@ def main():
                     "successfully_processed": result['success_count'],
                     "already_exists": result['already_exists_count'],
                     "errors": result['error_count'],
+                    "not_found": result['not_found'],
                     "downloaded_papers": len(papers_data)
                 }
                 print(json.dumps(sdk_result, indent=2))
@@ -80,12 +135,32 @@ def main():
             print(f"Successfully processed: {result['success_count']}")
             print(f"Already in database: {result['already_exists_count']}")
             print(f"Errors: {result['error_count']}")
+            if result['not_found']:
+                print(f"Not found on arXiv: {', '.join(result['not_found'])}")
+            if result['pending']:
+                print(f"Waiting for a retry: {result['pending']} (run 'resume' to continue)")
             
             papers = list_downloaded_papers()
             if papers:
                 print("\nDownloaded papers:")
                 print_papers_table(papers)
     
+    elif args.command == "resume":
+        result = resume_batch_jobs(args.batch, args.retry_failed, args.delay, args.chunk_size, args.workers)
+        
+        if sdk_output:
+            # Output in Agent SDK compatible format
+            print(json.dumps(result, indent=2))
+        elif result['success']:
+            # Standard output
+            print("\nResumed batch processing complete!")
+            print(f"Jobs resumed: {result['total']}")
+            print(f"Successfully processed: {result['success_count']}")
+            print(f"Errors: {result['error_count']}")
+            if result['not_found']:
+                print(f"Not found on arXiv: {', '.join(result['not_found'])}")
+            print(f"Still pending: {result['pending']}, failed: {result['failed']}")
+    
     elif args.command == "import":
         result = import_pdf_files(args.directory)
         
@@ -97,32 +172,46 @@ def main():
             print(f"\nImport complete: {result['successful']} succeeded, {result['failed']} failed")
     
     elif args.command == "list":
-        papers = list_downloaded_papers()
+        # Papers are read and printed a page at a time; with --page-size only one page is shown
+        try:
+            next_token = None
+            if args.author or args.category:
+                # Looked up through the authors and categories tables
+                papers = (get_papers_by_author(args.author) if args.author
+                          else get_papers_by_category(args.category))
+                if args.author and args.category:
+                    wanted = {paper[0] for paper in get_papers_by_category(args.category)}
+                    papers = [paper for paper in papers if paper[0] in wanted]
+                pages = iter([papers])
+                total = len(papers)
+            elif args.page_size:
+                papers, next_token = list_papers_page(args.page_size, args.page_token)
+                pages = iter([papers])
+                total = count_papers()
+            else:
+                pages = iter_paper_pages(page_token=args.page_token)
+                total = count_papers()
+            
+            if sdk_output:
+                # Output in Agent SDK compatible format
+                print_papers_json(pages, total, next_token)
+            else:
+                # Standard output
+                print_papers_table((paper for page in pages for paper in page), total=total)
+                if next_token:
+                    print(f"Next page: --page-token {next_token}")
+        except ValueError as e:
+            print(f"Error: {e}")
+    
+    elif args.command == "stats":
+        stats = get_library_stats()
         
         if sdk_output:
             # Output in Agent SDK compatible format
-            try:
-                papers_list = []
-                for paper in papers:
-                    paper_id, category, id_number, version, title, authors, downloaded_at, directory, has_metadata, has_pdf = paper
-                    papers_list.append({
-                        "paper_id": paper_id,
-                        "title": title,
-                        "authors": authors,
-                        "category": category,
-                        "id_number": id_number,
-                        "version": version,
-                        "downloaded_at": str(downloaded_at),
-                        "directory": directory,
-                        "has_metadata": bool(has_metadata),
-                        "has_pdf": bool(has_pdf)
-                    })
-                print(json.dumps({"total": len(papers_list), "papers": papers_list}, indent=2))
-            except Exception as e:
-                print(f"Error generating SDK output: {e}")
-        elif papers:
+            print(json.dumps(stats, indent=2))
+        else:
             # Standard output
-            print_papers_table(papers)
+            print_library_stats(stats, args.top)
     
     elif args.command == "fetch-metadata":
         result = fetch_metadata_for_imported_papers()
@@ -137,7 +226,7 @@ def main():
             print(f"  Errors: {result['error_count']}")
     
     elif args.command == "check-updates":
-        result = check_for_paper_updates()
+        result = check_for_paper_updates(args.workers, full=args.full)
         
         if sdk_output:
             # Output in Agent SDK compatible format
@@ -163,6 +252,75 @@ def main():
             print(f"Papers with metadata: {result['with_metadata']}")
             print(f"Papers with PDFs: {result['with_pdf']}")
     
+    elif args.command == "verify":
+        result = verify_library(args.workers)
+        
+        if sdk_output:
+            # Output in Agent SDK compatible format
+            print(json.dumps(result, indent=2))
+        elif result['success']:
+            # Standard output
+            print(f"\nPapers checked: {result['checked']}")
+            print(f"Complete: {result['complete']}")
+            print(f"PDF missing (marked in the database): {result['missing_pdf']}")
+    
+    elif args.command == "export-metadata":
+        result = export_metadata_files(args.paper_ids)
+        
+        if sdk_output:
+            # Output in Agent SDK compatible format
+            print(json.dumps(result, indent=2))
+        elif result['success']:
+            # Standard output
+            print(f"\nExported metadata files for {result['exported']} of {result['total']} papers")
+    
+    elif args.command == "extract-text" and args.benchmark:
+        result = benchmark_pdf_backends(args.sample)
+        
+        if sdk_output:
+            # Output in Agent SDK compatible format
+            print(json.dumps(result, indent=2))
+        elif result['success']:
+            # Standard output
+            print(f"\n{'Backend':<12} {'Pages/s':>10} {'Quality':>8} {'Failed':>7}")
+            print("-" * 40)
+            for name in result['order']:
+                backend = result['results'][name]
+                print(f"{name:<12} {backend['pages_per_second']:>10} {backend['quality']:>8} {backend['failed']:>7}")
+            print(f"\nBackend order from now on: {', '.join(result['order'])}")
+        else:
+            print(f"Error: {result['error']}")
+    
+    elif args.command == "extract-text":
+        result = extract_library_text(args.jobs, args.split_pages)
+        
+        if sdk_output:
+            # Output in Agent SDK compatible format
+            print(json.dumps(result, indent=2))
+        elif result['success']:
+            # Standard output
+            print(f"\nText extraction complete! ({result['seconds']} s with {result['jobs']} processes)")
+            print(f"PDFs extracted: {result['extracted']} ({result['pages']} pages)")
+            print(f"Already cached: {result['cached']}")
+            print(f"Failed: {result['failed']}")
+        else:
+            print(f"Error: {result['error']}")
+    
+    elif args.command == "reindex":
+        result = reindex_library(args.full_text)
+        
+        if sdk_output:
+            # Output in Agent SDK compatible format
+            print(json.dumps(result, indent=2))
+        elif result['success']:
+            # Standard output
+            print("\nReindexing complete!")
+            print(f"Papers indexed: {result['papers']}")
+            print(f"Abstracts indexed: {result['abstracts']}")
+            print(f"Full texts indexed: {result['full_texts']}")
+        else:
+            print(f"Error: {result['error']}")
+    
     else:
         # Start the interactive CLI if no command specified
         start_interactive_cli()
@@ -4,12 +4,19 @@ Data models and handlers for the arXiv Paper Manager.
 
 This package provides modules for handling various types of data:
 - Metadata extraction and parsing
-- PDF text extraction
+- PDF text extraction, with several backends
 - SDK metadata conversion for AI agent integration
 """
 
-from arxiv_tool.models.metadata import extract_and_save_metadata, parse_metadata_files
-from arxiv_tool.models.pdf_extractor import extract_text_from_pdf, get_paper_full_content
+from arxiv_tool.models.metadata import (
+    extract_and_save_metadata, parse_metadata_files, metadata_from_record, metadata_from_files,
+    record_from_metadata, load_paper_metadata
+)
+from arxiv_tool.models.pdf_extractor import extract_text_from_pdf, get_paper_full_content, get_relevant_chunks
+from arxiv_tool.models.pdf_backends import (
+    PDF_BACKENDS, available_backends, get_backend_order, extract_with_fallback, benchmark_backends,
+    choose_backend_order
+)
 from arxiv_tool.models.sdk_metadata import arxiv_search_to_sdk, output_sdk_json
 
 try:
@@ -19,8 +26,11 @@ except:
     PYDANTIC_MODELS_AVAILABLE = False
 
 __all__ = [
-    'extract_and_save_metadata', 'parse_metadata_files',
-    'extract_text_from_pdf', 'get_paper_full_content',
+    'extract_and_save_metadata', 'parse_metadata_files', 'metadata_from_record', 'metadata_from_files',
+    'record_from_metadata', 'load_paper_metadata',
+    'extract_text_from_pdf', 'get_paper_full_content', 'get_relevant_chunks',
+    'PDF_BACKENDS', 'available_backends', 'get_backend_order', 'extract_with_fallback', 'benchmark_backends',
+    'choose_backend_order',
     'arxiv_search_to_sdk', 'output_sdk_json'
 ]
 
@@ -7,48 +7,45 @@ for arXiv papers.
 """
 
 import os
-import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Any
+import re
+from typing import Dict, List, Optional, Any, Union
 
-from arxiv_tool.config import METADATA_SUBDIR, XML_NAMESPACES
+from arxiv_tool.config import METADATA_SUBDIR
+from arxiv_tool.api.paper_parser import PaperRecord, parse_feed
 from arxiv_tool.utils import (
-    extract_paper_id, get_simplified_paper_id, sanitize_filename, 
+    extract_paper_id, extract_paper_id_parts, get_simplified_paper_id, sanitize_filename, 
     ensure_dir_exists, save_to_file
 )
 
+# Line formats of the authors.txt and links.txt files
+_AUTHOR_LINE = re.compile(r'^(.*?) \((.*)\)$')
+_LINK_LINE = re.compile(r'^title: (.*?), rel: (.*?), type: (.*?), href: (.*)$')
 
-def extract_and_save_metadata(xml_response: str, paper_dir: Optional[str] = None) -> Dict[str, Any]:
+
+def extract_and_save_metadata(paper: Union[PaperRecord, str], paper_dir: Optional[str] = None) -> Dict[str, Any]:
     """
-    Extract metadata from arXiv API response and save it to files.
+    Save the metadata of an arXiv paper to files.
     
     Parameters:
-        xml_response (str): The XML response from arXiv API
+        paper (PaperRecord or str): The parsed paper record. A raw XML response from
+                                   the arXiv API is also accepted and parsed here.
         paper_dir (str, optional): Directory where metadata will be saved.
                                  If None, a directory will be created based on paper ID.
     
     Returns:
         dict: A dictionary containing the extracted metadata and success status
     """
-    # Parse the XML
-    try:
-        root = ET.fromstring(xml_response)
-    except Exception as e:
-        print(f"Error parsing XML: {e}")
-        return {'success': False, 'error': f"XML parsing error: {e}"}
-    
-    # Get the paper entry
-    ns = XML_NAMESPACES
-    entry = root.find('atom:entry', ns)
-    if entry is None:
-        return {'success': False, 'error': "No entry found in XML"}
-    
-    # Extract paper id from <id>
-    id_elem = entry.find('atom:id', ns)
-    if id_elem is None or not id_elem.text:
-        return {'success': False, 'error': "No paper ID found in entry"}
-    
-    paper_url = id_elem.text.strip()
-    paper_id = extract_paper_id(paper_url)
+    if isinstance(paper, str):
+        try:
+            records = parse_feed(paper)
+        except Exception as e:
+            print(f"Error parsing XML: {e}")
+            return {'success': False, 'error': f"XML parsing error: {e}"}
+        if not records:
+            return {'success': False, 'error': "No entry found in XML"}
+        paper = records[0]
+    
+    paper_id = paper.paper_id
     
     # Use simplified ID (without category prefix)
     simple_id = get_simplified_paper_id(paper_id)
@@ -72,61 +69,47 @@ def extract_and_save_metadata(xml_response: str, paper_dir: Optional[str] = None
     
     # Save the paper URL as id.txt
     id_file = os.path.join(metadata_dir, 'id.txt')
-    save_to_file(paper_url, id_file)
+    save_to_file(paper.id_url, id_file)
     metadata['files_saved'].append(id_file)
     
-    # Extract and save all relevant metadata fields
-    fields_to_extract = [
-        ('updated', 'atom:updated'),
-        ('published', 'atom:published'),
-        ('title', 'atom:title'),
-        ('summary', 'atom:summary'),
-        ('doi', 'arxiv:doi'),
-        ('journal_ref', 'arxiv:journal_ref'),
-        ('comment', 'arxiv:comment')
+    # Save all relevant single-value metadata fields
+    fields_to_save = [
+        ('updated', paper.updated),
+        ('published', paper.published),
+        ('title', paper.title),
+        ('summary', paper.summary),
+        ('doi', paper.doi),
+        ('journal_ref', paper.journal_ref),
+        ('comment', paper.comment)
     ]
     
-    for field_name, xpath in fields_to_extract:
-        elem = entry.find(xpath, ns)
-        if elem is not None and elem.text:
-            content = elem.text.strip()
+    for field_name, content in fields_to_save:
+        if content:
             file_path = os.path.join(metadata_dir, f"{field_name}.txt")
             save_to_file(content, file_path)
             metadata[field_name] = content
             metadata['files_saved'].append(file_path)
     
-    # Process authors: gather each author with their affiliation (if provided)
-    authors = []
-    author_names = []
-    for author in entry.findall('atom:author', ns):
-        name_elem = author.find('atom:name', ns)
-        name = name_elem.text.strip() if name_elem is not None and name_elem.text else "Unknown"
-        author_names.append(name)
-        
-        affiliation_elem = author.find('arxiv:affiliation', ns)
-        affiliation = affiliation_elem.text.strip() if affiliation_elem is not None and affiliation_elem.text else "No affiliation"
-        authors.append(f"{name} ({affiliation})")
+    # Process authors: each author with their affiliation (if provided)
+    authors = [
+        f"{name} ({affiliation or 'No affiliation'})"
+        for name, affiliation in zip(paper.authors, paper.affiliations)
+    ]
     
     if authors:
         file_path = os.path.join(metadata_dir, "authors.txt")
         save_to_file("\n".join(authors), file_path)
-        metadata['authors'] = author_names
+        metadata['authors'] = list(paper.authors)
         metadata['authors_with_affiliation'] = authors
         metadata['files_saved'].append(file_path)
     
-    # Process and save all link elements
-    links = []
-    for link in entry.findall('atom:link', ns):
-        # Retrieve attributes such as rel, href, title, and type
-        rel = link.attrib.get('rel', '')
-        href = link.attrib.get('href', '')
-        title_attr = link.attrib.get('title', '')
-        type_attr = link.attrib.get('type', '')
-        links.append(f"title: {title_attr}, rel: {rel}, type: {type_attr}, href: {href}")
-        
-        # If this is the PDF link, save it separately
-        if title_attr == 'pdf' or type_attr == 'application/pdf':
-            metadata['pdf_url'] = href
+    # Save all link elements
+    links = [
+        f"title: {link['title']}, rel: {link['rel']}, type: {link['type']}, href: {link['href']}"
+        for link in paper.links
+    ]
+    if paper.pdf_url:
+        metadata['pdf_url'] = paper.pdf_url
     
     if links:
         file_path = os.path.join(metadata_dir, "links.txt")
@@ -135,21 +118,17 @@ def extract_and_save_metadata(xml_response: str, paper_dir: Optional[str] = None
         metadata['files_saved'].append(file_path)
     
     # Save primary category
-    primary_cat_elem = entry.find('arxiv:primary_category', ns)
-    if primary_cat_elem is not None:
-        primary_cat = primary_cat_elem.attrib.get('term', '')
+    if paper.primary_category:
         file_path = os.path.join(metadata_dir, "primary_category.txt")
-        save_to_file(primary_cat, file_path)
-        metadata['primary_category'] = primary_cat
+        save_to_file(paper.primary_category, file_path)
+        metadata['primary_category'] = paper.primary_category
         metadata['files_saved'].append(file_path)
     
-    # Save category
-    cat_elem = entry.find('atom:category', ns)
-    if cat_elem is not None:
-        cat_term = cat_elem.attrib.get('term', '')
+    # Save category (the first <category> of the entry)
+    if paper.categories:
         file_path = os.path.join(metadata_dir, "category.txt")
-        save_to_file(cat_term, file_path)
-        metadata['category'] = cat_term
+        save_to_file(paper.categories[0], file_path)
+        metadata['category'] = paper.categories[0]
         metadata['files_saved'].append(file_path)
     
     print(f"Metadata files have been saved in the directory: {metadata_dir}")
@@ -196,4 +175,140 @@ def parse_metadata_files(paper_dir: str) -> Dict[str, Any]:
     elif 'paper_id' not in metadata:
         metadata['paper_id'] = os.path.basename(paper_dir)
     
-    return metadata
\ No newline at end of file
+    return metadata
+
+
+def metadata_from_record(paper: PaperRecord) -> Dict[str, Any]:
+    """
+    Build the metadata stored in the database from a parsed paper record.
+    
+    Parameters:
+        paper (PaperRecord): The parsed paper record
+        
+    Returns:
+        dict: The metadata fields (see METADATA_FIELDS in the database package)
+    """
+    return {
+        'id_url': paper.id_url,
+        'summary': paper.summary,
+        'published': paper.published,
+        'updated': paper.updated,
+        'doi': paper.doi,
+        'journal_ref': paper.journal_ref,
+        'comment': paper.comment,
+        'primary_category': paper.primary_category,
+        'pdf_url': paper.pdf_url,
+        'categories': list(paper.categories),
+        'authors': list(paper.authors),
+        'affiliations': list(paper.affiliations),
+        'links': [dict(link) for link in paper.links]
+    }
+
+
+def metadata_from_files(files: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert the values read by parse_metadata_files() into stored metadata.
+    
+    Parameters:
+        files (dict): The metadata read from a paper's metadata files
+        
+    Returns:
+        dict: The metadata fields (see METADATA_FIELDS in the database package)
+    """
+    authors = []
+    affiliations = []
+    for line in files.get('authors', '').splitlines():
+        match = _AUTHOR_LINE.match(line.strip())
+        name, affiliation = match.groups() if match else (line.strip(), '')
+        if name:
+            authors.append(name)
+            affiliations.append('' if affiliation == 'No affiliation' else affiliation)
+    
+    links = []
+    for line in files.get('links', '').splitlines():
+        match = _LINK_LINE.match(line.strip())
+        if match:
+            links.append(dict(zip(('title', 'rel', 'type', 'href'), match.groups())))
+    
+    pdf_url = next((link['href'] for link in links
+                    if link['title'] == 'pdf' or link['type'] == 'application/pdf'), None)
+    
+    return {
+        'id_url': files.get('id'),
+        'summary': files.get('summary'),
+        'published': files.get('published'),
+        'updated': files.get('updated'),
+        'doi': files.get('doi'),
+        'journal_ref': files.get('journal_ref'),
+        'comment': files.get('comment'),
+        'primary_category': files.get('primary_category'),
+        'pdf_url': pdf_url,
+        'categories': [files['category']] if files.get('category') else [],
+        'authors': authors,
+        'affiliations': affiliations,
+        'links': links
+    }
+
+
+def record_from_metadata(paper_id: str, title: str, metadata: Dict[str, Any]) -> PaperRecord:
+    """
+    Rebuild a paper record from the metadata stored in the database.
+    
+    Parameters:
+        paper_id (str): The paper ID
+        title (str): The paper title
+        metadata (dict): The stored metadata of the paper
+        
+    Returns:
+        PaperRecord: The paper record, e.g. for extract_and_save_metadata()
+    """
+    parts = extract_paper_id_parts(paper_id)
+    authors = metadata.get('authors') or []
+    affiliations = metadata.get('affiliations') or []
+    
+    return PaperRecord(
+        paper_id=paper_id,
+        id_url=metadata.get('id_url') or f"http://arxiv.org/abs/{paper_id}",
+        category=parts['category'],
+        id_number=parts['id_number'],
+        version=parts['version'],
+        safe_paper_id=sanitize_filename(get_simplified_paper_id(paper_id)),
+        title=title or "Unknown Title",
+        authors=list(authors),
+        affiliations=list(affiliations) + [''] * (len(authors) - len(affiliations)),
+        pdf_url=metadata.get('pdf_url'),
+        summary=metadata.get('summary') or "",
+        published=metadata.get('published') or "",
+        updated=metadata.get('updated') or "",
+        doi=metadata.get('doi') or "",
+        journal_ref=metadata.get('journal_ref') or "",
+        comment=metadata.get('comment') or "",
+        primary_category=metadata.get('primary_category') or "",
+        categories=list(metadata.get('categories') or []),
+        links=list(metadata.get('links') or [])
+    )
+
+
+def load_paper_metadata(paper_id: str, paper_dir: str) -> Dict[str, Any]:
+    """
+    Get the metadata of a downloaded paper.
+    
+    The metadata is read from the database; the metadata files are only
+    read for papers whose metadata has not been moved there yet.
+    
+    Parameters:
+        paper_id (str): The paper ID
+        paper_dir (str): Path to the paper directory
+        
+    Returns:
+        dict: Dictionary of metadata values
+    """
+    from arxiv_tool.database import get_paper_metadata
+    
+    stored = get_paper_metadata([paper_id]).get(paper_id)
+    if stored is None:
+        return parse_metadata_files(paper_dir)
+    
+    metadata = {'paper_dir': paper_dir, 'success': True, 'paper_id': paper_id}
+    metadata.update(stored)
+    return metadata
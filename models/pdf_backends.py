@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+PDF text-extraction backends for the arXiv Paper Manager.
+
+Text can be extracted by any of these backends, each used when available:
+- pypdf: pure Python ('pip install pypdf')
+- pdfminer: pdfminer.six, pure Python, slower but often better on complex layouts
+- pdftotext: the poppler command-line tools, run as a subprocess when on PATH
+
+extract_with_fallback() tries the backends in order of preference, giving
+each a time limit per document, so a PDF that makes one backend fail or
+hang is handed to the next one. benchmark_backends() measures the speed
+and output quality of each backend on sample PDFs; the order it chooses is
+kept in the library state and used from then on.
+"""
+
+import io
+import re
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from arxiv_tool.config import PDF_EXTRACTION_TIMEOUT, PDF_BACKEND_QUALITY_TOLERANCE
+from arxiv_tool.database import Library, get_library_state
+
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+try:
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    PDFMINER_AVAILABLE = True
+except ImportError:
+    PDFMINER_AVAILABLE = False
+
+
+# Library state key of the backend order chosen by the last benchmark
+BACKEND_ORDER_KEY = 'pdf_backend_order'
+
+# Pages extracted per pdftotext run when iterating over a PDF
+_PDFTOTEXT_CHUNK_PAGES = 10
+
+
+class ExtractionTimeout(BaseException):
+    """
+    Raised when a backend takes longer than its time limit on a document.
+
+    It derives from BaseException because pypdf and pdfminer catch Exception
+    around the parsing of each page and would go on parsing.
+    """
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Interrupt the code run in the block with ExtractionTimeout after some time.
+
+    The limit relies on SIGALRM, so it only applies in the main thread of a
+    process on Unix (e.g. the command line, or a worker process of the
+    extract-text pool); elsewhere the block runs without a limit.
+
+    Parameters:
+        seconds (float, optional): The time limit (None or 0 for no limit)
+    """
+    if not seconds or not hasattr(signal, 'SIGALRM') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise ExtractionTimeout(f"Extraction took longer than {seconds} seconds")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class PdfBackend:
+    """A way of extracting the text of PDF pages."""
+
+    name = ''
+
+    def available(self) -> bool:
+        """Whether the backend can be used on this system."""
+        raise NotImplementedError
+
+    def count_pages(self, pdf_path: str) -> int:
+        """Get the number of pages of a PDF."""
+        raise NotImplementedError
+
+    def iter_pages(self, pdf_path: str, first_page: int = 1, last_page: Optional[int] = None) -> Iterator[str]:
+        """
+        Extract the text of the pages of a PDF one at a time, parsing each page only when it is consumed.
+
+        Parameters:
+            pdf_path (str): Path to the PDF file
+            first_page (int): First page to extract, counted from 1
+            last_page (int, optional): Last page to extract, included (defaults to the last page of the PDF)
+
+        Yields:
+            str: The text of each page ('' for pages without text)
+        """
+        raise NotImplementedError
+
+
+class PypdfBackend(PdfBackend):
+    name = 'pypdf'
+
+    def available(self) -> bool:
+        return PYPDF_AVAILABLE
+
+    def count_pages(self, pdf_path: str) -> int:
+        return len(PdfReader(pdf_path).pages)
+
+    def iter_pages(self, pdf_path: str, first_page: int = 1, last_page: Optional[int] = None) -> Iterator[str]:
+        pages = PdfReader(pdf_path).pages
+        last_page = len(pages) if last_page is None else min(last_page, len(pages))
+        for number in range(max(first_page, 1), last_page + 1):
+            yield pages[number - 1].extract_text() or ""
+
+
+class PdfminerBackend(PdfBackend):
+    name = 'pdfminer'
+
+    def available(self) -> bool:
+        return PDFMINER_AVAILABLE
+
+    def count_pages(self, pdf_path: str) -> int:
+        with open(pdf_path, 'rb') as f:
+            return sum(1 for _ in PDFPage.get_pages(f))
+
+    def iter_pages(self, pdf_path: str, first_page: int = 1, last_page: Optional[int] = None) -> Iterator[str]:
+        resources = PDFResourceManager()
+        output = io.StringIO()
+        with open(pdf_path, 'rb') as f, TextConverter(resources, output, laparams=LAParams()) as device:
+            interpreter = PDFPageInterpreter(resources, device)
+            for number, page in enumerate(PDFPage.get_pages(f), 1):
+                if number < first_page:
+                    continue
+                if last_page is not None and number > last_page:
+                    break
+                output.seek(0)
+                output.truncate()
+                interpreter.process_page(page)
+                # Each page ends with a form feed
+                yield output.getvalue().rstrip('\f').strip()
+
+
+class PdftotextBackend(PdfBackend):
+    name = 'pdftotext'
+
+    def available(self) -> bool:
+        return shutil.which('pdftotext') is not None and shutil.which('pdfinfo') is not None
+
+    def count_pages(self, pdf_path: str) -> int:
+        output = subprocess.run(['pdfinfo', pdf_path], capture_output=True, text=True, check=True,
+                                timeout=PDF_EXTRACTION_TIMEOUT).stdout
+        match = re.search(r'^Pages:\s+(\d+)', output, re.MULTILINE)
+        if not match:
+            raise ValueError(f"pdfinfo reported no page count for {pdf_path}")
+        return int(match.group(1))
+
+    def iter_pages(self, pdf_path: str, first_page: int = 1, last_page: Optional[int] = None) -> Iterator[str]:
+        count = self.count_pages(pdf_path)
+        last_page = count if last_page is None else min(last_page, count)
+        for first in range(max(first_page, 1), last_page + 1, _PDFTOTEXT_CHUNK_PAGES):
+            last = min(first + _PDFTOTEXT_CHUNK_PAGES - 1, last_page)
+            output = subprocess.run(
+                ['pdftotext', '-f', str(first), '-l', str(last), '-enc', 'UTF-8', pdf_path, '-'],
+                capture_output=True, check=True, timeout=PDF_EXTRACTION_TIMEOUT
+            ).stdout.decode('utf-8', errors='replace')
+            # Each page ends with a form feed
+            pages = output.split('\f')[:last - first + 1]
+            pages += [""] * (last - first + 1 - len(pages))
+            for text in pages:
+                yield text.strip()
+
+
+# Backends by name, in their default order of preference
+PDF_BACKENDS: Dict[str, PdfBackend] = {
+    backend.name: backend for backend in (PypdfBackend(), PdfminerBackend(), PdftotextBackend())
+}
+
+
+def available_backends() -> List[str]:
+    """
+    List the backends that can be used on this system.
+
+    Returns:
+        list: Backend names, in their default order of preference
+    """
+    return [name for name, backend in PDF_BACKENDS.items() if backend.available()]
+
+
+def get_backend_order(library: Optional[Library] = None) -> List[str]:
+    """
+    Get the available backends in the order they are tried.
+
+    Parameters:
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        list: Backend names, those chosen by the last benchmark first
+    """
+    available = available_backends()
+    chosen = (get_library_state(BACKEND_ORDER_KEY, library=library) or '').split(',')
+    preferred = [name for name in chosen if name in available]
+    return preferred + [name for name in available if name not in preferred]
+
+
+def extract_with_fallback(
+    pdf_path: str,
+    first_page: int = 1,
+    last_page: Optional[int] = None,
+    max_chars: int = 0,
+    backends: Optional[Iterable[str]] = None,
+    timeout: Optional[float] = PDF_EXTRACTION_TIMEOUT,
+    with_count: bool = False
+) -> Tuple[Optional[List[str]], Optional[str], bool, Optional[int]]:
+    """
+    Extract the text of pages of a PDF with the first backend that succeeds.
+
+    A backend that raises an error or takes longer than the time limit is
+    given up, and the pages are extracted again by the next one.
+
+    Parameters:
+        pdf_path (str): Path to the PDF file
+        first_page (int): First page to extract, counted from 1
+        last_page (int, optional): Last page to extract, included (defaults to the last page of the PDF)
+        max_chars (int): Stop after the page that brings the text to this many characters (0 for no limit)
+        backends (iterable, optional): Backend names to try in order (defaults to all available ones,
+                                       in their default order)
+        timeout (float, optional): Time limit per backend, in seconds (None for no limit)
+        with_count (bool): Whether to also count the pages of the PDF
+
+    Returns:
+        tuple: (the text of each page or None if every backend failed, the backend used,
+                whether extraction stopped at max_chars, the page count or None)
+    """
+    backends = available_backends() if backends is None else list(backends)
+    for name in backends:
+        backend = PDF_BACKENDS[name]
+        pages = []
+        chars = 0
+        stopped = False
+        try:
+            with time_limit(timeout):
+                for text in backend.iter_pages(pdf_path, first_page, last_page):
+                    pages.append(text)
+                    chars += len(text)
+                    if 0 < max_chars <= chars:
+                        stopped = True
+                        break
+                page_count = backend.count_pages(pdf_path) if with_count else None
+        except ExtractionTimeout as e:
+            print(f"Gave up extracting text from PDF {pdf_path} with {name}: {e}")
+            continue
+        except Exception as e:
+            print(f"Error extracting text from PDF {pdf_path} with {name}: {e}")
+            continue
+        return pages, name, stopped, page_count
+    return None, None, False, None
+
+
+def text_quality(text: str) -> float:
+    """
+    Estimate the quality of extracted text.
+
+    Garbled extraction shows as tokens that are not words: words run
+    together, broken encodings or '(cid:42)' glyph codes.
+
+    Parameters:
+        text (str): The extracted text
+
+    Returns:
+        float: The share of tokens that look like words or numbers (0 to 1)
+    """
+    tokens = text.split()
+    if not tokens:
+        return 0.0
+    words = sum(1 for token in tokens
+                if re.fullmatch(r"[(\[\"']?([A-Za-z][A-Za-z'\-]{0,24}|[\d.,%]+)[)\]\"'.,;:?!]*", token))
+    return words / len(tokens)
+
+
+def benchmark_backends(pdf_paths: List[str], backends: Optional[Iterable[str]] = None,
+                       timeout: Optional[float] = PDF_EXTRACTION_TIMEOUT) -> Dict[str, Dict[str, Any]]:
+    """
+    Measure the speed and output quality of backends on sample PDFs.
+
+    Parameters:
+        pdf_paths (list): The sample PDFs
+        backends (iterable, optional): Backend names to measure (defaults to all available ones)
+        timeout (float, optional): Time limit per document, in seconds
+
+    Returns:
+        dict: For each backend, 'documents', 'failed', 'pages', 'chars', 'seconds',
+              'pages_per_second' and 'quality' (mean text_quality() of the documents)
+    """
+    results = {}
+    for name in (available_backends() if backends is None else backends):
+        result = {'documents': 0, 'failed': 0, 'pages': 0, 'chars': 0, 'seconds': 0.0}
+        qualities = []
+        for pdf_path in pdf_paths:
+            started = time.perf_counter()
+            pages = extract_with_fallback(pdf_path, backends=[name], timeout=timeout)[0]
+            result['seconds'] += time.perf_counter() - started
+            if pages is None:
+                result['failed'] += 1
+                continue
+            text = "\n\n".join(pages)
+            result['documents'] += 1
+            result['pages'] += len(pages)
+            result['chars'] += len(text)
+            qualities.append(text_quality(text))
+        result['seconds'] = round(result['seconds'], 3)
+        result['pages_per_second'] = round(result['pages'] / result['seconds'], 1) if result['seconds'] else 0.0
+        result['quality'] = round(sum(qualities) / len(qualities), 3) if qualities else 0.0
+        results[name] = result
+    return results
+
+
+def choose_backend_order(results: Dict[str, Dict[str, Any]],
+                         tolerance: float = PDF_BACKEND_QUALITY_TOLERANCE) -> List[str]:
+    """
+    Order backends by the results of a benchmark.
+
+    Backends that failed on no document and whose quality is within the
+    tolerance of the best come first, fastest first; then the others, by
+    number of failures and speed.
+
+    Parameters:
+        results (dict): Results of benchmark_backends()
+        tolerance (float): Quality a backend may lose against the best one and still be preferred
+
+    Returns:
+        list: Backend names, the one to use first
+    """
+    working = [result['quality'] for result in results.values() if result['documents']]
+    best_quality = max(working) if working else 0.0
+
+    def rank(name: str) -> Tuple:
+        result = results[name]
+        good = result['documents'] > 0 and not result['failed'] and result['quality'] >= best_quality - tolerance
+        return (not good, result['failed'], -result['pages_per_second'])
+    return sorted(results, key=rank)
@@ -6,64 +6,196 @@ This module provides functions for extracting text from downloaded PDF files.
 """
 
 import os
-from typing import Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from arxiv_tool.config import PDF_SUBDIR
+from arxiv_tool.database import (
+    Library, PdfText, join_pages, get_cached_text, store_cached_text, get_text_chunks, rank_chunks
+)
+from arxiv_tool.models.pdf_backends import PDF_BACKENDS, available_backends, get_backend_order, extract_with_fallback
 
 
-# Use pypdf for PDF text extraction
-try:
-    from pypdf import PdfReader
-    PDF_PARSER_AVAILABLE = True
-except ImportError:
-    PDF_PARSER_AVAILABLE = False
+# Text extraction needs at least one of the backends
+PDF_PARSER_AVAILABLE = bool(available_backends())
 
+# Shown in place of the text of a PDF when no backend is installed
+NO_BACKEND_MESSAGE = ("PDF text extraction not available. Install pypdf ('pip install pypdf') "
+                      "or pdfminer.six, or put poppler's pdftotext on the PATH")
 
-def extract_text_from_pdf(pdf_path: str) -> Optional[str]:
+
+def _backend_order(library: Optional[Library]) -> List[str]:
+    # Without a library, extraction does not touch the database
+    return get_backend_order(library) if library is not None else available_backends()
+
+
+def iter_pdf_pages(pdf_path: str, first_page: int = 1, last_page: Optional[int] = None,
+                   backend: Optional[str] = None, library: Optional[Library] = None) -> Iterator[str]:
     """
-    Extract text from a PDF file.
+    Extract the text of the pages of a PDF file one at a time.
+    
+    A page is only parsed when it is consumed, so a caller that stops early
+    skips the rest of the document. Unlike extract_pdf_pages(), there is no
+    time limit and no fallback to another backend.
+    
+    Parameters:
+        pdf_path (str): Path to the PDF file
+        first_page (int): First page to extract, counted from 1
+        last_page (int, optional): Last page to extract, included (defaults to the last page of the PDF)
+        backend (str, optional): The backend to use (defaults to the preferred one)
+        library (Library, optional): The library whose preferred backend is used
+                                     (defaults to the first available backend)
+        
+    Yields:
+        str: The text of each page ('' for pages without text)
+        
+    Raises:
+        Exception: If the PDF cannot be read (the backends raise errors of several types)
+    """
+    backend = backend or _backend_order(library)[0]
+    yield from PDF_BACKENDS[backend].iter_pages(pdf_path, first_page, last_page)
+
+
+def extract_pdf_pages(pdf_path: str, first_page: int = 1, last_page: Optional[int] = None,
+                      max_chars: int = 0, library: Optional[Library] = None) -> Optional[List[str]]:
+    """
+    Extract the text of each page of a PDF file.
+    
+    The backends are tried in order of preference, each with a time limit
+    (see pdf_backends.extract_with_fallback()).
     
     Parameters:
         pdf_path (str): Path to the PDF file
+        first_page (int): First page to extract, counted from 1
+        last_page (int, optional): Last page to extract, included (defaults to the last page of the PDF)
+        max_chars (int): Stop after the page that brings the text to this many characters (0 for no limit)
+        library (Library, optional): The library whose backend order is used
+                                     (defaults to the default order of the available backends)
         
     Returns:
-        str: Extracted text from the PDF, or None if extraction fails
+        list: The text of each page ('' for pages without text), or None if extraction fails
     """
-    if not PDF_PARSER_AVAILABLE:
-        return "PDF text extraction not available. Install pypdf with 'pip install pypdf'"
+    if not PDF_PARSER_AVAILABLE or not os.path.exists(pdf_path):
+        return None
+    return extract_with_fallback(pdf_path, first_page, last_page, max_chars, backends=_backend_order(library))[0]
+
+
+def extract_text_from_pdf(pdf_path: str, max_chars: int = 0, library: Optional[Library] = None) -> Optional[str]:
+    """
+    Extract text from a PDF file.
     
-    if not os.path.exists(pdf_path):
+    Parameters:
+        pdf_path (str): Path to the PDF file
+        max_chars (int): Stop extracting once the text has this many characters (0 for no limit);
+                         the text is not truncated to it
+        library (Library, optional): The library whose backend order is used
+                                     (defaults to the default order of the available backends)
+        
+    Returns:
+        str: Extracted text from the PDF, or None if extraction fails or no backend is installed
+    """
+    pages = extract_pdf_pages(pdf_path, max_chars=max_chars, library=library)
+    if pages is None:
         return None
+    return join_pages(pages)[0]
+
+
+def get_pdf_text(pdf_path: str, first_page: int = 1, last_page: Optional[int] = None, max_chars: int = 0,
+                 library: Optional[Library] = None) -> Tuple[Optional[PdfText], bool]:
+    """
+    Get the text of a PDF file, extracting it only if it is not cached yet.
+    
+    A cached text is always complete. Otherwise only the requested pages are
+    extracted, stopping once max_chars characters were extracted; the text
+    is cached if this went through the whole document. The text of long
+    PDFs is cached in full by the extract-text command (see
+    pipeline.text_extraction).
     
-    try:
-        reader = PdfReader(pdf_path)
-        text = ""
+    Parameters:
+        pdf_path (str): Path to the PDF file
+        first_page (int): First page needed, counted from 1
+        last_page (int, optional): Last page needed, included (defaults to the last page of the PDF)
+        max_chars (int): Number of characters needed from first_page on (0 for all)
+        library (Library, optional): The library session to use (defaults to the shared one)
         
-        # Extract text from all pages
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n\n"
+    Returns:
+        tuple: (the text, or None if extraction fails; whether it was extracted by this call)
+    """
+    pdf_text = get_cached_text(pdf_path, library=library)
+    if pdf_text is not None:
+        return pdf_text, False
+    if not PDF_PARSER_AVAILABLE or not os.path.exists(pdf_path):
+        return None, False
+    
+    first_page = max(first_page, 1)
+    pages, _, stopped, _ = extract_with_fallback(pdf_path, first_page, last_page, max_chars,
+                                                 backends=get_backend_order(library))
+    if pages is None:
+        return None, False
+    
+    if first_page == 1 and last_page is None and not stopped:
+        return store_cached_text(pdf_path, pages, library=library), True
+    text, offsets = join_pages(pages)
+    return PdfText('', text, offsets, first_page=first_page, complete=False), True
+
+
+def find_paper_pdf(paper_id: str, directory: str, id_number: Optional[str] = None,
+                   version: Optional[str] = None) -> Optional[str]:
+    """
+    Find the PDF file of a paper in its directory.
+    
+    Parameters:
+        paper_id (str): The paper ID
+        directory (str): The paper's directory
+        id_number (str, optional): The paper's ID number, used to build the expected file name
+        version (str, optional): The paper's version
         
-        return text
-    except Exception as e:
-        print(f"Error extracting text from PDF {pdf_path}: {e}")
-        return None
+    Returns:
+        str: Path to the PDF, or None if there is none
+    """
+    if id_number:
+        if version:
+            pdf_filename = f"{id_number}v{version}.pdf"
+        else:
+            pdf_filename = f"{id_number}.pdf"
+    else:
+        # Just use the paper_id as filename
+        pdf_filename = f"{paper_id}.pdf"
+    
+    pdf_dir = os.path.join(directory, PDF_SUBDIR)
+    pdf_path = os.path.join(pdf_dir, pdf_filename)
+    if os.path.exists(pdf_path):
+        return pdf_path
+    
+    # Try to find any PDF in the directory
+    if os.path.exists(pdf_dir):
+        pdf_files = [f for f in os.listdir(pdf_dir) if f.lower().endswith('.pdf')]
+        if pdf_files:
+            return os.path.join(pdf_dir, pdf_files[0])
+    return None
 
 
-def get_paper_full_content(paper_id: str, max_chars: int = 100000) -> Dict:
+def get_paper_full_content(paper_id: str, max_chars: int = 100000, start_char: int = 0,
+                           first_page: Optional[int] = None, last_page: Optional[int] = None) -> Dict:
     """
     Get the full content of a paper, including metadata and PDF text.
     
+    A PDF whose text is cached in the database (see text_cache) is not
+    parsed again. Otherwise pages are extracted one at a time and only as
+    far as max_chars requires, and the text is cached only if that went
+    through the whole document; the extract-text command caches the rest.
+    
     Parameters:
         paper_id (str): The paper ID
-        max_chars (int): Maximum characters to extract from the PDF
+        max_chars (int): Maximum characters to return from the PDF (0 for no limit)
+        start_char (int): Offset of the first character to return, within the selected pages
+        first_page (int, optional): First page to return, counted from 1
+        last_page (int, optional): Last page to return, included
         
     Returns:
         dict: Dictionary containing both metadata and PDF text
     """
-    from arxiv_tool.database import get_paper_details
-    from arxiv_tool.models.metadata import parse_metadata_files
+    from arxiv_tool.database import get_paper_details, index_paper_texts
+    from arxiv_tool.models.metadata import load_paper_metadata
     
     # First, get the paper details from the database
     paper_details = get_paper_details(paper_id)
@@ -76,34 +208,31 @@ def get_paper_full_content(paper_id: str, max_chars: int = 100000) -> Dict:
     # Get the directory where the paper is stored
     directory = paper_details['directory']
     
-    # Parse metadata files
-    metadata = parse_metadata_files(directory)
+    # Get the metadata stored with the paper
+    metadata = load_paper_metadata(paper_id, directory)
     
     # Get the PDF path
-    if paper_details.get('id_number'):
-        if paper_details.get('version'):
-            pdf_filename = f"{paper_details['id_number']}v{paper_details['version']}.pdf"
-        else:
-            pdf_filename = f"{paper_details['id_number']}.pdf"
-    else:
-        # Just use the paper_id as filename
-        pdf_filename = f"{paper_id}.pdf"
-    
-    pdf_path = os.path.join(directory, PDF_SUBDIR, pdf_filename)
+    pdf_path = find_paper_pdf(paper_id, directory, paper_details.get('id_number'), paper_details.get('version'))
     
-    # Check if PDF exists
-    if not os.path.exists(pdf_path):
-        # Try to find any PDF in the directory
-        pdf_dir = os.path.join(directory, PDF_SUBDIR)
-        if os.path.exists(pdf_dir):
-            pdf_files = [f for f in os.listdir(pdf_dir) if f.lower().endswith('.pdf')]
-            if pdf_files:
-                pdf_path = os.path.join(pdf_dir, pdf_files[0])
-    
-    # If we found a PDF, extract its text
+    # If we found a PDF, get its text
     pdf_text = None
-    if os.path.exists(pdf_path):
-        pdf_text = extract_text_from_pdf(pdf_path)
+    pages = None
+    if pdf_path:
+        # Without a cached text, only the pages that are needed are extracted
+        needed = max(start_char, 0) + max_chars if max_chars > 0 else 0
+        cached, extracted = get_pdf_text(pdf_path, first_page or 1, last_page, needed)
+        
+        if cached is not None:
+            # Make the text searchable the first time we have all of it
+            if extracted and cached.complete:
+                index_paper_texts([(paper_id, None, cached.text)])
+            
+            pages = cached.pages if cached.complete else None
+            if first_page is not None or last_page is not None:
+                pdf_text = cached.page_range(first_page or 1, last_page)
+            else:
+                pdf_text = cached.text
+            pdf_text = pdf_text[max(start_char, 0):]
         
         # Truncate if too long
         if pdf_text and max_chars > 0 and len(pdf_text) > max_chars:
@@ -115,7 +244,76 @@ def get_paper_full_content(paper_id: str, max_chars: int = 100000) -> Dict:
         "paper_id": paper_id,
         "metadata": metadata,
         "has_pdf_text": pdf_text is not None,
-        "pdf_text": pdf_text if pdf_text else "No text could be extracted from the PDF"
+        "pdf_text": pdf_text if pdf_text else (
+            "No text could be extracted from the PDF" if PDF_PARSER_AVAILABLE else NO_BACKEND_MESSAGE
+        ),
+        "pages": pages
     }
     
-    return result
\ No newline at end of file
+    return result
+
+
+def get_relevant_chunks(paper_id: str, question: str, limit: int = 3,
+                        sections: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Get the passages of a paper most relevant to a question.
+    
+    The text of the paper is extracted and split into section-aware chunks
+    once; later questions only rank the stored chunks with BM25, so a few
+    passages of a few hundred tokens are returned instead of the whole paper.
+    
+    Parameters:
+        paper_id (str): The paper ID
+        question (str): The question or search words
+        limit (int): Maximum number of passages to return
+        sections (iterable, optional): Sections to search, e.g. 'method' or 'results' (defaults to all)
+        
+    Returns:
+        dict: Dictionary with the passages ('section', 'heading', 'page', 'start', 'end',
+              'tokens', 'score' and 'text' of each, best first) and the number of chunks of the paper
+    """
+    from arxiv_tool.database import get_paper_details, index_paper_texts
+    
+    paper_details = get_paper_details(paper_id)
+    if not paper_details:
+        return {
+            "success": False,
+            "error": f"Paper with ID {paper_id} not found in database"
+        }
+    
+    pdf_path = find_paper_pdf(paper_id, paper_details['directory'], paper_details.get('id_number'),
+                              paper_details.get('version'))
+    if not pdf_path:
+        return {"success": False, "error": f"No PDF found for paper {paper_id}"}
+    if not PDF_PARSER_AVAILABLE:
+        return {"success": False, "error": NO_BACKEND_MESSAGE}
+    
+    pdf_text, extracted = get_pdf_text(pdf_path)
+    if pdf_text is None:
+        return {"success": False, "error": f"No text could be extracted from the PDF of paper {paper_id}"}
+    if extracted:
+        index_paper_texts([(paper_id, None, pdf_text.text)])
+    
+    chunks = get_text_chunks(pdf_text)
+    passages = [
+        {
+            "section": chunk.section,
+            "heading": chunk.heading,
+            "page": chunk.page,
+            "start": chunk.start,
+            "end": chunk.end,
+            "tokens": chunk.tokens,
+            "score": score,
+            "text": pdf_text.text[chunk.start:chunk.end]
+        }
+        for chunk, score in rank_chunks(pdf_text.text, chunks, question, limit, sections)
+    ]
+    
+    return {
+        "success": True,
+        "paper_id": paper_id,
+        "title": paper_details.get('title'),
+        "question": question,
+        "total_chunks": len(chunks),
+        "chunks": passages
+    }
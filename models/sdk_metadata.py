@@ -62,6 +62,8 @@ def read_metadata_files(paper_id: str, directory: str) -> Dict[str, Any]:
     """
     Read metadata files from the paper directory.
     
+    Only used for papers whose metadata is not stored in the database yet.
+    
     Parameters:
         paper_id (str): The paper ID
         directory (str): The paper directory
@@ -133,6 +135,11 @@ def arxiv_search_to_sdk(query: str, xml_response: str, results: List[Dict[str, A
         print("Warning: Pydantic not available. SDK metadata conversion disabled.")
         return None
     
+    from arxiv_tool.database import get_paper_metadata
+    
+    # Look up the stored metadata of all the papers with one query
+    stored_metadata = get_paper_metadata(result.get('paper_id', '') for result in results if result.get('success', False))
+    
     papers = []
     
     for result in results:
@@ -148,16 +155,21 @@ def arxiv_search_to_sdk(query: str, xml_response: str, results: List[Dict[str, A
             'title': result.get('title', ''),
             'authors': result.get('authors', ''),
             'summary': result.get('summary', None),
-            'categories': [result.get('category', '')] if result.get('category') else None,
+            'categories': result.get('categories') or ([result['category']] if result.get('category') else None),
             'primary_category': result.get('primary_category', None),
             'pdf_url': result.get('pdf_url', None),
             'published': result.get('published', None),
             'local_directory': directory
         }
         
-        # Then read metadata from files to fill in any missing values
-        if directory:
-            metadata = read_metadata_files(paper_id, directory)
+        # Then fill in any missing values from the stored metadata
+        # (results built from a parsed PaperRecord already carry them all)
+        if directory and not all(paper_data.get(key) for key in ('summary', 'primary_category', 'pdf_url', 'published')):
+            metadata = stored_metadata.get(paper_id)
+            if metadata is None:
+                metadata = read_metadata_files(paper_id, directory)
+            else:
+                metadata = dict(metadata, authors=', '.join(metadata['authors']))
             
             # Update paper data with metadata
             for key, value in metadata.items():
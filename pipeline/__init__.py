@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Pipeline package for the arXiv Paper Manager.
+
+This package provides a staged, multi-threaded processing engine and the
+paper download pipeline built on it, and a process pool for extracting
+the text of PDFs.
+"""
+
+from .engine import Stage, Pipeline
+from .paper_pipeline import (
+    PaperPipeline, download_paper_pdf, save_paper_metadata, record_paper_result,
+    paper_result_fields, paper_db_record
+)
+from .text_extraction import TextExtractor, extract_page_range, extract_texts
+
+__all__ = [
+    'Stage', 'Pipeline',
+    'PaperPipeline', 'download_paper_pdf', 'save_paper_metadata', 'record_paper_result',
+    'paper_result_fields', 'paper_db_record',
+    'TextExtractor', 'extract_page_range', 'extract_texts'
+]
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Pipeline engine module for the arXiv Paper Manager.
+
+This module provides a small staged processing engine:
+- Each stage runs a function on a configurable number of worker threads
+- Stages are joined by bounded queues, so a slow stage applies
+  backpressure to the stages feeding it
+- The source iterable is consumed on its own thread, so producing items
+  (e.g. rate-limited API calls) overlaps with the work of later stages
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Iterable, List, Optional
+
+from arxiv_tool.config import PIPELINE_QUEUE_SIZE
+
+
+# Marks the end of the item stream on a queue
+_DONE = object()
+
+
+class Stage:
+    """
+    A pipeline stage: a function applied to every item by a pool of workers.
+
+    The function returns the item to pass on to the next stage, or None to
+    drop it. Exceptions are recorded on the pipeline and the item is dropped.
+
+    With a batch_size above 1, the function is called with a list of the
+    items waiting in the queue (at most batch_size, without waiting for more)
+    and returns the list of items to pass on. This lets a stage group work,
+    such as database writes, without delaying items when the queue is idle.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1,
+                 queue_size: int = PIPELINE_QUEUE_SIZE, batch_size: int = 1):
+        """
+        Initialize the stage.
+
+        Parameters:
+            name (str): Name of the stage, used in error reports
+            func (callable): Function applied to each item (or each batch of items)
+            workers (int): Number of worker threads for this stage
+            queue_size (int): Capacity of the queue feeding this stage
+            batch_size (int): Maximum number of items passed to the function at once
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+
+
+class Pipeline:
+    """
+    Run items from a source through a sequence of stages.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        """
+        Initialize the pipeline.
+
+        Parameters:
+            stages (list): The stages, in processing order
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.errors = []
+        self._lock = threading.Lock()
+
+    def _record_error(self, stage: Stage, item: Any, error: BaseException) -> None:
+        with self._lock:
+            self.errors.append((stage.name, item, error))
+        print(f"✗ Error in {stage.name} stage: {error}")
+
+    def run(self, source: Iterable[Any], on_result: Optional[Callable[[Any], None]] = None) -> List[Any]:
+        """
+        Process every item of the source through all stages.
+
+        Parameters:
+            source (iterable): The items to process (consumed lazily on a separate thread)
+            on_result (callable, optional): Called with each item leaving the last stage;
+                                            its exceptions are recorded as errors of that stage
+
+        Returns:
+            list: The items that came out of the last stage, in completion order
+        """
+        queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        results = []
+        stop = threading.Event()
+        remaining = [stage.workers for stage in self.stages]
+
+        def put(q: queue.Queue, item: Any) -> None:
+            # Block while the queue is full, but give up if the run is aborted
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def produce() -> None:
+            try:
+                for item in source:
+                    if stop.is_set():
+                        break
+                    put(queues[0], item)
+            except Exception as e:
+                self._record_error(Stage('source', None), None, e)
+            finally:
+                for _ in range(self.stages[0].workers):
+                    put(queues[0], _DONE)
+
+        def emit(index: int, output: Any) -> None:
+            if index == len(self.stages) - 1:
+                with self._lock:
+                    results.append(output)
+                if on_result is not None:
+                    # A failing callback must not kill the worker, or the run never ends
+                    try:
+                        on_result(output)
+                    except Exception as e:
+                        self._record_error(self.stages[index], output, e)
+            else:
+                put(queues[index + 1], output)
+
+        def take(index: int) -> List[Any]:
+            # Wait for one item, then add whatever else is already queued
+            stage = self.stages[index]
+            items = [queues[index].get()]
+            while len(items) < stage.batch_size and items[-1] is not _DONE:
+                try:
+                    items.append(queues[index].get_nowait())
+                except queue.Empty:
+                    break
+            return items
+
+        def work(index: int) -> None:
+            stage = self.stages[index]
+            is_last = index == len(self.stages) - 1
+            done = False
+            while not done:
+                items = take(index)
+                if items[-1] is _DONE:
+                    items.pop()
+                    done = True
+                if stop.is_set() or not items:
+                    continue
+
+                if stage.batch_size > 1:
+                    try:
+                        outputs = stage.func(items) or []
+                    except Exception as e:
+                        for item in items:
+                            self._record_error(stage, item, e)
+                        continue
+                else:
+                    try:
+                        outputs = [stage.func(items[0])]
+                    except Exception as e:
+                        self._record_error(stage, items[0], e)
+                        continue
+
+                for output in outputs:
+                    if output is not None:
+                        emit(index, output)
+
+            # The last worker of a stage to finish closes the next stage's queue
+            with self._lock:
+                remaining[index] -= 1
+                last_worker = remaining[index] == 0
+            if last_worker and not is_last:
+                for _ in range(self.stages[index + 1].workers):
+                    put(queues[index + 1], _DONE)
+
+        threads = [threading.Thread(target=produce, name='pipeline-source', daemon=True)]
+        for index, stage in enumerate(self.stages):
+            for number in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=work, args=(index,), name=f"pipeline-{stage.name}-{number}", daemon=True
+                ))
+
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            # Stop feeding new items and let the workers drain their queues
+            stop.set()
+            for q in queues:
+                for _ in range(len(threads)):
+                    try:
+                        q.put_nowait(_DONE)
+                    except queue.Full:
+                        break
+            raise
+
+        return results
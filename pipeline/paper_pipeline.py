@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Paper download pipeline module for the arXiv Paper Manager.
+
+This module provides the steps needed to store a paper and a pipeline that
+runs them concurrently:
+
+    resolved records -> existence check (batched) -> PDF downloaders (pool)
+                     -> [metadata file export] -> DB writer (batched)
+
+The PDF host is not limited like the query API, so while the source is
+waiting on rate-limited API calls, PDFs of already resolved papers keep
+downloading. All database writes happen on a single writer thread, which
+records the papers that are ready, with their metadata, in one transaction.
+"""
+
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from arxiv_tool.config import (
+    DB_BULK_CHUNK_SIZE, METADATA_FILE_EXPORT, PDF_SUBDIR, PIPELINE_DOWNLOAD_WORKERS, PIPELINE_QUEUE_SIZE
+)
+from arxiv_tool.api import PaperRecord, download_arxiv_pdf
+from arxiv_tool.database import papers_exist, record_papers_bulk
+from arxiv_tool.models import extract_and_save_metadata, metadata_from_record
+from .engine import Stage, Pipeline
+
+
+def download_paper_pdf(paper: PaperRecord) -> Tuple[bool, Optional[str]]:
+    """
+    Download the PDF of a paper into its pdf subdirectory.
+
+    Parameters:
+        paper (PaperRecord): The paper to download
+
+    Returns:
+        tuple: (whether the PDF was downloaded, path to the PDF or None)
+    """
+    if not paper.pdf_url:
+        print(f"✗ No PDF URL found for paper {paper.paper_id}")
+        return False, None
+
+    pdf_dir = os.path.join(paper.safe_paper_id, PDF_SUBDIR)
+    os.makedirs(pdf_dir, exist_ok=True)
+
+    try:
+        pdf_path = download_arxiv_pdf(paper.pdf_url, directory=pdf_dir)
+        print(f"✓ PDF downloaded to: {pdf_path}")
+        return True, pdf_path
+    except Exception as e:
+        print(f"✗ Error downloading PDF for {paper.paper_id}: {e}")
+        return False, None
+
+
+def save_paper_metadata(paper: PaperRecord) -> bool:
+    """
+    Export the metadata files of a paper (the database holds the metadata itself).
+
+    Parameters:
+        paper (PaperRecord): The paper whose metadata is saved
+
+    Returns:
+        bool: True if the metadata was saved
+    """
+    try:
+        metadata_result = extract_and_save_metadata(paper)
+        if metadata_result['success']:
+            print(f"✓ Metadata extracted successfully")
+            return True
+        print(f"✗ Error extracting metadata: {metadata_result.get('error', 'Unknown error')}")
+    except Exception as e:
+        print(f"✗ Error extracting metadata: {e}")
+    return False
+
+
+def paper_db_record(paper: PaperRecord, has_metadata: bool, has_pdf: bool,
+                    pdf_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Build the database record of a processed paper for record_papers_bulk().
+
+    The record carries the paper's metadata, stored in the same transaction.
+
+    Parameters:
+        paper (PaperRecord): The processed paper
+        has_metadata (bool): Whether the metadata is stored with the record
+        has_pdf (bool): Whether the PDF was downloaded
+        pdf_bytes (int, optional): Size of the downloaded PDF
+
+    Returns:
+        dict: The paper record
+    """
+    return {
+        'paper_id': paper.paper_id,
+        'title': paper.title,
+        'authors': paper.authors_str,
+        'directory': paper.safe_paper_id,
+        'has_metadata': has_metadata,
+        'has_pdf': has_pdf,
+        'category': paper.primary_category,
+        'pdf_bytes': pdf_bytes,
+        'metadata': metadata_from_record(paper) if has_metadata else None
+    }
+
+
+def record_paper_result(paper: PaperRecord, has_metadata: bool, has_pdf: bool) -> bool:
+    """
+    Record a processed paper in the database with its final status.
+
+    Parameters:
+        paper (PaperRecord): The processed paper
+        has_metadata (bool): Whether to store the paper's metadata
+        has_pdf (bool): Whether the PDF was downloaded
+
+    Returns:
+        bool: True if the record was written
+    """
+    return record_papers_bulk([paper_db_record(paper, has_metadata, has_pdf)]) == 1
+
+
+def paper_result_fields(paper: PaperRecord) -> Dict[str, Any]:
+    """
+    Build the paper fields shared by every processing result.
+
+    Carrying the parsed values in the result lets the SDK output use them
+    directly instead of looking them up again.
+    """
+    return {
+        'paper_id': paper.paper_id,
+        'safe_paper_id': paper.safe_paper_id,
+        'title': paper.title,
+        'authors': paper.authors_str,
+        'summary': paper.summary,
+        'published': paper.published,
+        'primary_category': paper.primary_category,
+        'categories': list(paper.categories),
+        'pdf_url': paper.pdf_url
+    }
+
+
+class PaperPipeline:
+    """
+    Download papers concurrently through bounded, staged queues.
+
+    Each item travels as a result dictionary (the same shape that
+    process_paper() returns) with the PaperRecord attached under '_record'
+    until the DB writer removes it.
+    """
+
+    def __init__(self, download_workers: int = PIPELINE_DOWNLOAD_WORKERS, metadata_workers: int = 1,
+                 queue_size: int = PIPELINE_QUEUE_SIZE, metadata_files: bool = METADATA_FILE_EXPORT):
+        """
+        Initialize the pipeline.
+
+        Parameters:
+            download_workers (int): Number of concurrent PDF downloads
+            metadata_workers (int): Number of metadata file writer threads
+            queue_size (int): Capacity of each queue between stages
+            metadata_files (bool): Whether to also export the metadata files of each paper
+        """
+        stages = [
+            Stage('check', self._check_existing, workers=1, queue_size=queue_size, batch_size=DB_BULK_CHUNK_SIZE),
+            Stage('download', self._download, workers=download_workers, queue_size=queue_size)
+        ]
+        if metadata_files:
+            stages.append(Stage('metadata', self._write_metadata, workers=metadata_workers, queue_size=queue_size))
+        stages.append(Stage('database', self._write_database, workers=1, queue_size=queue_size,
+                            batch_size=DB_BULK_CHUNK_SIZE))
+        self.pipeline = Pipeline(stages)
+
+    @property
+    def errors(self) -> List[Tuple[str, Any, BaseException]]:
+        """Errors raised by the stages, as (stage name, item, exception)."""
+        return self.pipeline.errors
+
+    def _check_existing(self, papers: List[PaperRecord]) -> List[Dict[str, Any]]:
+        # The papers that queued up are looked up with one query and one scan
+        exists = papers_exist(paper.paper_id for paper in papers)
+        results = []
+        for paper in papers:
+            result = paper_result_fields(paper)
+            result['_record'] = paper
+            if exists[paper.paper_id]:
+                result.update({
+                    'success': True,
+                    'status': 'already_exists',
+                    'message': f"Paper '{paper.title}' ({paper.paper_id}) has already been downloaded to {paper.safe_paper_id}/ directory."
+                })
+            results.append(result)
+        return results
+
+    def _download(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if result.get('status') == 'already_exists':
+            return result
+
+        paper = result['_record']
+        print(f"Downloading paper: {paper.paper_id} - {paper.title}")
+        pdf_status, pdf_path = download_paper_pdf(paper)
+        # The metadata is stored with the database record
+        result.update({'success': True, 'metadata_status': True, 'pdf_status': pdf_status})
+        if pdf_path:
+            result['pdf_path'] = pdf_path
+            result['pdf_bytes'] = os.path.getsize(pdf_path)
+        return result
+
+    def _write_metadata(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if result.get('status') != 'already_exists':
+            save_paper_metadata(result['_record'])
+        return result
+
+    def _write_database(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Papers finished while the previous write was running are written together
+        records = []
+        recorded = []
+        for result in results:
+            paper = result.pop('_record')
+            if result.get('status') != 'already_exists':
+                records.append(paper_db_record(paper, result['metadata_status'], result['pdf_status'],
+                                               result.get('pdf_bytes')))
+                recorded.append(result)
+
+        if records:
+            # One transaction, so the papers are either all written or none is
+            written = record_papers_bulk(records, chunk_size=len(records))
+            for record, result in zip(records, recorded):
+                if written == len(records):
+                    print(f"✓ Paper processed: {record['paper_id']}")
+                else:
+                    print(f"✗ Failed to record paper: {record['paper_id']}")
+                    result.update({'success': False, 'error': 'Failed to record the paper in the database'})
+        return results
+
+    def run(self, papers: Iterable[PaperRecord],
+            on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Process papers through the pipeline.
+
+        Parameters:
+            papers (iterable): Records to process; may be a generator that resolves them lazily
+            on_result (callable, optional): Called with each paper's result as it completes
+
+        Returns:
+            list: One result dictionary per paper that completed, in completion order
+        """
+        return self.pipeline.run(papers, on_result=on_result)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Parallel PDF text extraction module for the arXiv Paper Manager.
+
+pypdf and pdfminer are pure Python, so extraction threads would share a
+single core. TextExtractor spreads the work over a pool of processes instead:
+
+    (paper ID, PDF path) -> cache check -> page ranges (process pool)
+                         -> assembly (parent) -> text cache
+
+Each task extracts a range of pages of one PDF. The first task of a PDF
+also reports its page count, and the pages of a long PDF that remain are
+split into more tasks, so a single large thesis keeps several processes
+busy. Only the parent process writes to the database, and PDFs whose text
+is cached are skipped, so an interrupted run resumes where it stopped. A
+task whose worker process dies counts its PDF as failed, and the pool is
+started again for the PDFs that remain.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from arxiv_tool.config import TEXT_EXTRACTION_JOBS, TEXT_EXTRACTION_SPLIT_PAGES
+from arxiv_tool.database import Library, PdfText, get_cached_text, store_cached_text
+from arxiv_tool.models.pdf_backends import extract_with_fallback, get_backend_order
+
+
+def extract_page_range(pdf_path: str, first_page: int, last_page: int,
+                       backends: List[str]) -> Tuple[Optional[List[str]], int, Optional[str]]:
+    """
+    Extract the text of a range of pages of a PDF (run in a worker process).
+
+    The backends are tried in order, each with the configured time limit.
+
+    Parameters:
+        pdf_path (str): Path to the PDF file
+        first_page (int): First page to extract, counted from 1
+        last_page (int): Last page to extract, included
+        backends (list): Names of the backends to try
+
+    Returns:
+        tuple: (the text of each page or None if every backend failed,
+                number of pages of the PDF if first_page is 1, the backend used)
+    """
+    pages, backend, _, page_count = extract_with_fallback(pdf_path, first_page, last_page, backends=backends,
+                                                          with_count=first_page == 1)
+    return pages, page_count or 0, backend
+
+
+class TextExtractor:
+    """
+    Extract the text of many PDFs on a pool of processes and cache it.
+
+    The counts of the last run are kept in the counts attribute: 'cached'
+    (skipped), 'extracted', 'failed' and 'pages' (extracted).
+    """
+
+    def __init__(self, jobs: int = TEXT_EXTRACTION_JOBS, split_pages: int = TEXT_EXTRACTION_SPLIT_PAGES,
+                 library: Optional[Library] = None):
+        """
+        Initialize the extractor.
+
+        Parameters:
+            jobs (int): Number of worker processes (0 for one per CPU)
+            split_pages (int): Pages per task; longer PDFs are split across processes
+            library (Library, optional): The library session to use (defaults to the shared one)
+        """
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        self.split_pages = max(1, split_pages)
+        self.library = library
+        self.counts = {'cached': 0, 'extracted': 0, 'failed': 0, 'pages': 0}
+
+    def _page_ranges(self, first_page: int, page_count: int) -> List[Tuple[int, int]]:
+        return [(first, min(first + self.split_pages - 1, page_count))
+                for first in range(first_page, page_count + 1, self.split_pages)]
+
+    def run(self, pdfs: Iterable[Tuple[str, str]],
+            on_result: Optional[Callable[[str, Optional[PdfText]], None]] = None) -> Dict[str, int]:
+        """
+        Extract and cache the text of PDFs.
+
+        Parameters:
+            pdfs (iterable): (key, PDF path) pairs, e.g. paper IDs and their PDFs; may be a generator
+            on_result (callable, optional): Called with the key and text (None if extraction failed)
+                                            of each PDF extracted by this run, in completion order
+
+        Returns:
+            dict: The counts of the run
+        """
+        self.counts = {'cached': 0, 'extracted': 0, 'failed': 0, 'pages': 0}
+        backends = get_backend_order(self.library)
+        source = iter(pdfs)
+        # future -> (key, PDF path, first page, pool); key -> {first page: texts} and the tasks it waits for
+        tasks: Dict[Future, Tuple[str, str, int, ProcessPoolExecutor]] = {}
+        parts: Dict[str, Dict[str, Any]] = {}
+
+        def finish(key: str, pdf_path: str, pages: Optional[List[str]]) -> None:
+            pdf_text = None
+            if pages is None:
+                self.counts['failed'] += 1
+            else:
+                pdf_text = store_cached_text(pdf_path, pages, library=self.library)
+                self.counts['extracted'] += 1
+                self.counts['pages'] += len(pages)
+            if on_result:
+                on_result(key, pdf_text)
+
+        pool = ProcessPoolExecutor(max_workers=self.jobs)
+        pool_broken = False
+
+        def restart_pool() -> None:
+            # A dead worker process breaks the whole pool: the tasks it held fail,
+            # and the tasks still to come run on a new pool
+            nonlocal pool, pool_broken
+            pool.shutdown(wait=False)
+            pool = ProcessPoolExecutor(max_workers=self.jobs)
+            pool_broken = False
+
+        def submit(key: str, pdf_path: str, first: int, last: int, order: List[str]) -> None:
+            if pool_broken:
+                restart_pool()
+            try:
+                future = pool.submit(extract_page_range, pdf_path, first, last, order)
+            except BrokenProcessPool:
+                # The pool broke before one of its failed tasks was collected
+                restart_pool()
+                future = pool.submit(extract_page_range, pdf_path, first, last, order)
+            tasks[future] = (key, pdf_path, first, pool)
+
+        def submit_next() -> bool:
+            # Start the next PDF whose text is not cached yet
+            for key, pdf_path in source:
+                if get_cached_text(pdf_path, library=self.library) is not None:
+                    self.counts['cached'] += 1
+                    continue
+                submit(key, pdf_path, 1, self.split_pages, backends)
+                return True
+            return False
+
+        try:
+            # Keep every process busy, with a task waiting for each
+            while len(tasks) < 2 * self.jobs and submit_next():
+                pass
+
+            while tasks:
+                done, _ = wait(tasks, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, pdf_path, first_page, task_pool = tasks.pop(future)
+                    try:
+                        texts, page_count, backend = future.result()
+                    except Exception as e:
+                        # The worker died or its result could not be unpickled
+                        print(f"Error extracting text from PDF {pdf_path}: {e}")
+                        texts, page_count, backend = None, 0, None
+                        if isinstance(e, BrokenProcessPool) and task_pool is pool:
+                            pool_broken = True
+                    part = parts.get(key)
+
+                    if first_page == 1:
+                        if texts is None:
+                            finish(key, pdf_path, None)
+                            continue
+                        ranges = self._page_ranges(self.split_pages + 1, page_count)
+                        if not ranges:
+                            finish(key, pdf_path, texts)
+                            continue
+                        part = parts[key] = {'texts': {1: texts}, 'waiting': len(ranges), 'failed': False}
+                        # The rest of the PDF is extracted by the backend that read its first pages
+                        order = [backend] + [name for name in backends if name != backend]
+                        for first, last in ranges:
+                            submit(key, pdf_path, first, last, order)
+                        continue
+
+                    part['waiting'] -= 1
+                    if texts is None:
+                        part['failed'] = True
+                    else:
+                        part['texts'][first_page] = texts
+                    if not part['waiting']:
+                        del parts[key]
+                        pages = None
+                        if not part['failed']:
+                            pages = [text for first in sorted(part['texts']) for text in part['texts'][first]]
+                        finish(key, pdf_path, pages)
+
+                while len(tasks) < 2 * self.jobs and submit_next():
+                    pass
+        finally:
+            pool.shutdown()
+
+        return self.counts
+
+
+def extract_texts(pdfs: Iterable[Tuple[str, str]], jobs: int = TEXT_EXTRACTION_JOBS,
+                  split_pages: int = TEXT_EXTRACTION_SPLIT_PAGES, progress_every: float = 5.0,
+                  on_result: Optional[Callable[[str, Optional[PdfText]], None]] = None,
+                  library: Optional[Library] = None) -> Dict[str, Any]:
+    """
+    Extract and cache the text of PDFs in parallel, reporting progress.
+
+    Parameters:
+        pdfs (iterable): (key, PDF path) pairs
+        jobs (int): Number of worker processes (0 for one per CPU)
+        split_pages (int): Pages per task; longer PDFs are split across processes
+        progress_every (float): Seconds between progress lines (0 for none)
+        on_result (callable, optional): Called with the key and text of each PDF extracted
+        library (Library, optional): The library session to use (defaults to the shared one)
+
+    Returns:
+        dict: The counts of TextExtractor, plus 'jobs' and 'seconds'
+    """
+    extractor = TextExtractor(jobs, split_pages, library=library)
+    started = time.monotonic()
+    reported = started
+
+    def report(key: str, pdf_text: Optional[PdfText]) -> None:
+        nonlocal reported
+        if on_result:
+            on_result(key, pdf_text)
+        now = time.monotonic()
+        if progress_every and now - reported >= progress_every:
+            reported = now
+            counts = extractor.counts
+            print(f"Extracted {counts['extracted']} PDFs ({counts['pages']} pages, "
+                  f"{counts['pages'] / (now - started):.1f} pages/s), {counts['cached']} already cached, "
+                  f"{counts['failed']} failed")
+
+    counts = dict(extractor.run(pdfs, on_result=report))
+    counts['jobs'] = extractor.jobs
+    counts['seconds'] = round(time.monotonic() - started, 2)
+    return counts
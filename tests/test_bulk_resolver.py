@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for bulk id_list resolution of arXiv IDs.
+"""
+
+import os
+import sys
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.api import bulk_resolver
+from arxiv_tool.api import BulkResolver, ChunkSizeTuner, normalize_requested_id
+
+
+def make_feed(paper_ids):
+    entries = "".join(
+        f"<entry><id>http://arxiv.org/abs/{paper_id}</id><title>Paper {paper_id}</title></entry>"
+        for paper_id in paper_ids
+    )
+    return f'<feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'
+
+
+ERROR_FEED = ('<feed xmlns="http://www.w3.org/2005/Atom"><entry>'
+              '<id>http://arxiv.org/api/errors#incorrect_id_format_for_bogus</id>'
+              '<title>Error</title></entry></feed>')
+
+# What the fake API knows: unversioned IDs resolve to the latest version
+LATEST = {'1706.03762': '1706.03762v7', '1512.03385': '1512.03385v1', 'hep-th/9901001': 'hep-th/9901001v3'}
+
+
+def fake_search(calls):
+    def search_with_retry(search_query, max_results=10, client=None, id_list=None):
+        calls.append(list(id_list))
+        if 'bogus' in id_list:
+            return ERROR_FEED
+        found = []
+        for paper_id in id_list:
+            if paper_id in LATEST:
+                found.append(LATEST[paper_id])
+            elif paper_id in LATEST.values():
+                found.append(paper_id)
+        return make_feed(found)
+    return search_with_retry
+
+
+def test_resolves_in_chunks_and_reports_missing(monkeypatch):
+    """IDs are resolved with one request per chunk and missing IDs are reported."""
+    calls = []
+    monkeypatch.setattr(bulk_resolver, 'search_with_retry', fake_search(calls))
+
+    resolver = BulkResolver(chunk_size=10, auto_tune=False)
+    result = resolver.resolve(['arXiv:1706.03762', '1512.03385v1', 'hep-th/9901001', '2101.99999', '1706.03762'])
+
+    assert len(calls) == 1
+    assert result.records['1706.03762'].paper_id == '1706.03762v7'
+    assert result.records['1512.03385v1'].paper_id == '1512.03385v1'
+    assert result.records['hep-th/9901001'].paper_id == 'hep-th/9901001v3'
+    assert result.not_found == ['2101.99999']
+    assert result.failed == []
+
+
+def test_malformed_id_is_isolated(monkeypatch):
+    """A malformed ID does not prevent the rest of its chunk from resolving."""
+    calls = []
+    monkeypatch.setattr(bulk_resolver, 'search_with_retry', fake_search(calls))
+
+    resolver = BulkResolver(chunk_size=10, auto_tune=False)
+    result = resolver.resolve(['1706.03762', 'bogus', '1512.03385'])
+
+    assert set(result.records) == {'1706.03762', '1512.03385'}
+    assert result.not_found == ['bogus']
+
+
+def test_error_urls_in_abstracts_are_not_errors(monkeypatch):
+    """Only an entry whose ID is an /api/errors URL makes the chunk split."""
+    calls = []
+
+    def search_with_retry(search_query, max_results=10, client=None, id_list=None):
+        calls.append(list(id_list))
+        return make_feed(LATEST[paper_id] for paper_id in id_list).replace(
+            '</title>', '</title><summary>See http://arxiv.org/api/errors for error codes.</summary>')
+    monkeypatch.setattr(bulk_resolver, 'search_with_retry', search_with_retry)
+
+    result = BulkResolver(chunk_size=10, auto_tune=False).resolve(['1706.03762', '1512.03385'])
+    assert len(calls) == 1
+    assert set(result.records) == {'1706.03762', '1512.03385'}
+
+
+def test_chunk_size_tuner():
+    """The chunk size grows on fast responses and shrinks on slow or failed ones."""
+    tuner = ChunkSizeTuner(initial=100, minimum=10, maximum=200, target_seconds=10)
+
+    assert tuner.record(1.0) == 150
+    assert tuner.record(1.0) == 200
+    assert tuner.record(7.0) == 200
+    assert tuner.record(12.0) == 100
+    assert tuner.record(1.0, success=False) == 50
+
+
+def test_normalize_requested_id():
+    assert normalize_requested_id(' arXiv:1706.03762v5 ') == '1706.03762v5'
+    assert normalize_requested_id('https://arxiv.org/abs/cond-mat/0102536v1') == 'cond-mat/0102536v1'
+    assert normalize_requested_id('https://arxiv.org/pdf/1706.03762.pdf') == '1706.03762'
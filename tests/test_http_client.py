@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled keep-alive HTTP client, run against a local HTTP server.
+"""
+
+import gzip
+import os
+import sys
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.api import ArxivHttpClient
+
+
+BODY = b"<feed>" + b"x" * 10000 + b"</feed>"
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        Handler.connections.add(self.client_address)
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/feed')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path != '/feed':
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = BODY
+        self.send_response(200)
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    Handler.connections = set()
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_keep_alive_reuses_connection(server):
+    """Sequential requests to one host share a single TCP connection."""
+    client = ArxivHttpClient()
+    for _ in range(3):
+        with client.get(f"{server}/feed") as response:
+            assert response.read() == BODY
+    client.close()
+
+    assert len(Handler.connections) == 1
+
+
+def test_gzip_and_identity(server):
+    """Compressed responses are decoded transparently."""
+    client = ArxivHttpClient()
+    with client.get(f"{server}/feed") as response:
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.read() == BODY
+    with client.get(f"{server}/feed", accept_gzip=False) as response:
+        assert response.headers.get('Content-Encoding') is None
+        assert response.read() == BODY
+    client.close()
+
+
+def test_redirect_and_errors(server):
+    """Redirects are followed and error statuses raise urllib errors."""
+    client = ArxivHttpClient()
+    with client.get(f"{server}/redirect") as response:
+        assert response.url == f"{server}/feed"
+        assert response.read() == BODY
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        client.get(f"{server}/missing")
+    assert excinfo.value.code == 404
+    client.close()
+
+
+class StaleConnection:
+    """A pooled connection the server has closed since it was last used."""
+    closed = 0
+
+    def request(self, *args, **kwargs):
+        raise ConnectionResetError("connection reset by peer")
+
+    def close(self):
+        StaleConnection.closed += 1
+
+
+def test_stale_connection_is_retried_once_on_a_fresh_one(server):
+    """A request on a dropped keep-alive connection is sent again on a new connection, not another pooled one."""
+    client = ArxivHttpClient()
+    host, port = server.rsplit('/', 1)[1].split(':')
+    pool = client._pool(('http', host, int(port)))
+    StaleConnection.closed = 0
+    for _ in range(3):
+        pool.put(StaleConnection())
+
+    with client.get(f"{server}/feed") as response:
+        assert response.read() == BODY
+    assert StaleConnection.closed == 1
+    assert len(Handler.connections) == 1
+    client.close()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent batch job queue.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.database import job_queue, library
+from arxiv_tool.database import (
+    initialize_db, close_libraries, record_paper_download, enqueue_jobs, lease_jobs, update_jobs,
+    retry_jobs, next_retry_time, reclaim_stale_jobs, reset_failed_jobs, get_job_counts
+)
+
+
+@pytest.fixture(autouse=True)
+def papers_db(tmp_path, monkeypatch):
+    db_file = str(tmp_path / 'papers.db')
+    monkeypatch.setattr(library, 'DB_FILE', db_file)
+    initialize_db()
+    yield db_file
+    close_libraries()
+
+
+def test_lease_order_follows_priority():
+    """Higher priority jobs are leased first, then jobs in the order they were queued."""
+    enqueue_jobs(['a', 'b', 'c'])
+    enqueue_jobs(['d'], priority=5)
+    enqueue_jobs(['c'], priority=1)
+
+    assert lease_jobs(2) == ['d', 'c']
+    assert lease_jobs(10) == ['a', 'b']
+    assert lease_jobs(10) == []
+    assert get_job_counts()['resolving'] == 4
+
+
+def test_existing_papers_are_done():
+    """IDs of fully downloaded papers don't become pending jobs."""
+    record_paper_download('1706.03762v7', directory='1706.03762v7', has_metadata=True, has_pdf=True)
+
+    queued = enqueue_jobs(['1706.03762v7', '1512.03385v1'])
+
+    assert queued == {'queued': 1, 'done': 1}
+    assert lease_jobs(10) == ['1512.03385v1']
+
+
+def test_done_jobs_of_incomplete_papers_are_requeued():
+    """A done job is queued again if its paper has lost its PDF since."""
+    enqueue_jobs(['1706.03762'])
+    assert lease_jobs(1) == ['1706.03762']
+    record_paper_download('1706.03762v7', directory='1706.03762v7', has_metadata=True, has_pdf=True)
+    update_jobs(['1706.03762'], 'done', paper_id='1706.03762v7')
+    assert enqueue_jobs(['1706.03762']) == {'queued': 0, 'done': 1}
+
+    record_paper_download('1706.03762v7', directory='1706.03762v7', has_metadata=True, has_pdf=False)
+    assert enqueue_jobs(['1706.03762']) == {'queued': 1, 'done': 0}
+    assert lease_jobs(1) == ['1706.03762']
+
+
+def test_retry_until_max_attempts():
+    """Failed attempts go back to pending until the attempts run out."""
+    enqueue_jobs(['a'])
+
+    assert lease_jobs(1) == ['a']
+    assert retry_jobs(['a'], 'timeout', max_attempts=2, retry_delay=0) == {'pending': 1, 'failed': 0}
+    assert lease_jobs(1) == ['a']
+    assert retry_jobs(['a'], 'timeout', max_attempts=2, retry_delay=0) == {'pending': 0, 'failed': 1}
+    assert lease_jobs(1) == []
+
+    # Failed jobs can be queued again explicitly
+    assert reset_failed_jobs() == 1
+    assert lease_jobs(1) == ['a']
+
+
+def test_retries_wait_longer_after_each_attempt():
+    """A job put back to pending is not leased again before its retry delay has passed."""
+    enqueue_jobs(['a', 'b'])
+    assert lease_jobs(1) == ['a']
+    before = job_queue.time.time()
+    assert retry_jobs(['a'], 'timeout', retry_delay=60) == {'pending': 1, 'failed': 0}
+
+    # The other job is leased while the failed one waits
+    assert lease_jobs(10) == ['b']
+    assert next_retry_time() >= before + 120
+    update_jobs(['b'], 'done')
+
+    assert reclaim_stale_jobs() == 0
+    assert lease_jobs(10) == []
+    assert next_retry_time() >= before + 120
+
+
+def test_leases_of_dead_processes_are_reclaimed():
+    """Jobs leased by a process that is gone become pending again; live leases are kept."""
+    enqueue_jobs(['a', 'b', 'c'])
+    lease_jobs(1, owner=f"{job_queue.socket.gethostname()}:999999999")
+    lease_jobs(1)
+    update_jobs(['b'], 'downloading', paper_id='bv1')
+
+    assert reclaim_stale_jobs() == 1
+    assert get_job_counts()['pending'] == 2
+    assert get_job_counts()['downloading'] == 1
+
+
+def test_batches_are_separate():
+    """Leasing for one batch leaves the jobs of other batches alone."""
+    enqueue_jobs(['a'], batch='one')
+    enqueue_jobs(['b'], batch='two')
+
+    assert lease_jobs(10, batch='two') == ['b']
+    assert get_job_counts('one')['pending'] == 1
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the library session and its pooled connections.
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.database import (
+    Library, initialize_db, record_paper_download, record_papers_bulk, get_paper_details,
+    list_downloaded_papers, list_papers_page, iter_downloaded_papers
+)
+
+
+def test_connection_is_reused_per_thread(tmp_path):
+    """Each thread keeps one connection, opened in WAL mode."""
+    library = Library(str(tmp_path / 'papers.db'))
+    conn = library.connection()
+
+    assert library.connection() is conn
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(library.connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+    # Connections of finished threads are closed when a new one is opened
+    thread = threading.Thread(target=library.connection)
+    thread.start()
+    thread.join()
+    assert len(library._connections) == 2
+    library.close()
+
+
+def test_reader_is_not_blocked_by_open_write(tmp_path):
+    """A reader sees the last committed state while another connection is writing."""
+    library = Library(str(tmp_path / 'papers.db'))
+    initialize_db(library)
+    record_paper_download('1706.03762v7', title='Attention', directory='1706.03762v7', library=library)
+
+    writer = Library(library.db_file)
+    with writer.transaction() as cursor:
+        cursor.execute("UPDATE papers SET title = 'Changed'")
+        assert get_paper_details('1706.03762v7', library=library)['title'] == 'Attention'
+
+    assert get_paper_details('1706.03762v7', library=library)['title'] == 'Changed'
+    assert len(list_downloaded_papers(library=library)) == 1
+    writer.close()
+    library.close()
+
+
+def test_bulk_upsert_inserts_and_updates(tmp_path):
+    """record_papers_bulk writes new papers and updates existing ones across chunks."""
+    library = Library(str(tmp_path / 'papers.db'))
+    records = (
+        {'paper_id': f'2101.{number:05d}v1', 'title': f'Paper {number}', 'directory': f'2101.{number:05d}v1'}
+        for number in range(25)
+    )
+    assert record_papers_bulk(records, chunk_size=10, library=library) == 25
+
+    updated = [{'paper_id': '2101.00003v1', 'title': 'Renamed', 'directory': '2101.00003v1',
+                'has_pdf': True, 'category': 'cs.LG'}]
+    assert record_papers_bulk(updated, library=library) == 1
+
+    details = get_paper_details('2101.00003v1', library=library)
+    assert details['title'] == 'Renamed'
+    assert details['category'] == 'cs.LG'
+    assert details['id_number'] == '2101.00003'
+    assert details['has_pdf'] == 1
+    assert len(list_downloaded_papers(library=library)) == 25
+    library.close()
+
+
+def test_keyset_pages_cover_the_library(tmp_path):
+    """Pages follow each other without gaps or repeats, even for equal download times."""
+    library = Library(str(tmp_path / 'papers.db'))
+    initialize_db(library)
+    records = ({'paper_id': f'2101.{i:05d}', 'directory': f'2101.{i:05d}'} for i in range(25))
+    record_papers_bulk(records, chunk_size=10, library=library)
+
+    page, token = list_papers_page(page_size=7, library=library)
+    seen = list(page)
+    while token:
+        page, token = list_papers_page(page_size=7, page_token=token, library=library)
+        seen.extend(page)
+
+    assert [paper[0] for paper in seen] == [paper[0] for paper in list_downloaded_papers(library=library)]
+    assert len({paper[0] for paper in seen}) == 25
+    assert list(iter_downloaded_papers(page_size=4, library=library)) == seen
+
+    with pytest.raises(ValueError):
+        list_papers_page(page_token='not a token', library=library)
+    library.close()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for the precomputed library statistics.
+"""
+
+import os
+import sys
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.database import (
+    Library, initialize_db, record_papers_bulk, update_paper_status, delete_paper, get_library_stats
+)
+
+
+def test_counts_follow_inserts_updates_and_deletes(tmp_path):
+    """The counts are kept up to date by every write to the papers table."""
+    library = Library(str(tmp_path / 'papers.db'))
+    initialize_db(library)
+    record_papers_bulk([
+        {'paper_id': '1706.03762v7', 'directory': 'a', 'category': 'cs.CL', 'has_metadata': True,
+         'has_pdf': True, 'pdf_bytes': 1000},
+        {'paper_id': '1810.04805v2', 'directory': 'b', 'category': 'cs.CL', 'has_pdf': True, 'pdf_bytes': 500},
+        {'paper_id': 'hep-th/9901001v1', 'directory': 'c'},
+    ], library=library)
+
+    stats = get_library_stats(library)
+    assert (stats['papers'], stats['with_pdf'], stats['missing_pdf'], stats['with_metadata']) == (3, 2, 1, 1)
+    assert stats['pdf_bytes'] == 1500
+    assert stats['by_category']['cs.CL']['papers'] == 2
+    assert stats['by_category']['hep-th']['pdf_bytes'] == 0
+    assert list(stats['by_year']) == ['1999', '2017', '2018']
+    assert stats['by_month']['2017-06']['pdf_bytes'] == 1000
+
+    # Re-recording a paper only counts it once
+    record_papers_bulk([{'paper_id': '1706.03762v7', 'directory': 'a', 'category': 'cs.CL',
+                         'has_metadata': True, 'has_pdf': True}], library=library)
+    assert get_library_stats(library)['pdf_bytes'] == 1500
+
+    update_paper_status('1810.04805v2', has_pdf=False, library=library)
+    delete_paper('hep-th/9901001v1', library=library)
+    stats = get_library_stats(library)
+    assert (stats['papers'], stats['with_pdf'], stats['missing_pdf'], stats['pdf_bytes']) == (2, 1, 1, 1000)
+    assert 'hep-th' not in stats['by_category'] and '1999' not in stats['by_year']
+    library.close()
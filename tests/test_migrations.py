@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the numbered schema migrations.
+"""
+
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.database import (
+    Library, SCHEMA_VERSION, initialize_db, get_schema_version, migrate_database,
+    list_downloaded_papers, get_paper_details, search_local_papers
+)
+
+
+def test_new_database_is_created_at_current_version(tmp_path):
+    """A new database gets every migration once; reopening it applies none."""
+    library = Library(str(tmp_path / 'papers.db'))
+    assert initialize_db(library)
+    assert get_schema_version(library.connection()) == SCHEMA_VERSION
+    library.close()
+
+    reopened = Library(str(tmp_path / 'papers.db'))
+    assert migrate_database(reopened) == 0
+    assert reopened.search_index == library.search_index
+    reopened.close()
+
+
+def test_legacy_schema_is_converted(tmp_path):
+    """Papers of the schema without category/ID number/version columns are kept."""
+    path = str(tmp_path / 'papers.db')
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE papers (
+            paper_id TEXT PRIMARY KEY, simple_id TEXT, title TEXT, authors TEXT,
+            downloaded_at TIMESTAMP, directory TEXT, has_metadata BOOLEAN, has_pdf BOOLEAN
+        )
+    ''')
+    conn.execute("INSERT INTO papers VALUES ('cond-mat/0102536v1', '0102536v1', 'Cusp', 'D. P.', "
+                 "'2020-01-01', '0102536v1', 1, 1)")
+    conn.execute("INSERT INTO papers VALUES ('1706.03762v7', '1706.03762v7', 'Attention', 'A. V.', "
+                 "NULL, '1706.03762v7', 1, 1)")
+    conn.commit()
+    conn.close()
+
+    library = Library(path)
+    assert initialize_db(library)
+    assert len(list_downloaded_papers(library=library)) == 2
+
+    details = get_paper_details('cond-mat/0102536v1', library=library)
+    assert (details['category'], details['id_number'], details['version']) == ('cond-mat', '0102536', 1)
+    # Download times become epoch milliseconds; unknown ones 0
+    assert details['downloaded_at'] == int(datetime(2020, 1, 1).timestamp() * 1000)
+    assert get_paper_details('1706.03762v7', library=library)['downloaded_at'] == 0
+
+    # New-style IDs are found by their integer key, and the rebuilt table keeps its full-text index
+    assert [p[0] for p in search_local_papers('1706.03762', 'id', library=library)] == ['1706.03762v7']
+    if library.search_index:
+        assert [p[0] for p in search_local_papers('Attention', 'title', library=library)] == ['1706.03762v7']
+    assert get_schema_version(library.connection()) == SCHEMA_VERSION
+    library.close()
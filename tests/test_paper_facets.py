@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for the normalized author and category tables.
+"""
+
+import os
+import sys
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.api import parse_feed
+from arxiv_tool.database import (
+    Library, initialize_db, record_papers_bulk, record_paper_download, delete_paper, search_local_papers,
+    get_papers_by_author, get_papers_by_category, count_papers_by_author, count_papers_by_category
+)
+from arxiv_tool.pipeline import paper_db_record
+
+from test_paper_parser import SAMPLE_FEED
+
+
+def test_authors_and_categories_are_indexed_at_ingest(tmp_path):
+    """Whole author names and every category of a paper can be looked up and counted."""
+    library = Library(str(tmp_path / 'papers.db'))
+    initialize_db(library)
+    papers = parse_feed(SAMPLE_FEED)
+    record_papers_bulk([paper_db_record(paper, True, True) for paper in papers], library=library)
+    # Without metadata, only the category of the papers table is known
+    record_paper_download('hep-th/9901001v1', directory='hep-th_9901001v1', library=library)
+
+    assert [p[0] for p in get_papers_by_author('ashish vaswani', library=library)] == ['1706.03762v7']
+    # Part of a name is not a match
+    assert get_papers_by_author('Vaswani', library=library) == []
+
+    # cs.LG is a cross-list of the first paper
+    assert [p[0] for p in get_papers_by_category('cs.LG', library=library)] == ['1706.03762v7']
+    assert {p[0] for p in get_papers_by_category('cond-mat', library=library)} == {'cond-mat/0102536v1'}
+    assert [p[0] for p in search_local_papers('hep-th', 'category', library=library)] == ['hep-th/9901001v1']
+
+    assert ('cs.LG', 1) in count_papers_by_category(library=library)
+    assert count_papers_by_author(library=library)[0] == ('Ashish Vaswani', 1)
+
+    # Recording a paper again replaces its authors, deleting it removes them
+    record_papers_bulk([paper_db_record(papers[0], True, True)], library=library)
+    assert [name for name, count in count_papers_by_author(library=library)].count('Noam Shazeer') == 1
+    delete_paper('1706.03762v7', library=library)
+    assert get_papers_by_author('Ashish Vaswani', library=library) == []
+    assert ('cs.LG', 1) not in count_papers_by_category(library=library)
+    library.close()
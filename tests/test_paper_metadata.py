@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the paper metadata stored in the database.
+"""
+
+import os
+import sys
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.api import parse_feed
+from arxiv_tool.database import (
+    Library, initialize_db, record_papers_bulk, get_paper_metadata, store_paper_metadata,
+    record_paper_download, delete_paper, get_paper_details
+)
+from arxiv_tool.models import (
+    extract_and_save_metadata, parse_metadata_files, metadata_from_record, metadata_from_files,
+    record_from_metadata
+)
+from arxiv_tool.pipeline import paper_db_record
+
+from test_paper_parser import SAMPLE_FEED
+
+
+def test_metadata_is_recorded_with_the_paper(tmp_path):
+    """A paper record carries its metadata into the database in one write."""
+    library = Library(str(tmp_path / 'papers.db'))
+    initialize_db(library)
+    paper = parse_feed(SAMPLE_FEED)[0]
+
+    assert record_papers_bulk([paper_db_record(paper, True, True)], library=library) == 1
+    stored = get_paper_metadata([paper.paper_id, 'missing'], library=library)
+
+    assert list(stored) == [paper.paper_id]
+    # Empty fields are stored as NULL
+    assert stored[paper.paper_id] == dict(metadata_from_record(paper), doi=None, journal_ref=None)
+    assert stored[paper.paper_id]['categories'] == ['cs.CL', 'cs.LG']
+    assert stored[paper.paper_id]['affiliations'] == ['', 'Google']
+
+    delete_paper(paper.paper_id, library=library)
+    assert get_paper_metadata([paper.paper_id], library=library) == {}
+    library.close()
+
+
+def test_store_metadata_of_imported_paper(tmp_path):
+    """Metadata fetched later for an imported PDF marks the paper as having metadata."""
+    library = Library(str(tmp_path / 'papers.db'))
+    initialize_db(library)
+    paper = parse_feed(SAMPLE_FEED)[1]
+    record_paper_download(paper.paper_id, directory='imported', has_pdf=True, library=library)
+
+    assert store_paper_metadata([(paper.paper_id, metadata_from_record(paper))], library=library) == 1
+    assert get_paper_details(paper.paper_id, library=library)['has_metadata']
+    assert get_paper_metadata([paper.paper_id], library=library)[paper.paper_id]['doi'] is None
+    library.close()
+
+
+def test_metadata_files_round_trip(tmp_path):
+    """Exported metadata files read back into the same stored metadata."""
+    paper = parse_feed(SAMPLE_FEED)[0]
+    metadata = metadata_from_record(paper)
+
+    record = record_from_metadata(paper.paper_id, paper.title, metadata)
+    assert extract_and_save_metadata(record, paper_dir=str(tmp_path))['success']
+
+    files = parse_metadata_files(str(tmp_path))
+    assert files['title'] == paper.title
+    # category.txt only holds the first category
+    assert metadata_from_files(files) == dict(metadata, categories=['cs.CL'], doi=None, journal_ref=None)
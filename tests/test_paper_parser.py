@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for parsing arXiv Atom feeds into PaperRecord objects.
+"""
+
+import os
+import sys
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.api import PaperRecord, parse_feed, extract_paper_details_from_xml
+from arxiv_tool.models import extract_and_save_metadata
+
+
+SAMPLE_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title>ArXiv Query</title>
+  <entry>
+    <id>http://arxiv.org/abs/1706.03762v7</id>
+    <updated>2023-08-02T00:41:18Z</updated>
+    <published>2017-06-12T17:57:34Z</published>
+    <title>Attention Is All You Need</title>
+    <summary>  The dominant sequence transduction models...  </summary>
+    <author><name>Ashish Vaswani</name></author>
+    <author><name>Noam Shazeer</name><arxiv:affiliation>Google</arxiv:affiliation></author>
+    <arxiv:comment>15 pages, 5 figures</arxiv:comment>
+    <link href="http://arxiv.org/abs/1706.03762v7" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/1706.03762v7" rel="related" type="application/pdf"/>
+    <arxiv:primary_category term="cs.CL" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.CL" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>
+  <entry>
+    <id>http://arxiv.org/abs/cond-mat/0102536v1</id>
+    <title>Impact of Electron-Electron Cusp</title>
+    <author><name>David Prendergast</name></author>
+    <category term="cond-mat.str-el" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>
+</feed>
+"""
+
+
+def test_parse_feed_returns_one_record_per_entry():
+    """Every entry of the feed is parsed into a typed record."""
+    records = parse_feed(SAMPLE_FEED)
+
+    assert len(records) == 2
+    assert all(isinstance(record, PaperRecord) for record in records)
+
+    first, second = records
+    assert first.paper_id == '1706.03762v7'
+    assert first.id_number == '1706.03762'
+    assert first.version == '7'
+    assert first.safe_paper_id == '1706.03762v7'
+    assert first.authors == ['Ashish Vaswani', 'Noam Shazeer']
+    assert first.affiliations == ['', 'Google']
+    assert first.authors_str == 'Ashish Vaswani, Noam Shazeer'
+    assert first.summary == 'The dominant sequence transduction models...'
+    assert first.pdf_url == 'http://arxiv.org/pdf/1706.03762v7'
+    assert first.primary_category == 'cs.CL'
+    assert first.categories == ['cs.CL', 'cs.LG']
+
+    assert second.paper_id == 'cond-mat/0102536v1'
+    assert second.category == 'cond-mat'
+    assert second.safe_paper_id == '0102536v1'
+    assert second.pdf_url is None
+    # Falls back to the first category when there is no primary category
+    assert second.primary_category == 'cond-mat.str-el'
+
+
+def test_extract_paper_details_matches_record():
+    """The legacy dictionary API is a view of the first record."""
+    details = extract_paper_details_from_xml(SAMPLE_FEED)
+
+    assert details == parse_feed(SAMPLE_FEED)[0].to_dict()
+    assert details['authors'] == 'Ashish Vaswani, Noam Shazeer'
+
+
+def test_extract_and_save_metadata_from_record(tmp_path):
+    """Metadata files are written straight from a record."""
+    record = parse_feed(SAMPLE_FEED)[0]
+    paper_dir = str(tmp_path / record.safe_paper_id)
+
+    result = extract_and_save_metadata(record, paper_dir)
+
+    assert result['success']
+    metadata_dir = os.path.join(paper_dir, 'metadata')
+    with open(os.path.join(metadata_dir, 'authors.txt'), encoding='utf-8') as f:
+        assert f.read() == "Ashish Vaswani (No affiliation)\nNoam Shazeer (Google)"
+    with open(os.path.join(metadata_dir, 'id.txt'), encoding='utf-8') as f:
+        assert f.read() == 'http://arxiv.org/abs/1706.03762v7'
+    assert not os.path.exists(os.path.join(metadata_dir, 'doi.txt'))
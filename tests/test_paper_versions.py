@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the version catalog.
+"""
+
+import os
+import sys
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.api import parse_feed
+from arxiv_tool.database import (
+    Library, initialize_db, record_papers_bulk, delete_paper, version_key, record_known_versions,
+    get_known_versions, iter_latest_local_versions, find_outdated_papers
+)
+
+from test_paper_parser import SAMPLE_FEED
+
+
+def test_version_key():
+    """Old-style IDs keep their archive; IDs without version are version 1."""
+    assert version_key('1706.03762v5') == ('1706.03762', 5)
+    assert version_key('cond-mat/0102536') == ('cond-mat/0102536', 1)
+    assert version_key('cs_0303006v2') == ('cs/0303006', 2)
+
+
+def test_catalog_tracks_local_and_known_versions(tmp_path):
+    """Downloaded and reported versions end up in one catalog queried per paper."""
+    library = Library(str(tmp_path / 'papers.db'))
+    initialize_db(library)
+    record_papers_bulk([
+        {'paper_id': '1706.03762v1', 'directory': 'a'},
+        {'paper_id': '1706.03762v2', 'directory': 'a', 'metadata': {'updated': '2017-06-19T00:00:00Z'}},
+        {'paper_id': '1810.04805v2', 'directory': 'b'},
+    ], library=library)
+
+    assert list(iter_latest_local_versions(library)) == [
+        ('1706.03762', '1706.03762v2', 2, 2), ('1810.04805', '1810.04805v2', 2, 2)
+    ]
+    assert find_outdated_papers(library) == []
+
+    # A feed entry is the latest version; the versions before it are implied
+    latest = parse_feed(SAMPLE_FEED)[0]
+    latest.paper_id = '1706.03762v5'
+    assert record_known_versions([latest], library=library) == 1
+
+    versions = get_known_versions(['1706.03762', 'missing'], library=library)
+    assert list(versions) == ['1706.03762']
+    assert [v['version'] for v in versions['1706.03762']] == [1, 2, 3, 4, 5]
+    assert versions['1706.03762'][1]['updated'] == '2017-06-19T00:00:00Z'
+    assert versions['1706.03762'][4]['updated'] == latest.updated
+    assert find_outdated_papers(library) == [('1706.03762', '1706.03762v2', 2, 5)]
+
+    # A deleted version is still known, but no longer local
+    delete_paper('1810.04805v2', library=library)
+    assert [paper[0] for paper in iter_latest_local_versions(library)] == ['1706.03762']
+    assert get_known_versions(['1810.04805'], library=library)['1810.04805'][1]['paper_id'] is None
+    library.close()
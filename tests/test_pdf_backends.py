@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the PDF text-extraction backends.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.database import initialize_db, close_libraries, record_paper_download, get_library_state
+from arxiv_tool.models import pdf_backends
+from arxiv_tool.cli import benchmark_pdf_backends
+
+from test_text_cache import make_pdf
+
+
+PAGES = ['Attention is all you need', 'Multi-head attention']
+
+
+class BrokenBackend(pdf_backends.PdfBackend):
+    """A backend that fails on every PDF."""
+    name = 'broken'
+
+    def available(self):
+        return True
+
+    def count_pages(self, pdf_path):
+        raise ValueError("unsupported PDF")
+
+    def iter_pages(self, pdf_path, first_page=1, last_page=None):
+        raise ValueError("unsupported PDF")
+
+
+class HangingBackend(BrokenBackend):
+    """A backend that takes 5 seconds on a PDF and, like pypdf, carries on after any Exception."""
+    name = 'hanging'
+
+    def iter_pages(self, pdf_path, first_page=1, last_page=None):
+        for _ in range(500):
+            try:
+                time.sleep(0.01)
+            except Exception:
+                pass
+            yield ''
+
+
+@pytest.fixture
+def pdf_path(tmp_path, monkeypatch):
+    pytest.importorskip('pypdf')
+    monkeypatch.setitem(pdf_backends.PDF_BACKENDS, 'broken', BrokenBackend())
+    monkeypatch.setitem(pdf_backends.PDF_BACKENDS, 'hanging', HangingBackend())
+    path = str(tmp_path / 'paper.pdf')
+    make_pdf(path, PAGES)
+    return path
+
+
+def test_failing_and_hanging_backends_fall_back(pdf_path):
+    """A backend that raises or runs out of time is replaced by the next one."""
+    pages, backend, stopped, count = pdf_backends.extract_with_fallback(
+        pdf_path, backends=['broken', 'hanging', 'pypdf'], timeout=0.2, with_count=True
+    )
+    assert (pages, backend, stopped, count) == (PAGES, 'pypdf', False, 2)
+    assert pdf_backends.extract_with_fallback(pdf_path, backends=['broken'])[0] is None
+
+
+def test_timeout_is_not_swallowed_by_the_backend(pdf_path):
+    """The time limit stops a backend even if it catches every Exception."""
+    started = time.monotonic()
+    assert pdf_backends.extract_with_fallback(pdf_path, backends=['hanging'], timeout=0.2)[0] is None
+    assert time.monotonic() - started < 2
+
+
+def test_choose_backend_order():
+    """The fastest backend without failures and of about the best quality comes first."""
+    results = {
+        'pypdf': {'documents': 10, 'failed': 0, 'pages_per_second': 40.0, 'quality': 0.80},
+        'pdfminer': {'documents': 10, 'failed': 0, 'pages_per_second': 10.0, 'quality': 0.95},
+        'pdftotext': {'documents': 10, 'failed': 0, 'pages_per_second': 90.0, 'quality': 0.93},
+        'broken': {'documents': 0, 'failed': 10, 'pages_per_second': 0.0, 'quality': 0.0},
+    }
+    assert pdf_backends.choose_backend_order(results) == ['pdftotext', 'pdfminer', 'pypdf', 'broken']
+    results['pdftotext']['failed'] = 1
+    assert pdf_backends.choose_backend_order(results)[0] == 'pdfminer'
+
+
+def test_benchmark_sets_the_backend_order(pdf_path, tmp_path, monkeypatch):
+    """The order chosen by the benchmark is kept and used by later extractions."""
+    monkeypatch.chdir(tmp_path)
+    initialize_db()
+    os.makedirs('1706.03762v7/pdf')
+    os.replace(pdf_path, '1706.03762v7/pdf/1706.03762v7.pdf')
+    record_paper_download('1706.03762v7', directory='1706.03762v7', has_pdf=True)
+    monkeypatch.setattr(pdf_backends, 'available_backends', lambda: ['broken', 'pypdf'])
+
+    result = benchmark_pdf_backends(sample=5)
+    assert result['success'] and result['documents'] == 1
+    assert result['results']['broken']['failed'] == 1
+    assert result['order'] == ['pypdf', 'broken']
+    assert get_library_state(pdf_backends.BACKEND_ORDER_KEY) == 'pypdf,broken'
+    assert pdf_backends.get_backend_order() == ['pypdf', 'broken']
+    close_libraries()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming and resumable PDF downloads, run against a local HTTP stand-in server.
+"""
+
+import os
+import sys
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.api import ArxivHttpClient, RateLimiter, download_arxiv_pdf
+from arxiv_tool.api import rate_limiter
+
+
+PDF_BYTES = b"%PDF-1.4\n" + bytes(range(256)) * 2000
+
+
+class PdfHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    etag = '"v1"'
+    fail_next = False
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        PdfHandler.requests.append(dict(self.headers))
+
+        if self.path == '/pdf/ranged':
+            self.send_ranged()
+            return
+
+        if self.path == '/pdf/truncated':
+            # Announce the full size but drop the connection halfway through
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(PDF_BYTES)))
+            self.end_headers()
+            self.wfile.write(PDF_BYTES[:len(PDF_BYTES) // 2])
+            self.close_connection = True
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(PDF_BYTES)))
+        self.end_headers()
+        self.wfile.write(PDF_BYTES)
+
+    def send_ranged(self):
+        """Serve the PDF with an ETag and byte-range support, optionally cutting the body short."""
+        start = 0
+        range_header = self.headers.get('Range')
+        if range_header and self.headers.get('If-Range') == PdfHandler.etag:
+            start = int(range_header.split('=')[1].rstrip('-'))
+
+        body = PDF_BYTES[start:]
+        if start:
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{len(PDF_BYTES) - 1}/{len(PDF_BYTES)}")
+        else:
+            self.send_response(200)
+        self.send_header('ETag', PdfHandler.etag)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        if PdfHandler.fail_next:
+            PdfHandler.fail_next = False
+            self.wfile.write(body[:len(body) // 3])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(tmp_path, monkeypatch):
+    """Keep the tests fast and their limiter state out of the working directory."""
+    monkeypatch.setattr(rate_limiter, '_limiter', RateLimiter(str(tmp_path / 'limits.db'), limits={}))
+
+
+@pytest.fixture
+def server():
+    PdfHandler.etag = '"v1"'
+    PdfHandler.fail_next = False
+    PdfHandler.requests = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), PdfHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_download_streams_to_final_path(server, tmp_path):
+    """The PDF is written in chunks and renamed into place."""
+    client = ArxivHttpClient()
+    path = download_arxiv_pdf(f"{server}/pdf/1706.03762v7", directory=str(tmp_path), client=client, chunk_size=4096)
+    client.close()
+
+    assert path == os.path.join(str(tmp_path), '1706.03762v7.pdf')
+    with open(path, 'rb') as f:
+        assert f.read() == PDF_BYTES
+    assert os.listdir(str(tmp_path)) == ['1706.03762v7.pdf']
+
+
+def test_truncated_download_leaves_no_pdf(server, tmp_path):
+    """A download that ends early never produces a file under the final name."""
+    client = ArxivHttpClient()
+    with pytest.raises(urllib.error.URLError):
+        download_arxiv_pdf(f"{server}/pdf/truncated", directory=str(tmp_path), client=client)
+    client.close()
+
+    assert not os.path.exists(os.path.join(str(tmp_path), 'truncated.pdf'))
+
+
+def test_interrupted_download_resumes_with_range(server, tmp_path):
+    """A second attempt continues from the partial file instead of byte zero."""
+    client = ArxivHttpClient()
+    part_path = os.path.join(str(tmp_path), 'ranged.pdf.part')
+
+    PdfHandler.fail_next = True
+    with pytest.raises(urllib.error.URLError):
+        download_arxiv_pdf(f"{server}/pdf/ranged", directory=str(tmp_path), client=client)
+    partial_size = os.path.getsize(part_path)
+    assert 0 < partial_size < len(PDF_BYTES)
+    assert os.path.exists(part_path + '.json')
+
+    path = download_arxiv_pdf(f"{server}/pdf/ranged", directory=str(tmp_path), client=client)
+    client.close()
+
+    assert PdfHandler.requests[-1]['Range'] == f"bytes={partial_size}-"
+    assert PdfHandler.requests[-1]['If-Range'] == '"v1"'
+    with open(path, 'rb') as f:
+        assert f.read() == PDF_BYTES
+    assert os.listdir(str(tmp_path)) == ['ranged.pdf']
+
+
+def test_changed_document_restarts_download(server, tmp_path):
+    """If the validator no longer matches, the server's full response replaces the partial file."""
+    client = ArxivHttpClient()
+
+    PdfHandler.fail_next = True
+    with pytest.raises(urllib.error.URLError):
+        download_arxiv_pdf(f"{server}/pdf/ranged", directory=str(tmp_path), client=client)
+
+    PdfHandler.etag = '"v2"'
+    path = download_arxiv_pdf(f"{server}/pdf/ranged", directory=str(tmp_path), client=client)
+    client.close()
+
+    with open(path, 'rb') as f:
+        assert f.read() == PDF_BYTES
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the page-by-page PDF text extraction.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+pypdf = pytest.importorskip('pypdf')
+
+from arxiv_tool.database import initialize_db, close_libraries, record_paper_download, get_cached_text
+from arxiv_tool.models import pdf_extractor
+
+from test_text_cache import make_pdf
+
+
+PAGES = ['Abstract of the thesis', 'Chapter one', 'Chapter two', 'Bibliography']
+
+
+@pytest.fixture
+def parsed_pages(tmp_path, monkeypatch):
+    """Record a four-page paper and count the pages whose text is extracted."""
+    monkeypatch.chdir(tmp_path)
+    initialize_db()
+    os.makedirs('0801.00001v1/pdf')
+    make_pdf('0801.00001v1/pdf/0801.00001v1.pdf', PAGES)
+    record_paper_download('0801.00001v1', directory='0801.00001v1', has_pdf=True)
+
+    parsed = []
+    extract_text = pypdf.PageObject.extract_text
+
+    def counting_extract_text(page, *args, **kwargs):
+        text = extract_text(page, *args, **kwargs)
+        parsed.append(text)
+        return text
+    monkeypatch.setattr(pypdf.PageObject, 'extract_text', counting_extract_text)
+    yield parsed
+    close_libraries()
+
+
+def test_extraction_stops_at_max_chars(parsed_pages):
+    """Reading the pages of a PDF directly only parses those needed for max_chars."""
+    pdf_path = '0801.00001v1/pdf/0801.00001v1.pdf'
+    assert pdf_extractor.extract_text_from_pdf(pdf_path, max_chars=10).startswith('Abstract o')
+    assert len(parsed_pages) == 1
+
+    assert pdf_extractor.extract_pdf_pages(pdf_path, first_page=2, last_page=3) == ['Chapter one', 'Chapter two']
+    assert len(parsed_pages) == 3
+    assert get_cached_text(pdf_path) is None
+
+
+def test_paper_content_stops_at_max_chars(parsed_pages):
+    """Without a cached text, only the pages needed for max_chars are parsed, and a partial text is not cached."""
+    pdf_path = '0801.00001v1/pdf/0801.00001v1.pdf'
+    content = pdf_extractor.get_paper_full_content('0801.00001v1', max_chars=10)
+    assert content['pdf_text'].startswith('Abstract o') and content['pages'] is None
+    assert len(parsed_pages) == 1
+    assert get_cached_text(pdf_path) is None
+
+    content = pdf_extractor.get_paper_full_content('0801.00001v1', first_page=3, last_page=3)
+    assert content['pdf_text'] == 'Chapter two\n\n'
+    assert len(parsed_pages) == 2
+
+    # Going through the whole document caches it, so later calls parse nothing
+    content = pdf_extractor.get_paper_full_content('0801.00001v1', max_chars=0)
+    assert content['pages'] == 4
+    assert len(parsed_pages) == 6
+    assert get_cached_text(pdf_path).page_range(4) == 'Bibliography\n\n'
+    content = pdf_extractor.get_paper_full_content('0801.00001v1', max_chars=5, start_char=10)
+    assert content['pdf_text'].startswith('f the')
+    assert len(parsed_pages) == 6
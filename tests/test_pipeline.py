@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the staged processing pipeline.
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.pipeline import Pipeline, Stage
+
+
+def test_items_pass_through_all_stages():
+    """Every item goes through each stage; dropped and failed items are left out."""
+    def fail_on_three(item):
+        if item == 3:
+            raise ValueError("bad item")
+        return item
+
+    pipeline = Pipeline([
+        Stage('double', lambda item: item * 2 if item != 5 else None, workers=3, queue_size=2),
+        Stage('check', lambda item: fail_on_three(item // 2) * 2, workers=2, queue_size=2),
+        Stage('collect', lambda item: item + 1)
+    ])
+    seen = []
+    results = pipeline.run(range(10), on_result=seen.append)
+
+    assert sorted(results) == [1, 3, 5, 9, 13, 15, 17, 19]
+    assert sorted(seen) == sorted(results)
+    assert [(stage, item) for stage, item, _ in pipeline.errors] == [('check', 6)]
+
+
+def test_stage_overlaps_with_slow_source():
+    """Items are processed while the source is still producing."""
+    processed = []
+    lock = threading.Lock()
+
+    def source():
+        for item in range(3):
+            time.sleep(0.05)
+            with lock:
+                # Everything yielded before this item should already be done
+                assert len(processed) >= item - 1
+            yield item
+
+    def work(item):
+        with lock:
+            processed.append(item)
+        return item
+
+    results = Pipeline([Stage('work', work, workers=2)]).run(source())
+    assert sorted(results) == [0, 1, 2]
+
+
+def test_batched_stage_groups_waiting_items():
+    """A batched stage receives the items that queued up while it was busy."""
+    batches = []
+
+    def slow(item):
+        time.sleep(0.01)
+        return item
+
+    def collect(items):
+        batches.append(len(items))
+        time.sleep(0.05)
+        return items
+
+    results = Pipeline([
+        Stage('work', slow, workers=4),
+        Stage('write', collect, batch_size=5)
+    ]).run(range(20))
+
+    assert sorted(results) == list(range(20))
+    assert sum(batches) == 20
+    assert max(batches) <= 5
+    assert len(batches) < 20
+
+
+def test_source_error_is_recorded():
+    """An exception in the source ends the run and is reported."""
+    def source():
+        yield 1
+        raise RuntimeError("source failed")
+
+    pipeline = Pipeline([Stage('work', lambda item: item)])
+    assert pipeline.run(source()) == [1]
+    assert pipeline.errors[0][0] == 'source'
+
+
+def test_result_callback_error_is_recorded():
+    """An exception in on_result is recorded and the run still completes."""
+    def report(item):
+        if item == 2:
+            raise RuntimeError("report failed")
+
+    pipeline = Pipeline([
+        Stage('feed', lambda item: item, queue_size=1),
+        Stage('collect', lambda item: item, queue_size=1)
+    ])
+    assert sorted(pipeline.run(range(20), on_result=report)) == list(range(20))
+    assert [(stage, item) for stage, item, _ in pipeline.errors] == [('collect', 2)]
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared token-bucket rate limiter.
+"""
+
+import os
+import sys
+import time
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.api import RateLimiter, rate_limiter
+
+
+def test_limiters_share_state_file(tmp_path):
+    """Two limiters on the same state file (e.g. two processes) share one budget."""
+    state_file = str(tmp_path / 'limits.db')
+    first = RateLimiter(state_file, limits={'api': (5.0, 1.0)})
+    second = RateLimiter(state_file, limits={'api': (5.0, 1.0)})
+
+    assert first.acquire('api') == 0.0
+    start = time.monotonic()
+    waited = second.acquire('api')
+
+    assert waited > 0.1
+    assert time.monotonic() - start >= 0.15
+
+
+def test_elapsed_time_counts_towards_interval(tmp_path):
+    """No sleep is needed when the previous request already took longer than the interval."""
+    limiter = RateLimiter(str(tmp_path / 'limits.db'), limits={'api': (20.0, 1.0)})
+
+    limiter.acquire('api')
+    time.sleep(0.06)
+    assert limiter.acquire('api') == 0.0
+
+
+def test_burst_capacity_and_disabled_endpoint(tmp_path):
+    """A bucket allows `capacity` requests at once; unlimited endpoints never wait."""
+    limiter = RateLimiter(str(tmp_path / 'limits.db'), limits={'pdf': (1.0, 3.0)})
+
+    assert [limiter.acquire('pdf') for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire('other') == 0.0
+
+    limiter.set_interval('pdf', 0)
+    assert limiter.acquire('pdf') == 0.0
+
+
+def test_unavailable_state_file_is_reported_once(tmp_path, monkeypatch, capsys):
+    """Without its state file, the limiter still limits the process and warns only once."""
+    monkeypatch.setattr(rate_limiter, '_fallback_warned', False)
+    limiter = RateLimiter(str(tmp_path / 'missing' / 'limits.db'), limits={'api': (1.0, 2.0)})
+
+    assert [limiter.acquire('api') > 0 for _ in range(3)] == [False, False, True]
+    assert capsys.readouterr().out.count('Rate limiter state unavailable') == 1
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched existence check and library reconciliation.
+"""
+
+import os
+import sys
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.database import (
+    Library, initialize_db, record_papers_bulk, papers_exist, paper_exists, reconcile_library,
+    get_paper_details
+)
+
+
+def add_papers(library, count, with_pdf):
+    """Record complete papers and write the PDFs of those in with_pdf."""
+    records = []
+    for i in range(count):
+        paper_id = f'2101.{i:05d}v1'
+        records.append({'paper_id': paper_id, 'directory': paper_id, 'has_metadata': True, 'has_pdf': True})
+        if i in with_pdf:
+            os.makedirs(os.path.join(paper_id, 'pdf'))
+            open(os.path.join(paper_id, 'pdf', f'{paper_id}.pdf'), 'wb').close()
+    record_papers_bulk(records, library=library)
+    return [record['paper_id'] for record in records]
+
+
+def test_papers_exist_checks_files_and_corrects_status(tmp_path, monkeypatch):
+    """Missing PDFs are reported and written back to the database."""
+    monkeypatch.chdir(tmp_path)
+    library = Library(str(tmp_path / 'papers.db'))
+    initialize_db(library)
+    paper_ids = add_papers(library, 3, with_pdf={0, 2})
+
+    exists = papers_exist(paper_ids + ['9999.99999', paper_ids[0]], library=library)
+    assert exists == {paper_ids[0]: True, paper_ids[1]: False, paper_ids[2]: True, '9999.99999': False}
+    assert not get_paper_details(paper_ids[1], library=library)['has_pdf']
+
+    # Without the file check only the database is consulted
+    os.remove(os.path.join(paper_ids[2], 'pdf', f'{paper_ids[2]}.pdf'))
+    assert papers_exist([paper_ids[2]], verify_files=False, library=library)[paper_ids[2]]
+    assert not paper_exists(paper_ids[2], library=library)
+    library.close()
+
+
+def test_reconcile_library_in_parallel(tmp_path, monkeypatch):
+    """The whole library is verified page by page on a thread pool."""
+    monkeypatch.chdir(tmp_path)
+    library = Library(str(tmp_path / 'papers.db'))
+    initialize_db(library)
+    add_papers(library, 50, with_pdf=set(range(0, 50, 2)))
+
+    assert reconcile_library(workers=4, page_size=40, library=library) == {
+        'checked': 50, 'complete': 25, 'missing_pdf': 25
+    }
+    # The corrections are not counted again
+    assert reconcile_library(workers=4, library=library)['missing_pdf'] == 0
+    library.close()
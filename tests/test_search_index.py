@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the full-text search index.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.database import (
+    Library, initialize_db, record_papers_bulk, search_local_papers, search_papers_fulltext,
+    index_paper_texts, delete_paper, build_fts_query
+)
+
+
+def paper(paper_id, title, authors, abstract=None):
+    return {
+        'paper_id': paper_id, 'directory': f'/tmp/{paper_id}', 'has_metadata': True, 'has_pdf': True,
+        'title': title, 'authors': authors, 'category': 'cs.CL', 'abstract': abstract
+    }
+
+
+@pytest.fixture
+def library(tmp_path):
+    library = Library(str(tmp_path / 'papers.db'))
+    initialize_db(library)
+    if not library.search_index:
+        pytest.skip("SQLite was built without FTS5")
+    record_papers_bulk([
+        paper('1706.03762', 'Attention Is All You Need', 'Ashish Vaswani, Noam Shazeer',
+              'The dominant sequence transduction models are based on recurrent networks.'),
+        paper('1810.04805', 'BERT: Pre-training of Deep Bidirectional Transformers', 'Jacob Devlin',
+              'We introduce a new language representation model using self-attention.'),
+        paper('1312.6114', 'Auto-Encoding Variational Bayes', 'Diederik Kingma, Max Welling'),
+    ], library=library)
+    yield library
+    library.close()
+
+
+def test_query_syntax_is_escaped():
+    """Punctuation is quoted, prefixes, phrases and operators are kept."""
+    assert build_fts_query('self-attention') == '"self-attention"'
+    assert build_fts_query('trans* "neural network" OR rnn') == '"trans"* "neural network" OR "rnn"'
+    assert build_fts_query('NOT bert', ['title', 'bogus']) == '{title} : ("bert")'
+    assert build_fts_query('  ') == ''
+
+
+def test_title_matches_rank_above_abstract_matches(library):
+    """A title hit outranks a match in the abstract, which carries a lower weight."""
+    results = search_papers_fulltext('attention', library=library)
+    assert [result['paper'][0] for result in results] == ['1706.03762', '1810.04805']
+    assert '[attention]' in results[1]['snippet']
+
+
+def test_fields_phrases_and_prefixes(library):
+    """Searches can be restricted to a field and use phrases and prefixes."""
+    assert [p[0] for p in search_local_papers('Kingma', 'authors', library=library)] == ['1312.6114']
+    assert search_local_papers('recurrent', 'title', library=library) == []
+    assert [p[0] for p in search_local_papers('"language representation"', 'abstract', library=library)] == ['1810.04805']
+    assert [p[0] for p in search_local_papers('Varia*', library=library)] == ['1312.6114']
+
+
+def test_index_follows_the_papers_table(library):
+    """Full text can be added later and deleted papers leave the index."""
+    assert index_paper_texts([('1312.6114', None, 'reparameterization trick')], library=library) == 1
+    assert [p[0] for p in search_local_papers('reparameterization', 'text', library=library)] == ['1312.6114']
+
+    # Renaming a paper updates the indexed title
+    record_papers_bulk([paper('1312.6114', 'Renamed Paper', 'Diederik Kingma')], library=library)
+    assert [p[0] for p in search_local_papers('renamed', 'title', library=library)] == ['1312.6114']
+    assert search_local_papers('reparameterization', 'text', library=library) != []
+
+    delete_paper('1312.6114', library=library)
+    assert search_local_papers('renamed', library=library) == []
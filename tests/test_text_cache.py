@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the extracted-text cache.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.database import (
+    Library, initialize_db, close_libraries, record_paper_download, get_cached_text, store_cached_text,
+    search_index_available, search_local_papers, rebuild_search_index
+)
+from arxiv_tool.models import pdf_extractor
+
+
+def make_pdf(path, pages):
+    """Write a PDF with one line of Helvetica text per page."""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in pages:
+        content = f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET'.encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(content), content))
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % len(objects))
+        kids.append(b'%d 0 R' % len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(kids), len(kids))
+
+    data = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(data)
+    data += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    data += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    data += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def test_text_is_cached_per_file_content(tmp_path):
+    """A cached text is found again by path and dropped when the file changes."""
+    library = Library(str(tmp_path / 'papers.db'))
+    initialize_db(library)
+    pdf_path = str(tmp_path / 'paper.pdf')
+    with open(pdf_path, 'wb') as f:
+        f.write(b'%PDF first')
+
+    assert get_cached_text(pdf_path, library=library) is None
+    stored = store_cached_text(pdf_path, ['Page one', '', 'Page three'], library=library)
+    cached = get_cached_text(pdf_path, library=library)
+    assert cached == stored
+    assert cached.pages == 3
+    assert cached.page_range(3) == 'Page three\n\n'
+    assert cached.page_range(1, 2) == 'Page one\n\n'
+
+    with open(pdf_path, 'wb') as f:
+        f.write(b'%PDF second version')
+    assert get_cached_text(pdf_path, library=library) is None
+    assert library.connection().execute('SELECT COUNT(*) FROM pdf_texts').fetchone()[0] == 0
+    library.close()
+
+
+def test_paper_content_is_extracted_once(tmp_path, monkeypatch):
+    """Repeat calls slice the cached text instead of parsing the PDF again."""
+    pytest.importorskip('pypdf')
+    monkeypatch.chdir(tmp_path)
+    initialize_db()
+    os.makedirs('1706.03762v7/pdf')
+    make_pdf('1706.03762v7/pdf/1706.03762v7.pdf', ['Attention is all you need', 'Multi-head attention'])
+    record_paper_download('1706.03762v7', directory='1706.03762v7', has_pdf=True)
+
+    content = pdf_extractor.get_paper_full_content('1706.03762v7')
+    assert content['pdf_text'].startswith('Attention') and content['pages'] == 2
+
+    def no_parsing(pdf_path, *args, **kwargs):
+        raise AssertionError("the PDF was parsed again")
+    monkeypatch.setattr(pdf_extractor, 'extract_with_fallback', no_parsing)
+    content = pdf_extractor.get_paper_full_content('1706.03762v7', first_page=2)
+    assert content['pdf_text'] == 'Multi-head attention\n\n'
+    close_libraries()
+
+
+def test_reindex_keeps_cached_texts(tmp_path, monkeypatch):
+    """A plain reindex takes the text of extracted PDFs from the cache instead of dropping it."""
+    pytest.importorskip('pypdf')
+    monkeypatch.chdir(tmp_path)
+    initialize_db()
+    if not search_index_available():
+        pytest.skip("SQLite without FTS5")
+    os.makedirs('1706.03762v7/pdf')
+    make_pdf('1706.03762v7/pdf/1706.03762v7.pdf', ['Scaled dot-product attention'])
+    record_paper_download('1706.03762v7', directory='1706.03762v7', has_pdf=True)
+    pdf_extractor.get_paper_full_content('1706.03762v7')
+
+    def no_parsing(pdf_path, *args, **kwargs):
+        raise AssertionError("the PDF was parsed again")
+    monkeypatch.setattr(pdf_extractor, 'extract_with_fallback', no_parsing)
+    assert rebuild_search_index()['full_texts'] == 1
+    assert [paper[0] for paper in search_local_papers('dot-product', 'text')] == ['1706.03762v7']
+    close_libraries()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the section-aware chunk store.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.database import (
+    PdfText, join_pages, split_sections, chunk_text, rank_chunks, initialize_db, get_library, close_libraries,
+    record_paper_download
+)
+from arxiv_tool.models import get_relevant_chunks
+
+from test_text_cache import make_pdf
+
+
+def sentences(topic, count):
+    return ' '.join(f"Sentence {number} is about {topic}." for number in range(count))
+
+
+PAGES = [
+    "Attention Is All You Need\nAshish Vaswani, Noam Shazeer\nAbstract\n" + sentences('sequence models', 20),
+    "1 Introduction\n" + sentences('recurrent networks', 30) + "\n2 layers are stacked in the encoder.",
+    "3 Model Architecture\n3.1 Encoder and Decoder Stacks\n" + sentences('attention heads', 200),
+    "4 Training\nWe trained on the WMT 2014 English-German dataset of 4.5 million sentence pairs.\n"
+    "5 Results\n" + sentences('BLEU scores', 30),
+    "References\n[1] Jimmy Lei Ba. Layer normalization. 2016.\nA Attention Visualizations\n" + sentences('plots', 10),
+]
+
+
+def test_sections_follow_the_headings():
+    """Headings are recognized by name and by their numbering, lines of text are not."""
+    text = join_pages(PAGES)[0]
+    sections = [(section, heading) for section, heading, _, _ in split_sections(text)]
+    assert sections == [
+        ('front', ''), ('abstract', 'Abstract'), ('introduction', '1 Introduction'),
+        ('method', '3 Model Architecture'), ('method', '3.1 Encoder and Decoder Stacks'),
+        ('body', '4 Training'), ('results', '5 Results'), ('references', 'References'),
+        ('appendix', 'A Attention Visualizations'),
+    ]
+
+
+def test_chunks_are_bounded_and_ranked():
+    """Long sections are cut at sentence ends within the token bounds, and BM25 finds the passage."""
+    text, offsets = join_pages(PAGES)
+    chunks = chunk_text(PdfText('', text, offsets), max_tokens=200, min_tokens=50)
+    method = [chunk for chunk in chunks if chunk.section == 'method']
+    assert len(method) > 1
+    assert all(50 <= chunk.tokens <= 200 and text[chunk.end - 1] == '.' for chunk in method)
+    assert all(chunk.page == 3 for chunk in method)
+    assert [chunk.heading for chunk in chunks].count('3 Model Architecture') == len(method)
+
+    best = rank_chunks(text, chunks, 'Which dataset was used, and how many sentence pairs?', limit=2)
+    assert best[0][0].heading == '4 Training' and len(best) == 2
+    assert rank_chunks(text, chunks, 'dataset', sections=['results']) == []
+
+
+def test_relevant_chunks_of_a_paper(tmp_path, monkeypatch):
+    """The chunks of a paper are stored once and only the relevant ones returned."""
+    pytest.importorskip('pypdf')
+    monkeypatch.chdir(tmp_path)
+    initialize_db()
+    os.makedirs('1706.03762v7/pdf')
+    make_pdf('1706.03762v7/pdf/1706.03762v7.pdf', ['Abstract', 'We use 8 parallel attention heads.',
+                                                   'References'])
+    record_paper_download('1706.03762v7', directory='1706.03762v7', has_pdf=True)
+
+    result = get_relevant_chunks('1706.03762v7', 'How many attention heads?', limit=3)
+    assert result['success'] and result['total_chunks'] == 2
+    assert [(chunk['section'], chunk['page']) for chunk in result['chunks']] == [('abstract', 1)]
+    assert 'parallel attention heads' in result['chunks'][0]['text']
+
+    stored = get_library().connection().execute('SELECT section FROM text_chunks ORDER BY chunk').fetchall()
+    assert stored == [('abstract',), ('references',)]
+    assert get_relevant_chunks('0000.00000', 'heads')['success'] is False
+    close_libraries()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the parallel PDF text extraction.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+pytest.importorskip('pypdf')
+
+from arxiv_tool.cli import commands
+from arxiv_tool.database import (
+    Library, initialize_db, close_libraries, record_papers_bulk, get_cached_text, search_local_papers,
+    search_index_available
+)
+from arxiv_tool.models import extract_text_from_pdf
+from arxiv_tool.pipeline import TextExtractor, text_extraction
+from arxiv_tool.pipeline.text_extraction import extract_page_range
+
+from test_text_cache import make_pdf
+
+
+def test_long_pdfs_are_split_and_reassembled(tmp_path, monkeypatch):
+    """Page ranges extracted by different processes give the text of a serial extraction."""
+    monkeypatch.chdir(tmp_path)
+    library = Library(str(tmp_path / 'papers.db'))
+    initialize_db(library)
+    thesis = str(tmp_path / 'thesis.pdf')
+    make_pdf(thesis, [f'Chapter {number}' for number in range(1, 8)])
+    short = str(tmp_path / 'short.pdf')
+    make_pdf(short, ['Letter'])
+    broken = str(tmp_path / 'broken.pdf')
+    with open(broken, 'wb') as f:
+        f.write(b'not a PDF')
+
+    results = {}
+    extractor = TextExtractor(jobs=2, split_pages=2, library=library)
+    counts = extractor.run([('thesis', thesis), ('short', short), ('broken', broken)],
+                           on_result=lambda key, pdf_text: results.update({key: pdf_text}))
+    assert counts == {'cached': 0, 'extracted': 2, 'failed': 1, 'pages': 8}
+    assert results['thesis'].text == extract_text_from_pdf(thesis)
+    assert not os.path.exists('arxiv_papers.db')
+    assert results['thesis'].page_range(6, 6) == 'Chapter 6\n\n'
+    assert results['broken'] is None
+    assert get_cached_text(thesis, library=library).pages == 7
+
+    # A second run only retries what failed
+    counts = extractor.run([('thesis', thesis), ('short', short), ('broken', broken)])
+    assert counts == {'cached': 2, 'extracted': 0, 'failed': 1, 'pages': 0}
+    library.close()
+
+
+def crash_on_page_range(pdf_path, first_page, last_page, backends):
+    """Stand-in for extract_page_range() whose worker process dies on PDFs named 'crash'."""
+    if 'crash' in os.path.basename(pdf_path):
+        os._exit(1)
+    return extract_page_range(pdf_path, first_page, last_page, backends)
+
+
+def test_dead_worker_fails_its_pdfs_and_the_run_goes_on(tmp_path, monkeypatch):
+    """PDFs whose worker process died count as failed, and the rest are extracted on a new pool."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(text_extraction, 'extract_page_range', crash_on_page_range)
+    library = Library(str(tmp_path / 'papers.db'))
+    initialize_db(library)
+    pdfs = []
+    for name in ('crash', 'first', 'second'):
+        make_pdf(str(tmp_path / f'{name}.pdf'), [f'Paper {name}'])
+        pdfs.append((name, str(tmp_path / f'{name}.pdf')))
+
+    # With one process, the PDF queued behind the crash is lost along with it
+    counts = TextExtractor(jobs=1, library=library).run(pdfs)
+    assert counts == {'cached': 0, 'extracted': 1, 'failed': 2, 'pages': 1}
+    assert get_cached_text(pdfs[2][1], library=library).text == 'Paper second\n\n'
+
+    counts = TextExtractor(jobs=1, library=library).run(pdfs[1:])
+    assert counts == {'cached': 1, 'extracted': 1, 'failed': 0, 'pages': 1}
+    library.close()
+
+
+def test_extract_text_command_indexes_the_library(tmp_path, monkeypatch):
+    """The command extracts the PDF of every paper and makes its text searchable."""
+    monkeypatch.chdir(tmp_path)
+    initialize_db()
+    os.makedirs('1706.03762v7/pdf')
+    make_pdf('1706.03762v7/pdf/1706.03762v7.pdf', ['Scaled dot-product attention'])
+    record_papers_bulk([
+        {'paper_id': '1706.03762v7', 'directory': '1706.03762v7', 'has_pdf': True},
+        {'paper_id': '1810.04805v2', 'directory': '1810.04805v2', 'has_pdf': True},
+    ])
+
+    summary = commands.extract_library_text(jobs=2)
+    assert (summary['total'], summary['extracted'], summary['missing']) == (2, 1, 1)
+    if search_index_available():
+        assert [paper[0] for paper in search_local_papers('attention', 'text')] == ['1706.03762v7']
+    assert commands.extract_library_text(jobs=2)['cached'] == 1
+    close_libraries()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the bulk and incremental update check.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the directory containing the arxiv_tool package to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from arxiv_tool.api import bulk_resolver, update_feed
+from arxiv_tool.cli import commands
+from arxiv_tool.database import (
+    initialize_db, close_libraries, record_papers_bulk, find_outdated_papers, iter_latest_local_versions
+)
+from arxiv_tool.pipeline import paper_pipeline
+
+
+def make_feed(paper_ids, total=None):
+    entries = "".join(
+        f'<entry><id>http://arxiv.org/abs/{paper_id}</id><title>Paper {paper_id}</title>'
+        f'<link title="pdf" href="http://arxiv.org/pdf/{paper_id}" rel="related" type="application/pdf"/></entry>'
+        for paper_id in paper_ids
+    )
+    total = len(paper_ids) if total is None else total
+    return (f'<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+            f'<opensearch:totalResults>{total}</opensearch:totalResults>{entries}</feed>')
+
+
+# What the fake API knows: the latest version of each paper
+LATEST = {'1706.03762': '1706.03762v7', '1512.03385': '1512.03385v1', 'hep-th/9901001': 'hep-th/9901001v3'}
+
+
+@pytest.fixture
+def arxiv(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    initialize_db()
+    record_papers_bulk([
+        {'paper_id': '1706.03762v2', 'directory': '1706.03762v2', 'has_metadata': True, 'has_pdf': True},
+        {'paper_id': '1512.03385v1', 'directory': '1512.03385v1', 'has_metadata': True, 'has_pdf': True},
+        {'paper_id': 'hep-th/9901001v3', 'directory': 'hep-th_9901001v3', 'has_metadata': True, 'has_pdf': True},
+    ])
+
+    calls = {'id_list': [], 'feed': []}
+
+    def search_by_id(search_query, max_results=10, client=None, id_list=None):
+        calls['id_list'].append(list(id_list))
+        return make_feed([LATEST[paper_id] for paper_id in id_list if paper_id in LATEST])
+
+    def search_updates(search_query, max_results=10, client=None, **options):
+        calls['feed'].append(search_query)
+        # A paper outside the library was updated too
+        updated = [LATEST['1512.03385'], '2101.00001v1']
+        return make_feed(updated[options['start']:])
+
+    def download(pdf_url, save_filename=None, directory=None):
+        path = os.path.join(directory, pdf_url.rsplit('/', 1)[-1] + '.pdf')
+        with open(path, 'wb') as f:
+            f.write(b'%PDF')
+        return path
+
+    monkeypatch.setattr(bulk_resolver, 'search_with_retry', search_by_id)
+    monkeypatch.setattr(update_feed, 'search_with_retry', search_updates)
+    monkeypatch.setattr(paper_pipeline, 'download_arxiv_pdf', download)
+    yield calls
+    close_libraries()
+
+
+def test_first_check_looks_up_every_paper_by_id(arxiv):
+    """Without a watermark, all papers are checked with one id_list request."""
+    summary = commands.check_for_paper_updates(workers=2)
+
+    assert arxiv['id_list'] == [['1512.03385', '1706.03762', 'hep-th/9901001']]
+    assert arxiv['feed'] == []
+    assert summary == {'success': True, 'total': 3, 'incremental': False, 'updated': 1, 'skipped': 2, 'errors': 0}
+    assert [paper[1] for paper in iter_latest_local_versions()] == ['1512.03385v1', '1706.03762v7', 'hep-th/9901001v3']
+
+
+def test_repeat_check_only_considers_updated_papers(arxiv):
+    """After a complete check, the update feed replaces the lookups by ID."""
+    commands.check_for_paper_updates(workers=2)
+    arxiv['id_list'].clear()
+    LATEST['1512.03385'] = '1512.03385v2'
+    try:
+        summary = commands.check_for_paper_updates(workers=2)
+    finally:
+        LATEST['1512.03385'] = '1512.03385v1'
+
+    assert len(arxiv['feed']) == 1 and arxiv['feed'][0].startswith('lastUpdatedDate:[')
+    # Only the paper downloaded by the previous check is looked up by ID
+    assert arxiv['id_list'] == [['1706.03762']]
+    assert summary == {'success': True, 'total': 3, 'incremental': True, 'updated': 1, 'skipped': 2, 'errors': 0}
+    assert find_outdated_papers() == []
+
+
+def test_updates_that_are_not_recorded_are_errors(arxiv, monkeypatch):
+    """A paper whose database write fails is reported as an error, not as updated."""
+    monkeypatch.setattr(paper_pipeline, 'record_papers_bulk', lambda records, chunk_size=None: 0)
+    summary = commands.check_for_paper_updates(workers=2)
+
+    assert (summary['updated'], summary['errors']) == (0, 1)
+    assert [paper[1] for paper in iter_latest_local_versions()][1] == '1706.03762v2'
+    assert [paper[0] for paper in find_outdated_papers()] == ['1706.03762']
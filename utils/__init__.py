@@ -10,15 +10,16 @@ from .file_utils import (
 )
 
 from .paper_id_utils import (
-    extract_paper_id, get_simplified_paper_id, extract_paper_id_parts, is_valid_arxiv_id
+    extract_paper_id, get_simplified_paper_id, extract_paper_id_parts, is_valid_arxiv_id, arxiv_id_key
 )
 
 from .display_utils import (
-    format_paper_table_row, print_papers_table
+    format_paper_table_row, print_papers_table, format_bytes, format_timestamp, print_library_stats
 )
 
 __all__ = [
     'sanitize_filename', 'ensure_dir_exists', 'save_to_file', 'list_files',
-    'extract_paper_id', 'get_simplified_paper_id', 'extract_paper_id_parts', 'is_valid_arxiv_id',
-    'format_paper_table_row', 'print_papers_table'
+    'extract_paper_id', 'get_simplified_paper_id', 'extract_paper_id_parts', 'is_valid_arxiv_id', 'arxiv_id_key',
+    'format_paper_table_row', 'print_papers_table', 'format_bytes', 'format_timestamp',
+    'print_library_stats'
 ]
\ No newline at end of file
@@ -5,7 +5,15 @@ Display utility functions for the arXiv Paper Manager.
 This module provides functions for formatting and displaying data to the user.
 """
 
-from typing import List, Dict, Any, Tuple
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+
+def format_timestamp(timestamp: Optional[int]) -> str:
+    """Format a download time in epoch milliseconds as local 'YYYY-MM-DD HH:MM:SS' ('' if unknown)."""
+    if not timestamp:
+        return ""
+    return datetime.fromtimestamp(timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S')
 
 
 def format_paper_table_row(paper: Tuple, truncate_title: int = 37) -> Dict[str, str]:
@@ -25,7 +33,7 @@ def format_paper_table_row(paper: Tuple, truncate_title: int = 37) -> Dict[str,
     category_display = category if category else "-"
     
     # Format version field (handle None or empty version)
-    version_display = version if version else "-"
+    version_display = str(version) if version else "-"
     
     # Truncate title if too long
     if title and truncate_title > 0 and len(title) > truncate_title:
@@ -38,7 +46,7 @@ def format_paper_table_row(paper: Tuple, truncate_title: int = 37) -> Dict[str,
     pdf_status = "✓" if has_pdf else "✗"
     
     # Format date
-    date_display = downloaded_at[:19] if downloaded_at else ""
+    date_display = format_timestamp(downloaded_at)
     
     return {
         'id_number': id_number,
@@ -51,20 +59,25 @@ def format_paper_table_row(paper: Tuple, truncate_title: int = 37) -> Dict[str,
     }
 
 
-def print_papers_table(papers: List[Tuple], header: bool = True) -> None:
+def print_papers_table(papers: Iterable[Tuple], header: bool = True, total: Optional[int] = None) -> None:
     """
     Print a formatted table of papers.
     
     Parameters:
-        papers (list): List of paper records from the database
+        papers (iterable): Paper records from the database; an iterator is printed as it is consumed
         header (bool): Whether to print the table header
+        total (int, optional): Number of papers to report in the header (required for iterators)
     """
-    if not papers:
+    if total is None:
+        papers = list(papers)
+        total = len(papers)
+    
+    if not total:
         print("No papers found.")
         return
     
     if header:
-        print(f"\nTotal papers: {len(papers)}\n")
+        print(f"\nTotal papers: {total}\n")
         print(f"{'ID Number':<12} {'V':<2} {'Category':<12} {'Title':<40} {'Downloaded':<20} {'Metadata':<10} {'PDF':<10}")
         print("-" * 110)
     
@@ -73,4 +86,46 @@ def print_papers_table(papers: List[Tuple], header: bool = True) -> None:
         print(f"{paper_data['id_number']:<12} {paper_data['version']:<2} {paper_data['category']:<12} "
               f"{paper_data['title']:<40} {paper_data['date']:<20} {paper_data['metadata']:<10} {paper_data['pdf']:<10}")
     
-    print()
\ No newline at end of file
+    print()
+
+
+def format_bytes(size: int) -> str:
+    """Format a size in bytes for display (e.g. '1.5 MB')."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def print_library_stats(stats: Dict[str, Any], top: int = 20) -> None:
+    """
+    Print the composition of the library.
+    
+    Parameters:
+        stats (dict): Statistics as returned by get_library_stats()
+        top (int): Number of categories to show (0 for all)
+    """
+    if not stats['papers']:
+        print("No papers found.")
+        return
+    
+    print(f"\nPapers: {stats['papers']}")
+    print(f"  With PDF: {stats['with_pdf']} ({format_bytes(stats['pdf_bytes'])} on disk)")
+    print(f"  Missing PDF: {stats['missing_pdf']}")
+    print(f"  With metadata: {stats['with_metadata']}")
+    
+    categories = sorted(stats['by_category'].items(), key=lambda item: (-item[1]['papers'], item[0]))
+    shown = categories[:top] if top else categories
+    print(f"\n{'Category':<20} {'Papers':>8} {'PDFs':>8} {'Size':>10}")
+    print("-" * 49)
+    for category, counts in shown:
+        print(f"{category or '-':<20} {counts['papers']:>8} {counts['with_pdf']:>8} {format_bytes(counts['pdf_bytes']):>10}")
+    if len(categories) > len(shown):
+        print(f"... and {len(categories) - len(shown)} more categories")
+    
+    print(f"\n{'Year':<20} {'Papers':>8} {'PDFs':>8} {'Size':>10}")
+    print("-" * 49)
+    for year, counts in stats['by_year'].items():
+        print(f"{year:<20} {counts['papers']:>8} {counts['with_pdf']:>8} {format_bytes(counts['pdf_bytes']):>10}")
+    print()
@@ -105,6 +105,25 @@ def extract_paper_id_parts(paper_id: str) -> Dict[str, Optional[str]]:
     return result
 
 
+def arxiv_id_key(id_number: Optional[str]) -> Optional[int]:
+    """
+    Encode a new-style arXiv ID number as an integer.
+
+    'YYMM.NNNNN' (or 'YYMM.NNNN' before 2015) becomes YYMM * 100000 + NNNNN,
+    so the keys sort like the IDs, e.g. '1706.03762' -> 170603762.
+
+    Parameters:
+        id_number (str): The ID number, without category or version
+
+    Returns:
+        int: The integer key, or None for old-style IDs (e.g. '0102536')
+    """
+    match = re.fullmatch(r'(\d{4})\.(\d{4,5})', id_number or '')
+    if not match:
+        return None
+    return int(match.group(1)) * 100000 + int(match.group(2))
+
+
 def is_valid_arxiv_id(dirname: str) -> bool:
     """
     Check if a directory name matches the pattern of an arXiv ID.